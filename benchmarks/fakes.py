@@ -0,0 +1,68 @@
+import re
+import zlib
+from collections.abc import Generator as PyGenerator
+
+import numpy as np
+
+from memorag.domain.entities import Vector
+from memorag.domain.ports import Embedder, Generator, Reranker
+
+_TOKEN = re.compile(r"\w+")
+
+
+def _tokens(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+
+class HashingEmbedder(Embedder):
+    """Deterministic embedder hashing tokens into a fixed number of dimensions."""
+
+    def __init__(self, dimension: int = 384) -> None:
+        self.dimension = dimension
+
+    def embed(self, text: str) -> np.ndarray:
+        embedding = np.zeros(self.dimension, dtype=np.float32)
+        for token in _tokens(text):
+            embedding[zlib.crc32(token.encode()) % self.dimension] += 1.0
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm else embedding
+
+    def embed_batch(self, texts: list[str]) -> np.ndarray:
+        if not texts:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        return np.stack([self.embed(text) for text in texts])
+
+    def get_embedding_dimension(self) -> int:
+        return self.dimension
+
+
+class OverlapReranker(Reranker):
+    """Deterministic reranker scoring documents by the share of query tokens they contain."""
+
+    def rerank(
+        self,
+        query: str,
+        vectors: list[Vector],
+        top_n: int | None = None,
+        min_score: float | None = None,
+    ) -> list[Vector]:
+        query_tokens = set(_tokens(query))
+        scored = []
+        for vector in vectors:
+            document_tokens = set(_tokens(vector.content.decode()))
+            score = len(query_tokens & document_tokens) / max(len(query_tokens), 1)
+            if min_score is None or score >= min_score:
+                scored.append(vector.model_copy(update={"rerank_score": score}))
+        scored.sort(key=lambda vector: vector.rerank_score or 0.0, reverse=True)
+        return scored[:top_n]
+
+
+class EchoGenerator(Generator):
+    """Generator streaming the first words of the context back, without any LLM call."""
+
+    def __init__(self, max_tokens: int = 64) -> None:
+        self.max_tokens = max_tokens
+
+    def generate(self, context: str, query: str) -> PyGenerator[str, None, None]:
+        for word in context.split()[: self.max_tokens]:
+            yield word + " "
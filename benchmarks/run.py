@@ -0,0 +1,387 @@
+"""
+Reproducible benchmark of the index and search hot paths.
+
+Runs `IndexDocument.execute` and `SearchDocuments.execute` against an in-memory Qdrant,
+with deterministic fake adapters by default or the real local models with --real-models
+(the generator is always a fake, no LLM is called), and prints a JSON report that can be
+diffed between releases:
+
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --baseline bench.json
+"""
+
+import json
+import platform
+import random
+import resource
+import sys
+import time
+from collections.abc import Callable, Iterator
+from importlib.metadata import PackageNotFoundError, version
+from typing import Annotated, Any
+from uuid import UUID
+
+import numpy as np
+import typer
+
+from benchmarks.fakes import EchoGenerator, HashingEmbedder, OverlapReranker
+from memorag.application.use_cases import IndexDocument, SearchDocuments
+from memorag.domain.entities import Document, SearchFilter, Vector
+from memorag.domain.ports import Embedder, Generator, Reranker, VectorStore
+from memorag.infrastructure.adapters import FixedSizeChunker, QdrantVectorStore
+
+STAGES = ("embed", "retrieve", "rerank", "generate")
+
+
+class StageTimer:
+    """Accumulates the time spent in each stage of the current operation."""
+
+    def __init__(self) -> None:
+        self.durations: dict[str, float] = {}
+
+    def reset(self) -> None:
+        self.durations = {}
+
+    def measure(self, stage: str, function: Callable, *args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def add(self, stage: str, duration: float) -> None:
+        self.durations[stage] = self.durations.get(stage, 0.0) + duration
+
+
+class TimedEmbedder(Embedder):
+    def __init__(self, embedder: Embedder, timer: StageTimer) -> None:
+        self.embedder = embedder
+        self.timer = timer
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.timer.measure("embed", self.embedder.embed, text)
+
+    def embed_batch(self, texts: list[str]) -> np.ndarray:
+        return self.timer.measure("embed", self.embedder.embed_batch, texts)
+
+    def get_embedding_dimension(self) -> int:
+        return self.embedder.get_embedding_dimension()
+
+
+class TimedVectorStore(VectorStore):
+    def __init__(self, vector_store: VectorStore, timer: StageTimer) -> None:
+        self.vector_store = vector_store
+        self.timer = timer
+        self.indexed = 0
+
+    def index_vector(self, vector: Vector, collection_name: str) -> None:
+        self.index_vectors([vector], collection_name)
+
+    def index_vectors(self, vectors: list[Vector], collection_name: str) -> None:
+        self.indexed += len(vectors)
+        self.timer.measure("upsert", self.vector_store.index_vectors, vectors, collection_name)
+
+    def delete_vectors(self, ids: list[UUID], collection_name: str) -> None:
+        self.vector_store.delete_vectors(ids, collection_name)
+
+    def search_similar(
+        self,
+        query_vector: np.ndarray,
+        top_k: int,
+        collection_name: str,
+        with_vectors: bool = False,
+        score_threshold: float | None = None,
+        filters: SearchFilter | None = None,
+    ) -> list[Vector]:
+        return self.timer.measure(
+            "retrieve",
+            self.vector_store.search_similar,
+            query_vector,
+            top_k,
+            collection_name,
+            with_vectors=with_vectors,
+            score_threshold=score_threshold,
+            filters=filters,
+        )
+
+    def scroll_vectors(
+        self, collection_name: str, batch_size: int = 256
+    ) -> Iterator[list[Vector]]:
+        return self.vector_store.scroll_vectors(collection_name, batch_size)
+
+
+class TimedReranker(Reranker):
+    def __init__(self, reranker: Reranker, timer: StageTimer) -> None:
+        self.reranker = reranker
+        self.timer = timer
+
+    def rerank(
+        self,
+        query: str,
+        vectors: list[Vector],
+        top_n: int | None = None,
+        min_score: float | None = None,
+    ) -> list[Vector]:
+        return self.timer.measure(
+            "rerank", self.reranker.rerank, query, vectors, top_n=top_n, min_score=min_score
+        )
+
+
+class TimedGenerator(Generator):
+    def __init__(self, generator: Generator, timer: StageTimer) -> None:
+        self.generator = generator
+        self.timer = timer
+
+    def generate(self, context: str, query: str):
+        start = time.perf_counter()
+        try:
+            yield from self.generator.generate(context, query)
+        finally:
+            self.timer.add("generate", time.perf_counter() - start)
+
+
+def _build_corpus(
+    documents: int, document_size: int, queries: int, seed: int
+) -> tuple[list[Document], list[str]]:
+    rng = random.Random(seed)
+    vocabulary = [
+        "".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(3, 10)))
+        for _ in range(5000)
+    ]
+
+    corpus = []
+    for i in range(documents):
+        words: list[str] = []
+        size = 0
+        while size < document_size:
+            word = rng.choice(vocabulary)
+            words.append(word)
+            size += len(word) + 1
+        document = Document.from_text(" ".join(words))
+        corpus.append(document.model_copy(update={"name": f"document_{i}"}))
+
+    questions = []
+    for _ in range(queries):
+        words = rng.choice(corpus).content.decode().split()
+        start = rng.randrange(max(len(words) - 8, 1))
+        questions.append(" ".join(words[start : start + 8]))
+    return corpus, questions
+
+
+def _percentiles(durations: list[float]) -> dict[str, float]:
+    milliseconds = np.array(durations) * 1000
+    return {
+        "mean": round(float(milliseconds.mean()), 3),
+        "p50": round(float(np.percentile(milliseconds, 50)), 3),
+        "p95": round(float(np.percentile(milliseconds, 95)), 3),
+        "p99": round(float(np.percentile(milliseconds, 99)), 3),
+    }
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _package_version() -> str:
+    try:
+        return version("memorag")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def _build_models(
+    real_models: bool, embedding_backend: str, rerank_backend: str, rerank_max_length: int | None
+) -> tuple[Embedder, Reranker]:
+    if not real_models:
+        return HashingEmbedder(), OverlapReranker()
+
+    from memorag.infrastructure.adapters import CrossEncoderReranker, SentenceTransformerEmbedder
+
+    return (
+        SentenceTransformerEmbedder("all-MiniLM-L6-v2", backend=embedding_backend),
+        CrossEncoderReranker(
+            "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1",
+            max_length=rerank_max_length,
+            backend=rerank_backend,
+            # Every query is new, caching would only hide the cost being measured
+            cache_size=0,
+        ),
+    )
+
+
+def run_benchmark(
+    documents: int = 200,
+    document_size: int = 4000,
+    queries: int = 100,
+    top_k: int = 20,
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+    real_models: bool = False,
+    embedding_backend: str = "torch",
+    rerank_backend: str = "torch",
+    rerank_max_length: int | None = None,
+    seed: int = 0,
+) -> dict:
+    """Runs the benchmark and returns its report."""
+    corpus, questions = _build_corpus(documents, document_size, queries, seed)
+    embedder, reranker = _build_models(
+        real_models, embedding_backend, rerank_backend, rerank_max_length
+    )
+
+    timer = StageTimer()
+    timed_embedder = TimedEmbedder(embedder, timer)
+    vector_store = TimedVectorStore(
+        QdrantVectorStore(
+            host="localhost",
+            port=6333,
+            embedding_dim=embedder.get_embedding_dimension(),
+            location=":memory:",
+        ),
+        timer,
+    )
+    index_uc = IndexDocument(
+        embedder=timed_embedder,
+        vector_store=vector_store,
+        chunker=FixedSizeChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap),
+    )
+    search_uc = SearchDocuments(
+        embedder=timed_embedder,
+        vector_store=vector_store,
+        reranker=TimedReranker(reranker, timer),
+        generator=TimedGenerator(EchoGenerator(), timer),
+    )
+
+    start = time.perf_counter()
+    for document in corpus:
+        index_uc.execute(document)
+    index_seconds = time.perf_counter() - start
+    index_stages = {stage: round(duration, 3) for stage, duration in timer.durations.items()}
+
+    totals: list[float] = []
+    stages: dict[str, list[float]] = {stage: [] for stage in STAGES}
+    for question in questions:
+        timer.reset()
+        start = time.perf_counter()
+        response = search_uc.execute(question, top_k=top_k)
+        for _ in response.answer:
+            pass
+        totals.append(time.perf_counter() - start)
+        for stage in STAGES:
+            stages[stage].append(timer.durations.get(stage, 0.0))
+
+    return {
+        "config": {
+            "documents": documents,
+            "document_size": document_size,
+            "queries": queries,
+            "top_k": top_k,
+            "chunk_size": chunk_size,
+            "chunk_overlap": chunk_overlap,
+            "real_models": real_models,
+            "embedding_backend": embedding_backend,
+            "rerank_backend": rerank_backend,
+            "rerank_max_length": rerank_max_length,
+            "seed": seed,
+        },
+        "environment": {
+            "memorag": _package_version(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "index": {
+            "documents": documents,
+            "chunks": vector_store.indexed,
+            "seconds": round(index_seconds, 3),
+            "docs_per_sec": round(documents / index_seconds, 2),
+            "chunks_per_sec": round(vector_store.indexed / index_seconds, 2),
+            "stages_seconds": index_stages,
+        },
+        "search": {
+            "queries": queries,
+            "latency_ms": {"total": _percentiles(totals)}
+            | {stage: _percentiles(durations) for stage, durations in stages.items()},
+        },
+        "memory": {"peak_rss_mb": _peak_rss_mb()},
+    }
+
+
+def _change(previous: float, current: float) -> str:
+    # A zero baseline, e.g. a stage that never ran, has no meaningful ratio
+    if not previous:
+        return "n/a"
+    return f"{current / previous - 1:+.1%}"
+
+
+def compare(report: dict, baseline: dict) -> list[str]:
+    """Describes how the main throughput and latency figures moved since the baseline."""
+    lines = []
+    previous, current = baseline["index"]["docs_per_sec"], report["index"]["docs_per_sec"]
+    lines.append(f"index docs/sec: {previous} -> {current} ({_change(previous, current)})")
+    for stage, latencies in report["search"]["latency_ms"].items():
+        previous = baseline["search"]["latency_ms"].get(stage, {}).get("p95")
+        if previous is not None:
+            current = latencies["p95"]
+            lines.append(
+                f"search {stage} p95 ms: {previous} -> {current} ({_change(previous, current)})"
+            )
+    previous, current = baseline["memory"]["peak_rss_mb"], report["memory"]["peak_rss_mb"]
+    lines.append(f"peak RSS MB: {previous} -> {current} ({_change(previous, current)})")
+    return lines
+
+
+def main(
+    documents: Annotated[int, typer.Option(help="Number of documents to index")] = 200,
+    document_size: Annotated[int, typer.Option(help="Size of each document, in bytes")] = 4000,
+    queries: Annotated[int, typer.Option(help="Number of search queries to run")] = 100,
+    top_k: Annotated[int, typer.Option(help="Number of candidates retrieved per query")] = 20,
+    chunk_size: Annotated[int, typer.Option(help="Maximum size of a chunk, in bytes")] = 1000,
+    chunk_overlap: Annotated[int, typer.Option(help="Bytes shared by consecutive chunks")] = 200,
+    real_models: Annotated[
+        bool, typer.Option(help="Use the default local embedding and reranking models")
+    ] = False,
+    embedding_backend: Annotated[
+        str, typer.Option(help="Runtime of the real embedder (torch, onnx, onnx-int8, openvino)")
+    ] = "torch",
+    rerank_backend: Annotated[
+        str, typer.Option(help="Runtime of the real reranker (torch, onnx, onnx-int8, openvino)")
+    ] = "torch",
+    rerank_max_length: Annotated[
+        int | None, typer.Option(help="Number of tokens the real reranker truncates pairs to")
+    ] = None,
+    seed: Annotated[int, typer.Option(help="Seed of the synthetic corpus")] = 0,
+    output: Annotated[str | None, typer.Option(help="File to write the JSON report to")] = None,
+    baseline: Annotated[
+        str | None, typer.Option(help="Previous JSON report to compare against")
+    ] = None,
+):
+    report = run_benchmark(
+        documents=documents,
+        document_size=document_size,
+        queries=queries,
+        top_k=top_k,
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        real_models=real_models,
+        embedding_backend=embedding_backend,
+        rerank_backend=rerank_backend,
+        rerank_max_length=rerank_max_length,
+        seed=seed,
+    )
+
+    serialized = json.dumps(report, indent=2)
+    if output is None:
+        typer.echo(serialized)
+    else:
+        with open(output, "w") as f:
+            f.write(serialized + "\n")
+
+    if baseline is not None:
+        with open(baseline) as f:
+            for line in compare(report, json.load(f)):
+                typer.echo(line, err=True)
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,180 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from memorag.domain.entities import Vector
+from memorag.domain.ports import Tokenizer
+
+SEPARATOR = "\n\n"
+
+# Tokens kept for the system prompt and the template around the context and the question
+_PROMPT_TOKENS = 100
+
+# Shortest text shared by the end of a chunk and the start of the next one that is taken
+# for their overlap rather than a coincidence
+_MIN_OVERLAP = 16
+
+
+class Context(NamedTuple):
+    """The context given to the LLM, with what was left out to build it."""
+
+    text: str
+    sources: list[Vector]
+    tokens: int
+    tokens_saved: int
+    duplicates: int
+    merged: int
+    dropped: int
+
+
+def merge_overlapping(first: str, second: str) -> str | None:
+    """
+    Joins two consecutive chunks of a document, writing the text they share only once.
+    Returns None when they share less than a few characters.
+    """
+    head = second[:_MIN_OVERLAP]
+    position = first.find(head)
+    while position != -1:
+        # The first match is the longest overlap
+        if second.startswith(first[position:]):
+            return first + second[len(first) - position :]
+        position = first.find(head, position + 1)
+    return None
+
+
+def _chunk_index(vector: Vector) -> int | None:
+    try:
+        return int((vector.metadata or {})["chunk_index"])
+    except (KeyError, ValueError):
+        return None
+
+
+class ContextBuilder:
+    """
+    Assembles the context of the LLM from reranked chunks, spending at most `max_tokens`
+    tokens on them (fewer when the LLM's window is smaller). Chunks with the same content
+    as a better ranked one, or an embedding at least `dedup_threshold` cosine-similar to
+    it, are left out (only exact duplicates when the threshold is None or the embeddings
+    were not retrieved). Chunks are then taken in rank order while they fit, and the
+    consecutive chunks of a document that overlap are merged into a single passage without
+    the text they share.
+    """
+
+    def __init__(
+        self,
+        tokenizer: Tokenizer,
+        max_tokens: int = 4000,
+        dedup_threshold: float | None = 0.95,
+    ) -> None:
+        if max_tokens < 1:
+            raise ValueError("Context budget must be at least 1 token")
+        if dedup_threshold is not None and not 0 < dedup_threshold <= 1:
+            raise ValueError("Deduplication threshold must be in (0, 1]")
+        self.tokenizer = tokenizer
+        self.max_tokens = max_tokens
+        self.dedup_threshold = dedup_threshold
+
+    @property
+    def needs_embeddings(self) -> bool:
+        """Whether the chunks should be retrieved with their embeddings."""
+        return self.dedup_threshold is not None
+
+    def _budget(self, query: str) -> int:
+        window = self.tokenizer.max_input_tokens
+        if window is None:
+            return self.max_tokens
+        available = window - _PROMPT_TOKENS - self.tokenizer.count(query)
+        return max(min(self.max_tokens, available), 0)
+
+    def _deduplicate(self, vectors: list[Vector]) -> list[Vector]:
+        kept = []
+        contents = set()
+        embeddings: list[np.ndarray] = []
+        for vector in vectors:
+            if vector.content in contents:
+                continue
+            if self.dedup_threshold is not None and vector.vector is not None:
+                embedding = vector.vector / (np.linalg.norm(vector.vector) or 1.0)
+                if embeddings and np.max(np.stack(embeddings) @ embedding) >= self.dedup_threshold:
+                    continue
+                embeddings.append(embedding)
+            contents.add(vector.content)
+            kept.append(vector)
+        return kept
+
+    def _passages(self, vectors: list[Vector]) -> tuple[list[str], int]:
+        """
+        Groups the chunks, given in rank order, into passages of consecutive chunks of a
+        document, ordered by their best ranked chunk. Returns them with the number of
+        chunks merged into a previous one on their overlap.
+        """
+        runs: list[list[Vector]] = []
+        # Runs by the document and chunk index they end with, popped once extended so that
+        # two versions of a chunk, from a document indexed again, do not both extend it
+        open_runs: dict[tuple[str, int], list[Vector]] = {}
+        for index, vector in sorted(
+            ((_chunk_index(vector), vector) for vector in vectors),
+            key=lambda item: (item[0] is None, item[1].document_id, item[0] or 0),
+        ):
+            run = None
+            if index is not None:
+                run = open_runs.pop((vector.document_id, index - 1), None)
+            if run is None:
+                run = []
+                runs.append(run)
+            run.append(vector)
+            if index is not None:
+                open_runs[(vector.document_id, index)] = run
+
+        ranks = {id(vector): rank for rank, vector in enumerate(vectors)}
+        runs.sort(key=lambda run: min(ranks[id(vector)] for vector in run))
+
+        passages = []
+        merged = 0
+        for run in runs:
+            text = run[0].content.decode("utf-8")
+            for vector in run[1:]:
+                content = vector.content.decode("utf-8")
+                # Chunks kept by an incremental index run keep their former chunk index, so
+                # only chunks that actually overlap are taken for consecutive ones
+                merged_text = merge_overlapping(text, content)
+                if merged_text is None:
+                    text += SEPARATOR + content
+                else:
+                    text = merged_text
+                    merged += 1
+            passages.append(text)
+        return passages, merged
+
+    def build(self, query: str, vectors: list[Vector]) -> Context:
+        """Builds the context of `query` from chunks in rank order."""
+        counts: dict[bytes, int] = {}
+        for vector in vectors:
+            if vector.content not in counts:
+                counts[vector.content] = self.tokenizer.count(vector.content.decode("utf-8"))
+        separator_tokens = self.tokenizer.count(SEPARATOR)
+        naive_tokens = sum(counts[vector.content] for vector in vectors)
+        naive_tokens += separator_tokens * max(len(vectors) - 1, 0)
+
+        unique = self._deduplicate(vectors)
+        budget = self._budget(query)
+        selected = []
+        spent = 0
+        for vector in unique:
+            cost = counts[vector.content] + (separator_tokens if selected else 0)
+            if spent + cost <= budget:
+                selected.append(vector)
+                spent += cost
+
+        passages, merged = self._passages(selected)
+        text = SEPARATOR.join(passages)
+        tokens = self.tokenizer.count(text) if text else 0
+        return Context(
+            text=text,
+            sources=selected,
+            tokens=tokens,
+            tokens_saved=max(naive_tokens - tokens, 0),
+            duplicates=len(vectors) - len(unique),
+            merged=merged,
+            dropped=len(unique) - len(selected),
+        )
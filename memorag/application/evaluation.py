@@ -0,0 +1,30 @@
+import math
+
+
+def recall_at_k(ranked: list[str], expected: set[str], k: int) -> float:
+    """Share of the expected documents found among the first `k` ranked ones."""
+    if not expected:
+        return 0.0
+    return len(expected.intersection(ranked[:k])) / len(expected)
+
+
+def reciprocal_rank(ranked: list[str], expected: set[str], k: int) -> float:
+    """Inverse of the rank of the first expected document within the first `k`, or 0."""
+    for rank, document in enumerate(ranked[:k], 1):
+        if document in expected:
+            return 1 / rank
+    return 0.0
+
+
+def ndcg_at_k(ranked: list[str], expected: set[str], k: int) -> float:
+    """
+    Normalized discounted cumulative gain of the first `k` ranked documents, every expected
+    document being equally relevant: 1 when they all come first, less the lower they rank.
+    """
+    gain = sum(
+        1 / math.log2(rank + 1)
+        for rank, document in enumerate(ranked[:k], 1)
+        if document in expected
+    )
+    ideal = sum(1 / math.log2(rank + 1) for rank in range(1, min(len(expected), k) + 1))
+    return gain / ideal if ideal else 0.0
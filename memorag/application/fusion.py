@@ -0,0 +1,19 @@
+from uuid import UUID
+
+from memorag.domain.entities import Vector
+
+
+def reciprocal_rank_fusion(rankings: list[list[Vector]], k: int = 60) -> list[Vector]:
+    """
+    Merges rankings of the same documents made by different retrievers, scoring each
+    document by the sum of 1 / (k + rank) over the rankings it appears in. Scores of the
+    retrievers need not be comparable. A document appearing in several rankings is
+    returned as it was in the first of them.
+    """
+    fused_scores: dict[UUID, float] = {}
+    vectors: dict[UUID, Vector] = {}
+    for ranking in rankings:
+        for rank, vector in enumerate(ranking, 1):
+            fused_scores[vector.id] = fused_scores.get(vector.id, 0.0) + 1 / (k + rank)
+            vectors.setdefault(vector.id, vector)
+    return sorted(vectors.values(), key=lambda vector: fused_scores[vector.id], reverse=True)
@@ -0,0 +1,148 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Generator, Iterable, Iterator
+from contextlib import contextmanager
+from typing import NamedTuple, TypeVar
+
+import numpy as np
+
+from memorag.domain.entities import StageLatency
+
+T = TypeVar("T")
+
+
+class StageRecord(NamedTuple):
+    """Duration of one invocation of a pipeline stage, with counts describing its work."""
+
+    stage: str
+    duration: float
+    attributes: dict[str, int]
+
+
+class Instrumentation(ABC):
+    """
+    Hook called by the use cases around each port invocation. Implementations receive one
+    `StageRecord` per invocation and may be called from several threads at once.
+    """
+
+    enabled = True
+
+    @abstractmethod
+    def record(self, record: StageRecord) -> None:
+        pass
+
+    @contextmanager
+    def stage(self, name: str, **attributes: int) -> Generator[dict[str, int], None, None]:
+        """
+        Times the enclosed block as stage `name`. The yielded attributes can be completed
+        from within the block, e.g. with the number of results once they are known.
+        """
+        start = time.perf_counter()
+        try:
+            yield attributes
+        finally:
+            self.record(StageRecord(name, time.perf_counter() - start, attributes))
+
+    def stream(
+        self, name: str, iterable: Iterable[T], first_item_stage: str | None = None
+    ) -> Iterator[T]:
+        """
+        Times the consumption of a stream as stage `name`, counting its items, and the wait
+        for its first item as `first_item_stage` when given.
+        """
+        start = time.perf_counter()
+        items = 0
+        try:
+            for item in iterable:
+                if items == 0 and first_item_stage is not None:
+                    self.record(StageRecord(first_item_stage, time.perf_counter() - start, {}))
+                items += 1
+                yield item
+        finally:
+            self.record(StageRecord(name, time.perf_counter() - start, {"items": items}))
+
+
+class NoInstrumentation(Instrumentation):
+    """Default instrumentation, discarding every record."""
+
+    enabled = False
+
+    def record(self, record: StageRecord) -> None:
+        pass
+
+    def stream(
+        self, name: str, iterable: Iterable[T], first_item_stage: str | None = None
+    ) -> Iterator[T]:
+        return iter(iterable)
+
+
+class InstrumentationGroup(Instrumentation):
+    """Forwards every record to several instrumentations."""
+
+    def __init__(self, instrumentations: list[Instrumentation]) -> None:
+        self.instrumentations = instrumentations
+
+    def record(self, record: StageRecord) -> None:
+        for instrumentation in self.instrumentations:
+            instrumentation.record(record)
+
+
+class StageProfile(Instrumentation):
+    """Aggregates records per stage to print a breakdown of where the time went."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stages: dict[str, tuple[int, float, dict[str, int]]] = {}
+
+    def record(self, record: StageRecord) -> None:
+        with self._lock:
+            calls, total, attributes = self._stages.get(record.stage, (0, 0.0, {}))
+            for name, value in record.attributes.items():
+                attributes[name] = attributes.get(name, 0) + value
+            self._stages[record.stage] = (calls + 1, total + record.duration, attributes)
+
+    def format(self) -> str:
+        """Returns the per-stage breakdown as a table, in the order stages first ran."""
+        with self._lock:
+            stages = dict(self._stages)
+
+        lines = [f"{'stage':<22}{'calls':>7}{'total ms':>12}{'mean ms':>12}  details"]
+        for stage, (calls, total, attributes) in stages.items():
+            details = " ".join(f"{name}={value}" for name, value in attributes.items())
+            lines.append(
+                f"{stage:<22}{calls:>7}{total * 1000:>12.2f}{total * 1000 / calls:>12.2f}"
+                f"  {details}".rstrip()
+            )
+        return "\n".join(lines)
+
+
+class StageLatencies(Instrumentation):
+    """Keeps the duration of every invocation of each stage, to report their percentiles."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._durations: dict[str, list[float]] = {}
+
+    def record(self, record: StageRecord) -> None:
+        with self._lock:
+            self._durations.setdefault(record.stage, []).append(record.duration)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._durations = {}
+
+    def summary(self) -> dict[str, StageLatency]:
+        """Returns the latency of each stage, in the order stages first ran."""
+        with self._lock:
+            durations = {stage: list(values) for stage, values in self._durations.items()}
+
+        return {
+            stage: StageLatency(
+                calls=len(values),
+                mean=float(np.mean(values)),
+                p50=float(np.percentile(values, 50)),
+                p95=float(np.percentile(values, 95)),
+            )
+            for stage, values in durations.items()
+        }
@@ -0,0 +1,73 @@
+import queue
+import threading
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from typing import TypeVar
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+class _Failure:
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+def batched(iterable: Iterable[T], size: int) -> Iterator[list[T]]:
+    """Groups the items of an iterable into lists of at most `size` items."""
+    if size < 1:
+        raise ValueError("Batch size must be at least 1")
+
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def prefetch(iterable: Iterable[T], maxsize: int) -> Iterator[T]:
+    """
+    Consumes the iterable in a background thread and yields its items through a queue
+    holding at most `maxsize` items, so the producer never runs ahead of the consumer
+    by more than that. Exceptions raised by the producer are re-raised in the consumer.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def _put(item: object) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce() -> None:
+        iterator = iter(iterable)
+        try:
+            for item in iterator:
+                if not _put(item):
+                    return
+        except BaseException as e:
+            _put(_Failure(e))
+            return
+        finally:
+            # Propagate an early stop to upstream generators (and their own producers)
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+        _put(_DONE)
+
+    producer = threading.Thread(target=_produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        producer.join()
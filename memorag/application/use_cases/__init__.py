@@ -1,4 +1,15 @@
+from .compare_embedders import CompareEmbedders
+from .evaluate_retrieval import EvaluateRetrieval
+from .export_collection import ExportCollection
+from .import_collection import ImportCollection
 from .index_document import IndexDocument
 from .search_documents import SearchDocuments
 
-__all__ = ["IndexDocument", "SearchDocuments"]
+__all__ = [
+    "IndexDocument",
+    "SearchDocuments",
+    "CompareEmbedders",
+    "EvaluateRetrieval",
+    "ExportCollection",
+    "ImportCollection",
+]
@@ -0,0 +1,33 @@
+import numpy as np
+
+from memorag.domain.entities import EmbedderComparison
+from memorag.domain.ports import Embedder
+
+
+class CompareEmbedders:
+    def __init__(self, embedder: Embedder, reference: Embedder):
+        self.embedder = embedder
+        self.reference = reference
+
+    def execute(self, texts: list[str], tolerance: float = 0.01) -> EmbedderComparison:
+        """
+        Embeds the texts with both embedders and compares their embeddings by cosine
+        similarity. The embedder can search and extend a collection indexed with the
+        reference as long as no similarity drops below 1 - `tolerance`.
+        """
+        if not texts:
+            raise ValueError("At least one text is needed to compare embedders")
+
+        embeddings = np.asarray(self.embedder.embed_batch(texts), dtype=np.float32)
+        references = np.asarray(self.reference.embed_batch(texts), dtype=np.float32)
+        if embeddings.shape != references.shape:
+            raise ValueError(f"Embedding shapes differ: {embeddings.shape} and {references.shape}")
+
+        norms = np.linalg.norm(embeddings, axis=1) * np.linalg.norm(references, axis=1)
+        similarities = np.sum(embeddings * references, axis=1) / np.where(norms == 0, 1, norms)
+        return EmbedderComparison(
+            texts=len(texts),
+            min_similarity=float(similarities.min()),
+            mean_similarity=float(similarities.mean()),
+            tolerance=tolerance,
+        )
@@ -0,0 +1,91 @@
+import time
+
+import numpy as np
+
+from memorag.application.evaluation import ndcg_at_k, recall_at_k, reciprocal_rank
+from memorag.application.instrumentation import StageLatencies, StageRecord
+from memorag.domain.entities import EvaluationQuery, RetrievalEvaluation, Vector
+
+from .search_documents import SearchDocuments
+
+
+def _ranked_documents(sources: list[Vector]) -> list[tuple[str, str]]:
+    """The (id, name) of the documents of the sources, in the rank of their best chunk."""
+    documents = {}
+    for source in sources:
+        documents.setdefault(source.document_id, source.document_name)
+    return list(documents.items())
+
+
+class EvaluateRetrieval:
+    def __init__(self, search_documents: SearchDocuments, latencies: StageLatencies):
+        """
+        `latencies` must be the instrumentation of `search_documents`, or part of it, for
+        the latency of each of its stages to be reported.
+        """
+        self.search_documents = search_documents
+        self.latencies = latencies
+
+    def execute(
+        self,
+        dataset: list[EvaluationQuery],
+        k: int = 10,
+        top_k: int = 20,
+        top_n: int | None = None,
+        min_score: float | None = None,
+        score_threshold: float | None = None,
+        warm_up: bool = True,
+    ) -> RetrievalEvaluation:
+        """
+        Retrieves and reranks the documents of every query, as a raw search does, and
+        averages the recall@k, MRR and nDCG@k of the documents ranked by their best chunk.
+        A document is relevant when its id or its name is expected. The latency of each
+        stage, and of whole searches, is reported alongside. With `warm_up`, the first
+        query is run once before measuring, so one-time initializations are left out.
+        """
+        if not dataset:
+            raise ValueError("At least one query is needed to evaluate retrieval")
+        if k < 1:
+            raise ValueError("k must be at least 1")
+
+        def search(query: str) -> list[Vector]:
+            return self.search_documents.execute(
+                query,
+                top_k=top_k,
+                raw=True,
+                top_n=top_n,
+                min_score=min_score,
+                score_threshold=score_threshold,
+            ).sources
+
+        if warm_up:
+            search(dataset[0].query)
+        self.latencies.reset()
+
+        recalls, reciprocal_ranks, ndcgs = [], [], []
+        for item in dataset:
+            start = time.perf_counter()
+            sources = search(item.query)
+            self.latencies.record(StageRecord("search", time.perf_counter() - start, {}))
+
+            expected = set(item.expected)
+            # Documents are matched by id or by name, whichever the dataset uses, documents
+            # sharing a name counting once
+            ranked = list(
+                dict.fromkeys(
+                    document_id if document_id in expected else document_name
+                    for document_id, document_name in _ranked_documents(sources)
+                )
+            )
+            recalls.append(recall_at_k(ranked, expected, k))
+            reciprocal_ranks.append(reciprocal_rank(ranked, expected, k))
+            ndcgs.append(ndcg_at_k(ranked, expected, k))
+
+        return RetrievalEvaluation(
+            queries=len(dataset),
+            k=k,
+            recall=float(np.mean(recalls)),
+            mrr=float(np.mean(reciprocal_ranks)),
+            ndcg=float(np.mean(ndcgs)),
+            latencies=self.latencies.summary(),
+        )
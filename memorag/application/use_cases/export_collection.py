@@ -0,0 +1,49 @@
+import time
+from datetime import datetime, timezone
+
+from memorag.application.pipeline import prefetch
+from memorag.domain.entities import SnapshotHeader, SnapshotReport
+from memorag.domain.ports import SnapshotFile, VectorStore
+
+
+class ExportCollection:
+    COLLECTION_NAME = "infos"
+
+    def __init__(
+        self,
+        vector_store: VectorStore,
+        snapshot_file: SnapshotFile,
+        embedding_model: str,
+        embedding_backend: str,
+        embedding_dim: int,
+        collection_name: str = COLLECTION_NAME,
+    ):
+        self.vector_store = vector_store
+        self.snapshot_file = snapshot_file
+        self.embedding_model = embedding_model
+        self.embedding_backend = embedding_backend
+        self.embedding_dim = embedding_dim
+        self.collection_name = collection_name
+
+    def execute(self, path: str, batch_size: int = 1024) -> SnapshotReport:
+        """
+        Writes every vector of the collection to a snapshot at `path`, with the configured
+        embedding model and backend. Collections do not record what they were indexed with,
+        so they are taken to be those. Vectors are streamed from the vector store
+        `batch_size` at a time, the next batch being fetched while the previous one is
+        written.
+        """
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1")
+
+        start = time.perf_counter()
+        header = SnapshotHeader(
+            embedding_model=self.embedding_model,
+            embedding_backend=self.embedding_backend,
+            embedding_dim=self.embedding_dim,
+            collection=self.collection_name,
+            created_at=datetime.now(tz=timezone.utc),
+        )
+        batches = self.vector_store.scroll_vectors(self.collection_name, batch_size=batch_size)
+        vectors = self.snapshot_file.write(path, header, prefetch(batches, maxsize=2))
+        return SnapshotReport(vectors=vectors, seconds=time.perf_counter() - start)
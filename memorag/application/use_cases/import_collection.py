@@ -0,0 +1,85 @@
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from memorag.application.pipeline import batched
+from memorag.domain.entities import SnapshotReport, Vector
+from memorag.domain.ports import LexicalIndex, SearchCache, SnapshotFile, VectorStore
+
+
+class ImportCollection:
+    COLLECTION_NAME = "infos"
+
+    def __init__(
+        self,
+        vector_store: VectorStore,
+        snapshot_file: SnapshotFile,
+        embedding_model: str,
+        embedding_backend: str,
+        embedding_dim: int,
+        collection_name: str = COLLECTION_NAME,
+        search_cache: SearchCache | None = None,
+        lexical_index: LexicalIndex | None = None,
+    ):
+        self.vector_store = vector_store
+        self.snapshot_file = snapshot_file
+        self.embedding_model = embedding_model
+        self.embedding_backend = embedding_backend
+        self.embedding_dim = embedding_dim
+        self.collection_name = collection_name
+        self.search_cache = search_cache
+        self.lexical_index = lexical_index
+
+    def _index_vectors(self, vectors: list[Vector]) -> None:
+        self.vector_store.index_vectors(vectors=vectors, collection_name=self.collection_name)
+        if self.lexical_index is not None:
+            self.lexical_index.index(vectors, collection_name=self.collection_name)
+
+    def execute(
+        self,
+        path: str,
+        batch_size: int = 256,
+        writers: int = 4,
+    ) -> SnapshotReport:
+        """
+        Loads the vectors of the snapshot at `path` into the collection, without embedding
+        anything again, as batches of `batch_size` upserted by `writers` concurrent
+        threads. Snapshots made with another embedding model, backend or dimension are
+        refused, as their vectors could not be compared with the queries.
+        """
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1")
+        if writers < 1:
+            raise ValueError("At least one writer is required")
+
+        header = self.snapshot_file.read_header(path)
+        snapshot = (header.embedding_model, header.embedding_backend, header.embedding_dim)
+        configured = (self.embedding_model, self.embedding_backend, self.embedding_dim)
+        if snapshot != configured:
+            raise ValueError(
+                f"Snapshot vectors were made with {header.embedding_model} on "
+                f"{header.embedding_backend} ({header.embedding_dim} dimensions), not "
+                f"{self.embedding_model} on {self.embedding_backend} "
+                f"({self.embedding_dim} dimensions)"
+            )
+
+        start = time.perf_counter()
+        imported = 0
+        try:
+            with ThreadPoolExecutor(max_workers=writers) as pool:
+                upserts: deque[Future[None]] = deque()
+                for block in self.snapshot_file.read(path):
+                    for batch in batched(block, batch_size):
+                        upserts.append(pool.submit(self._index_vectors, batch))
+                        imported += len(batch)
+                        # Bound the vectors waiting for a writer, surfacing upsert errors early
+                        while len(upserts) > writers:
+                            upserts.popleft().result()
+                while upserts:
+                    upserts.popleft().result()
+        finally:
+            # Cached answers may miss what was just imported, even partially
+            if self.search_cache is not None:
+                self.search_cache.invalidate(self.collection_name)
+
+        return SnapshotReport(vectors=imported, seconds=time.perf_counter() - start)
@@ -1,36 +1,303 @@
+import os
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timezone
 
-from memorag.domain.entities import Document, Vector
-from memorag.domain.ports import Chunker, Embedder, VectorStore
+from memorag.application.instrumentation import Instrumentation, NoInstrumentation
+from memorag.application.pipeline import batched, prefetch
+from memorag.domain.entities import (
+    BatchIndexingReport,
+    Document,
+    DocumentChunk,
+    IndexedDocument,
+    IndexingReport,
+    Vector,
+)
+from memorag.domain.ports import (
+    Chunker,
+    Embedder,
+    IndexManifest,
+    LexicalIndex,
+    SearchCache,
+    VectorStore,
+)
+
+# Chunker of the current chunking worker process, set once when the process starts
+_worker_chunker: Chunker | None = None
+
+
+def _init_chunk_worker(chunker: Chunker) -> None:
+    global _worker_chunker
+    _worker_chunker = chunker
+
+
+def _chunk_document(chunker: Chunker, document: Document) -> list[DocumentChunk]:
+    chunks = list(chunker.chunk(document).chunks)
+    # Fail here, with the document at hand, rather than when embedding a mixed batch
+    for chunk in chunks:
+        chunk.content.decode()
+    return chunks
+
+
+def _chunk_in_worker(document: Document) -> list[DocumentChunk]:
+    assert _worker_chunker is not None
+    return _chunk_document(_worker_chunker, document)
 
 
 class IndexDocument:
     COLLECTION_NAME = "infos"
 
-    def __init__(self, embedder: Embedder, vector_store: VectorStore, chunker: Chunker):
+    def __init__(
+        self,
+        embedder: Embedder,
+        vector_store: VectorStore,
+        chunker: Chunker,
+        manifest: IndexManifest | None = None,
+        instrumentation: Instrumentation | None = None,
+        search_cache: SearchCache | None = None,
+        lexical_index: LexicalIndex | None = None,
+        collection_name: str = COLLECTION_NAME,
+        settings: str = "",
+    ):
         self.embedder = embedder
         self.vector_store = vector_store
         self.chunker = chunker
+        self.manifest = manifest
+        self.instrumentation = instrumentation or NoInstrumentation()
+        self.search_cache = search_cache
+        self.lexical_index = lexical_index
+        self.collection_name = collection_name
+        # Identifies the chunker and embedder settings, so that the documents indexed
+        # incrementally under other settings are not taken for unchanged
+        self.settings = settings
 
-    def execute(self, document: Document) -> None:
-        """
-        Embeds and indexes the provided document into the vector store.
-        """
-        chunked_document = self.chunker.chunk(document)
+    def _build_vectors(self, document: Document, chunks: list[DocumentChunk]) -> list[Vector]:
+        return self._build_vectors_of([(document, chunk) for chunk in chunks])
+
+    def _build_vectors_of(self, pairs: list[tuple[Document, DocumentChunk]]) -> list[Vector]:
+        """Embeds in a single batch chunks that may come from several documents."""
+        with self.instrumentation.stage("embed", texts=len(pairs)):
+            embeddings = self.embedder.embed_batch([chunk.content.decode() for _, chunk in pairs])
+        inserted_at = datetime.now(tz=timezone.utc)
         vectors = []
-        for chunk in chunked_document.chunks:
-            embedding = self.embedder.embed(chunk.content.decode())
+        for (document, chunk), embedding in zip(pairs, embeddings, strict=True):
             vector = Vector(
                 id=chunk.id,
                 vector=embedding,
                 content=chunk.content,
-                inserted_at=datetime.now(tz=timezone.utc),
+                inserted_at=inserted_at,
                 metadata=(chunk.metadata or {})
-                | {"document_id": str(document.id), "document_name": document.name},
+                | {
+                    "document_id": str(document.id),
+                    "document_name": document.name,
+                    "document_type": document.type.value,
+                },
             )
             vectors.append(vector)
+        return vectors
+
+    def _index_vectors(self, vectors: list[Vector]) -> None:
+        with self.instrumentation.stage("upsert", vectors=len(vectors)):
+            self.vector_store.index_vectors(vectors=vectors, collection_name=self.collection_name)
+        if self.lexical_index is not None:
+            with self.instrumentation.stage("lexical_upsert", chunks=len(vectors)):
+                self.lexical_index.index(vectors, collection_name=self.collection_name)
+        self._invalidate_search_cache()
+
+    def _invalidate_search_cache(self) -> None:
+        # Cached answers may rely on what was just overwritten, or miss what was just added
+        if self.search_cache is not None:
+            self.search_cache.invalidate(self.collection_name)
+
+    def _chunk(self, document: Document) -> list[DocumentChunk]:
+        with self.instrumentation.stage("chunk") as attributes:
+            chunks = list(self.chunker.chunk(document).chunks)
+            attributes["chunks"] = len(chunks)
+        return chunks
+
+    def execute(self, document: Document) -> None:
+        """
+        Embeds and indexes the provided document into the vector store.
+        """
+        chunks = self._chunk(document)
+        if not chunks:
+            return
+
+        self._index_vectors(self._build_vectors(document, chunks))
+
+    def execute_stream(
+        self, document: Document, batch_size: int = 64, max_pending_batches: int = 4
+    ) -> None:
+        """
+        Embeds and indexes the document as a pipeline of bounded stages: chunking,
+        embedding and upserting run concurrently, each holding at most
+        `max_pending_batches` batches of `batch_size` chunks, so memory stays flat
+        whatever the size of the document.
+        """
+        chunk_batches = prefetch(
+            batched(self.chunker.iter_chunks(document), batch_size), max_pending_batches
+        )
+        vector_batches = prefetch(
+            (self._build_vectors(document, chunks) for chunks in chunk_batches),
+            max_pending_batches,
+        )
+        for vectors in vector_batches:
+            self._index_vectors(vectors)
+
+    def _chunk_many(
+        self, documents: Iterable[Document], workers: int | None
+    ) -> Iterator[tuple[Document, list[DocumentChunk] | Exception]]:
+        """
+        Chunks the documents in a pool of `workers` processes (one per CPU when None, in
+        the calling thread when 0), yielding them in order with their chunks, or the error
+        that prevented reading or chunking them.
+        """
+        if workers == 0:
+            for document in documents:
+                try:
+                    with self.instrumentation.stage("chunk") as attributes:
+                        chunks = _chunk_document(self.chunker, document)
+                        attributes["chunks"] = len(chunks)
+                    yield document, chunks
+                except (OSError, ValueError) as e:
+                    yield document, e
+            return
+
+        # Keep a few documents per worker in flight, without reading the whole list ahead
+        window = 4 * (workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_chunk_worker, initargs=(self.chunker,)
+        ) as pool:
+            pending: deque[tuple[Document, Future[list[DocumentChunk]]]] = deque()
+            for document in documents:
+                pending.append((document, pool.submit(_chunk_in_worker, document)))
+                if len(pending) >= window:
+                    yield self._chunk_result(*pending.popleft())
+            while pending:
+                yield self._chunk_result(*pending.popleft())
+
+    def _chunk_result(
+        self, document: Document, future: "Future[list[DocumentChunk]]"
+    ) -> tuple[Document, list[DocumentChunk] | Exception]:
+        with self.instrumentation.stage("chunk") as attributes:
+            try:
+                chunks = future.result()
+            except (OSError, ValueError) as e:
+                return document, e
+            attributes["chunks"] = len(chunks)
+        return document, chunks
+
+    def execute_many(
+        self,
+        documents: Iterable[Document],
+        batch_size: int = 64,
+        workers: int | None = None,
+        writers: int = 2,
+        on_document: Callable[[Document], None] | None = None,
+    ) -> BatchIndexingReport:
+        """
+        Indexes many documents as a pipeline: documents are read and chunked in a pool of
+        `workers` processes, their chunks are embedded together in batches of `batch_size`
+        whatever document they come from, and batches are upserted by `writers` concurrent
+        threads while the next ones are embedded. Documents that cannot be read, chunked
+        or decoded are reported as failures without stopping the others. `on_document` is
+        called once each document has been chunked, to report progress.
+        """
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1")
+        if writers < 1:
+            raise ValueError("At least one writer is required")
+
+        start = time.perf_counter()
+        indexed_documents = 0
+        indexed_chunks = 0
+        failures = []
+        pairs: list[tuple[Document, DocumentChunk]] = []
+
+        with ThreadPoolExecutor(max_workers=writers) as pool:
+            upserts: deque[Future[None]] = deque()
 
-        self.vector_store.index_vectors(
-            vectors=vectors,
-            collection_name=self.COLLECTION_NAME,
+            def _flush(batch: list[tuple[Document, DocumentChunk]]) -> None:
+                upserts.append(pool.submit(self._index_vectors, self._build_vectors_of(batch)))
+                # Bound the vectors waiting for a writer, surfacing upsert errors early
+                while len(upserts) > writers:
+                    upserts.popleft().result()
+
+            for document, chunks in self._chunk_many(documents, workers):
+                if isinstance(chunks, Exception):
+                    failures.append(f"{document.name}: {chunks}")
+                else:
+                    indexed_documents += 1
+                    indexed_chunks += len(chunks)
+                    pairs.extend((document, chunk) for chunk in chunks)
+                    while len(pairs) >= batch_size:
+                        _flush(pairs[:batch_size])
+                        pairs = pairs[batch_size:]
+                if on_document is not None:
+                    on_document(document)
+
+            if pairs:
+                _flush(pairs)
+            while upserts:
+                upserts.popleft().result()
+
+        return BatchIndexingReport(
+            documents=indexed_documents,
+            chunks=indexed_chunks,
+            seconds=time.perf_counter() - start,
+            failures=failures,
+        )
+
+    def execute_incremental(self, document: Document) -> IndexingReport:
+        """
+        Indexes only what changed since the document was last indexed, according to the
+        manifest: unchanged documents are skipped, new chunks are embedded and upserted,
+        and chunks that no longer exist are deleted from the vector store. Documents last
+        indexed with other settings have all their chunks embedded again.
+        """
+        if self.manifest is None:
+            raise ValueError("Incremental indexing requires an index manifest")
+
+        fingerprint = document.fingerprint
+        previous = self.manifest.get(document.id, self.collection_name)
+        same_settings = previous is not None and previous.settings == self.settings
+        if same_settings and previous.fingerprint == fingerprint:
+            return IndexingReport(document_id=document.id, upserted=0, deleted=0, unchanged=True)
+
+        indexed_chunk_ids = previous.chunk_ids if previous is not None else set()
+        chunks = list({chunk.id: chunk for chunk in self._chunk(document)}.values())
+        # Chunks indexed under other settings are kept by id, but their vectors are stale
+        reusable_chunk_ids = indexed_chunk_ids if same_settings else set()
+        new_chunks = [chunk for chunk in chunks if chunk.id not in reusable_chunk_ids]
+        stale_chunk_ids = indexed_chunk_ids - {chunk.id for chunk in chunks}
+
+        if new_chunks:
+            self._index_vectors(self._build_vectors(document, new_chunks))
+        if stale_chunk_ids:
+            with self.instrumentation.stage("delete", vectors=len(stale_chunk_ids)):
+                self.vector_store.delete_vectors(
+                    ids=sorted(stale_chunk_ids, key=str),
+                    collection_name=self.collection_name,
+                )
+                if self.lexical_index is not None:
+                    self.lexical_index.delete(
+                        sorted(stale_chunk_ids, key=str), collection_name=self.collection_name
+                    )
+            self._invalidate_search_cache()
+
+        self.manifest.save(
+            IndexedDocument(
+                id=document.id,
+                fingerprint=fingerprint,
+                chunk_ids={chunk.id for chunk in chunks},
+                settings=self.settings,
+            ),
+            collection_name=self.collection_name,
+        )
+        return IndexingReport(
+            document_id=document.id,
+            upserted=len(new_chunks),
+            deleted=len(stale_chunk_ids),
         )
@@ -1,5 +1,25 @@
-from memorag.domain.entities import SearchResponse
-from memorag.domain.ports import Embedder, Generator, Reranker, VectorStore
+import json
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+
+from memorag.application.context import ContextBuilder
+from memorag.application.fusion import reciprocal_rank_fusion
+from memorag.application.instrumentation import Instrumentation, NoInstrumentation
+from memorag.domain.entities import CachedSearch, SearchFilter, SearchResponse, Vector
+from memorag.domain.ports import (
+    Embedder,
+    Generator,
+    LexicalIndex,
+    Reranker,
+    SearchCache,
+    VectorStore,
+)
+
+
+def _result_of(answer: Future[list[str]]) -> Iterator[str]:
+    yield from answer.result()
 
 
 class SearchDocuments:
@@ -11,37 +31,328 @@ class SearchDocuments:
         vector_store: VectorStore,
         reranker: Reranker,
         generator: Generator,
+        instrumentation: Instrumentation | None = None,
+        search_cache: SearchCache | None = None,
+        lexical_index: LexicalIndex | None = None,
+        collection_name: str = COLLECTION_NAME,
+        context_builder: ContextBuilder | None = None,
+        settings: str = "",
     ):
         self.embedder = embedder
         self.vector_store = vector_store
         self.reranker = reranker
         self.generator = generator
+        self.instrumentation = instrumentation or NoInstrumentation()
+        self.search_cache = search_cache
+        self.lexical_index = lexical_index
+        self.collection_name = collection_name
+        self.context_builder = context_builder
+        # Identifies the models and retrieval settings the answers are produced with, so
+        # that cached answers are only replayed under the same configuration
+        self.settings = settings
+
+    def _cache_answer(
+        self,
+        answer: Iterator[str],
+        query: str,
+        query_embedding: np.ndarray,
+        parameters: str,
+        collection_name: str,
+        sources: list[Vector],
+    ) -> Iterator[str]:
+        """Streams the answer, caching it once it has been generated entirely."""
+        chunks = []
+        for chunk in answer:
+            chunks.append(chunk)
+            yield chunk
+
+        if self.search_cache is not None:
+            self.search_cache.save(
+                query,
+                query_embedding,
+                parameters,
+                collection_name,
+                CachedSearch(answer=chunks, sources=sources),
+            )
+
+    def _with_vectors(self, raw: bool) -> bool:
+        # Embeddings are only needed to spot near-duplicate chunks while building the context,
+        # which raw searches skip
+        return (
+            not raw and self.context_builder is not None and self.context_builder.needs_embeddings
+        )
+
+    def _build_context(self, query: str, vectors: list[Vector]) -> tuple[str, list[Vector]]:
+        """Returns the context of the LLM and the vectors it was built from."""
+        if self.context_builder is None:
+            return "\n\n".join([doc.content.decode("utf-8") for doc in vectors]), vectors
+
+        with self.instrumentation.stage("build_context", chunks=len(vectors)) as attributes:
+            context = self.context_builder.build(query, vectors)
+            attributes.update(
+                tokens=context.tokens,
+                tokens_saved=context.tokens_saved,
+                duplicates=context.duplicates,
+                merged=context.merged,
+                dropped=context.dropped,
+            )
+        return context.text, context.sources
+
+    def _parameters(
+        self,
+        top_k: int,
+        raw: bool,
+        top_n: int | None,
+        min_score: float | None,
+        score_threshold: float | None,
+        filters: SearchFilter | None,
+    ) -> str:
+        """The search parameters an answer depends on, identifying it in the cache."""
+        return json.dumps(
+            {
+                "settings": self.settings,
+                "top_k": top_k,
+                "raw": raw,
+                "top_n": top_n,
+                "min_score": min_score,
+                "score_threshold": score_threshold,
+                "filters": filters.model_dump(mode="json") if filters is not None else None,
+                # The budget and deduplication change both the answer and its sources
+                "context": (
+                    {
+                        "max_tokens": self.context_builder.max_tokens,
+                        "dedup_threshold": self.context_builder.dedup_threshold,
+                    }
+                    if self.context_builder is not None
+                    else None
+                ),
+            }
+        )
+
+    def _fuse_lexical(
+        self,
+        query: str,
+        candidates_vectors: list[Vector],
+        top_k: int,
+        collection_name: str,
+        filters: SearchFilter | None,
+    ) -> list[Vector]:
+        """Merges the best lexical matches into the candidates, with a lexical index."""
+        if self.lexical_index is None:
+            return candidates_vectors
+
+        with self.instrumentation.stage("lexical_retrieve", top_k=top_k) as attributes:
+            lexical_vectors = self.lexical_index.search(
+                query, top_k=top_k, collection_name=collection_name, filters=filters
+            )
+            attributes["candidates"] = len(lexical_vectors)
+        # Lexical scores are not similarities, so they are not exposed as such
+        return reciprocal_rank_fusion(
+            [
+                candidates_vectors,
+                [vector.model_copy(update={"score": None}) for vector in lexical_vectors],
+            ]
+        )[:top_k]
+
+    def _generate(self, context: str, query: str) -> Iterator[str]:
+        if self.instrumentation.enabled:
+            with self.instrumentation.stage("count_tokens") as attributes:
+                prompt_tokens = self.generator.count_tokens(context=context, query=query)
+                if prompt_tokens is not None:
+                    attributes["prompt_tokens"] = prompt_tokens
 
-    def execute(self, query: str, top_k: int = 20, raw: bool = False) -> SearchResponse:
+        # Generate answer, timing the stream as it is consumed
+        return self.instrumentation.stream(
+            "generate",
+            self.generator.generate(context=context, query=query),
+            first_item_stage="generate.first_token",
+        )
+
+    def execute(
+        self,
+        query: str,
+        top_k: int = 20,
+        raw: bool = False,
+        top_n: int | None = None,
+        min_score: float | None = None,
+        score_threshold: float | None = None,
+        filters: SearchFilter | None = None,
+        collection_name: str | None = None,
+    ) -> SearchResponse:
         """
         Searches for documents similar to the query, reranks them, and generates an answer.
+        Candidates below the `score_threshold` similarity or not matching `filters` are never
+        retrieved, and only the `top_n` reranked documents scoring at least `min_score` make
+        it into the context. `collection_name` overrides the collection searched.
+        With a context builder, duplicates are left out of the context, which is kept
+        within a token budget and merges consecutive chunks, and the sources are the chunks
+        it was built from. With a lexical index, the `top_k` best lexical matches are
+        retrieved as well and merged with the similar ones by reciprocal rank fusion. With a
+        cache, the answer to the same or a similar query run with the same parameters is
+        replayed instead.
         """
-        query_embedding = self.embedder.embed(query)
+        collection_name = collection_name or self.collection_name
+        with self.instrumentation.stage("embed", texts=1):
+            query_embedding = self.embedder.embed(query)
 
-        candidates_vectors = self.vector_store.search_similar(
-            query_vector=query_embedding,
-            top_k=top_k,
-            collection_name=self.COLLECTION_NAME,
-        )
+        parameters = self._parameters(top_k, raw, top_n, min_score, score_threshold, filters)
+        if self.search_cache is not None:
+            with self.instrumentation.stage("cache_lookup") as attributes:
+                cached = self.search_cache.get(query, query_embedding, parameters, collection_name)
+                attributes["hits"] = int(cached is not None)
+            if cached is not None:
+                return SearchResponse(answer=iter(cached.answer), sources=cached.sources)
+
+        with self.instrumentation.stage("retrieve", top_k=top_k) as attributes:
+            candidates_vectors = self.vector_store.search_similar(
+                query_vector=query_embedding,
+                top_k=top_k,
+                collection_name=collection_name,
+                score_threshold=score_threshold,
+                filters=filters,
+                with_vectors=self._with_vectors(raw),
+            )
+            attributes["candidates"] = len(candidates_vectors)
 
-        reranked_vectors = self.reranker.rerank(
-            query=query,
-            vectors=candidates_vectors,
+        candidates_vectors = self._fuse_lexical(
+            query, candidates_vectors, top_k, collection_name, filters
         )
 
+        reranked_vectors = []
+        if candidates_vectors:
+            with self.instrumentation.stage(
+                "rerank", candidates=len(candidates_vectors)
+            ) as attributes:
+                reranked_vectors = self.reranker.rerank(
+                    query=query,
+                    vectors=candidates_vectors,
+                    top_n=top_n,
+                    min_score=min_score,
+                )
+                attributes["kept"] = len(reranked_vectors)
+
         if raw:
             answer = "\n\n".join([doc.content.decode("utf-8") for doc in reranked_vectors])
+            if self.search_cache is not None:
+                self.search_cache.save(
+                    query,
+                    query_embedding,
+                    parameters,
+                    collection_name,
+                    CachedSearch(answer=[answer], sources=reranked_vectors),
+                )
             return SearchResponse(answer=[answer], sources=reranked_vectors)
 
-        # Build context from reranked vectors
-        context = "\n\n".join([doc.content.decode("utf-8") for doc in reranked_vectors])
+        context, reranked_vectors = self._build_context(query, reranked_vectors)
 
-        # Generate answer
-        answer = self.generator.generate(context=context, query=query)
+        answer = self._generate(context, query)
+        if self.search_cache is not None:
+            answer = self._cache_answer(
+                answer, query, query_embedding, parameters, collection_name, reranked_vectors
+            )
 
         return SearchResponse(answer=answer, sources=reranked_vectors)
+
+    def execute_many(
+        self,
+        queries: list[str],
+        top_k: int = 20,
+        raw: bool = False,
+        top_n: int | None = None,
+        min_score: float | None = None,
+        score_threshold: float | None = None,
+        filters: SearchFilter | None = None,
+        collection_name: str | None = None,
+        concurrency: int = 4,
+    ) -> list[SearchResponse]:
+        """
+        Searches for several queries as `execute` does, returning their responses in order.
+        The queries are embedded in a single batch, retrieved in a single vector store
+        request and reranked together, then their answers are generated in the background,
+        `concurrency` at a time. Consuming an answer waits for it to be generated, and
+        raises the error its generation failed with.
+        """
+        if concurrency < 1:
+            raise ValueError("Concurrency must be at least 1")
+        if not queries:
+            return []
+
+        collection_name = collection_name or self.collection_name
+        with self.instrumentation.stage("embed", texts=len(queries)):
+            query_embeddings = self.embedder.embed_batch(queries)
+
+        parameters = self._parameters(top_k, raw, top_n, min_score, score_threshold, filters)
+        responses: dict[int, SearchResponse] = {}
+        if self.search_cache is not None:
+            with self.instrumentation.stage("cache_lookup") as attributes:
+                for i, query in enumerate(queries):
+                    cached = self.search_cache.get(
+                        query, query_embeddings[i], parameters, collection_name
+                    )
+                    if cached is not None:
+                        responses[i] = SearchResponse(
+                            answer=iter(cached.answer), sources=cached.sources
+                        )
+                attributes["hits"] = len(responses)
+        pending = [i for i in range(len(queries)) if i not in responses]
+        if not pending:
+            return [responses[i] for i in range(len(queries))]
+
+        with self.instrumentation.stage("retrieve", top_k=top_k) as attributes:
+            candidates = self.vector_store.search_similar_batch(
+                query_vectors=query_embeddings[pending],
+                top_k=top_k,
+                collection_name=collection_name,
+                score_threshold=score_threshold,
+                filters=filters,
+                with_vectors=self._with_vectors(raw),
+            )
+            attributes["candidates"] = sum(map(len, candidates))
+
+        candidates = [
+            self._fuse_lexical(queries[i], vectors, top_k, collection_name, filters)
+            for i, vectors in zip(pending, candidates, strict=True)
+        ]
+
+        reranked: list[list[Vector]] = [[] for _ in pending]
+        if any(candidates):
+            with self.instrumentation.stage(
+                "rerank", candidates=sum(map(len, candidates))
+            ) as attributes:
+                reranked = self.reranker.rerank_many(
+                    queries=[queries[i] for i in pending],
+                    vectors=candidates,
+                    top_n=top_n,
+                    min_score=min_score,
+                )
+                attributes["kept"] = sum(map(len, reranked))
+
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        for i, vectors in zip(pending, reranked, strict=True):
+            query = queries[i]
+            if raw:
+                answer = "\n\n".join([doc.content.decode("utf-8") for doc in vectors])
+                if self.search_cache is not None:
+                    self.search_cache.save(
+                        query,
+                        query_embeddings[i],
+                        parameters,
+                        collection_name,
+                        CachedSearch(answer=[answer], sources=vectors),
+                    )
+                responses[i] = SearchResponse(answer=[answer], sources=vectors)
+                continue
+
+            context, sources = self._build_context(query, vectors)
+            generated = self._generate(context, query)
+            if self.search_cache is not None:
+                generated = self._cache_answer(
+                    generated, query, query_embeddings[i], parameters, collection_name, sources
+                )
+            responses[i] = SearchResponse(
+                answer=_result_of(executor.submit(list, generated)), sources=sources
+            )
+        # Answers already submitted are still generated, the threads exiting afterwards
+        executor.shutdown(wait=False)
+
+        return [responses[i] for i in range(len(queries))]
@@ -1,6 +1,32 @@
+from .batch_indexing_report import BatchIndexingReport
+from .cached_search import CachedSearch
 from .document import Document, DocumentType
-from .document_chunk import DocumentChunk
+from .document_chunk import ChunkSpan, DocumentChunk
+from .embedder_comparison import EmbedderComparison
+from .indexed_document import IndexedDocument
+from .indexing_report import IndexingReport
+from .retrieval_evaluation import EvaluationQuery, RetrievalEvaluation, StageLatency
+from .search_filter import SearchFilter
 from .search_response import SearchResponse
+from .snapshot import SnapshotHeader, SnapshotReport
 from .vector import Vector
 
-__all__ = ["Vector", "SearchResponse", "Document", "DocumentChunk", "DocumentType"]
+__all__ = [
+    "Vector",
+    "SearchResponse",
+    "Document",
+    "DocumentChunk",
+    "ChunkSpan",
+    "DocumentType",
+    "IndexedDocument",
+    "IndexingReport",
+    "CachedSearch",
+    "EmbedderComparison",
+    "BatchIndexingReport",
+    "SearchFilter",
+    "EvaluationQuery",
+    "RetrievalEvaluation",
+    "StageLatency",
+    "SnapshotHeader",
+    "SnapshotReport",
+]
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+
+class BatchIndexingReport(BaseModel):
+    documents: int
+    chunks: int
+    seconds: float
+    failures: list[str] = []
+
+    @property
+    def documents_per_second(self) -> float:
+        return self.documents / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.chunks / self.seconds if self.seconds > 0 else 0.0
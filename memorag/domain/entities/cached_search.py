@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+from .vector import Vector
+
+
+class CachedSearch(BaseModel):
+    answer: list[str]
+    sources: list[Vector]
@@ -1,10 +1,15 @@
+import hashlib
+import os
 from collections.abc import Generator
 from enum import Enum
-from uuid import UUID, uuid4
+from typing import ClassVar
+from uuid import NAMESPACE_URL, UUID, uuid5
 
 from pydantic import BaseModel
 
-from .document_chunk import DocumentChunk
+from .document_chunk import ChunkSpan, DocumentChunk
+
+DOCUMENT_NAMESPACE = uuid5(NAMESPACE_URL, "https://github.com/patacoing/memorag")
 
 
 class DocumentType(str, Enum):
@@ -14,41 +19,135 @@ class DocumentType(str, Enum):
     WORD = "word"
     OTHER = "other"
 
+    @classmethod
+    def from_filepath(cls, filepath: str) -> "DocumentType":
+        """Guesses the type of a file from its extension, falling back to OTHER."""
+        return _EXTENSION_TYPES.get(os.path.splitext(filepath)[1].lower(), cls.OTHER)
+
+
+_EXTENSION_TYPES = {
+    ".md": DocumentType.MARKDOWN,
+    ".markdown": DocumentType.MARKDOWN,
+    ".txt": DocumentType.TEXT,
+    ".rst": DocumentType.TEXT,
+    ".adoc": DocumentType.TEXT,
+    ".pdf": DocumentType.PDF,
+    ".doc": DocumentType.WORD,
+    ".docx": DocumentType.WORD,
+}
+
 
 class Document(BaseModel):
+    DEFAULT_BLOCK_SIZE: ClassVar[int] = 1024 * 1024
+
     id: UUID
     name: str
     content: bytes
     metadata: dict[str, str] | None = None
     type: DocumentType
     _chunk: DocumentChunk | None = None
+    _chunk_spans: list[ChunkSpan] | None = None
+    _filepath: str | None = None
 
     @property
     def chunks(self) -> Generator[DocumentChunk, None, None]:
-        if self._chunk is None:
+        """
+        Iterates over the chunks of the document. Chunks described by spans are
+        materialized one at a time from a view over the content.
+        """
+        if self._chunk_spans is not None:
+            view = memoryview(self.content)
+            for span in self._chunk_spans:
+                yield DocumentChunk(
+                    id=span.id,
+                    content=view[span.start : span.end].tobytes(),
+                    metadata=span.metadata,
+                    start=span.start,
+                    end=span.end,
+                )
             return
-        current_chunk = self.model_copy(deep=True)._chunk
+
+        current_chunk = self._chunk
         while current_chunk is not None:
             yield current_chunk
             current_chunk = current_chunk.next_chunk
 
+    def set_chunk_spans(self, spans: list[ChunkSpan]) -> None:
+        """Attaches chunks given as byte ranges of the document content."""
+        self._chunk_spans = spans
+        self._chunk = None
+
+    @property
+    def is_lazy(self) -> bool:
+        """Whether the content is read from disk on demand instead of being held in memory."""
+        return self._filepath is not None
+
+    def iter_content(self, block_size: int = DEFAULT_BLOCK_SIZE) -> Generator[bytes, None, None]:
+        """
+        Yields the document content in blocks of at most `block_size` bytes.
+        Lazy documents are read from disk block by block, so the whole file is never in memory.
+        """
+        if self._filepath is None:
+            for start in range(0, len(self.content), block_size):
+                yield self.content[start : start + block_size]
+            return
+
+        with open(self._filepath, "rb") as f:
+            while block := f.read(block_size):
+                yield block
+
+    @property
+    def fingerprint(self) -> str:
+        """Sha256 of the document content, read block by block for lazy documents."""
+        digest = hashlib.sha256()
+        for block in self.iter_content():
+            digest.update(block)
+        return digest.hexdigest()
+
+    def chunk_id(self, content: bytes | memoryview) -> UUID:
+        """
+        Deterministic id of a chunk of this document, derived from its content so that
+        unchanged chunks keep their id when the document is indexed again.
+        """
+        return uuid5(self.id, hashlib.sha256(content).hexdigest())
+
+    def materialize(self) -> "Document":
+        """Returns an in-memory copy of the document, reading its content if it is lazy."""
+        if not self.is_lazy:
+            return self
+        document = self.model_copy(update={"content": b"".join(self.iter_content())})
+        document._filepath = None
+        return document
+
     @classmethod
     def from_text(cls, content: str) -> "Document":
         return cls(
-            id=uuid4(),
+            id=uuid5(DOCUMENT_NAMESPACE, "text:" + hashlib.sha256(content.encode()).hexdigest()),
             name="text_document",
             content=content.encode("utf-8"),
             type=DocumentType.TEXT,
         )
 
     @classmethod
-    def from_filepath(cls, filepath: str, filetype: DocumentType) -> "Document":
-        with open(filepath, "rb") as f:
-            content = f.read()
+    def from_filepath(
+        cls, filepath: str, filetype: DocumentType, lazy: bool = False
+    ) -> "Document":
+        """
+        Builds a document from a file, identified by its absolute path so that indexing
+        the same file again targets the same document. When `lazy` is set, the content is
+        left empty and read on demand through `iter_content`.
+        """
+        content = b""
+        if not lazy:
+            with open(filepath, "rb") as f:
+                content = f.read()
         name = filepath.split("/")[-1]
-        return cls(
-            id=uuid4(),
+        document = cls(
+            id=uuid5(DOCUMENT_NAMESPACE, "file:" + os.path.abspath(filepath)),
             name=name,
             content=content,
             type=filetype,
         )
+        if lazy:
+            document._filepath = filepath
+        return document
@@ -1,3 +1,4 @@
+from typing import NamedTuple
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -7,4 +8,15 @@ class DocumentChunk(BaseModel):
     id: UUID
     content: bytes
     metadata: dict[str, str] | None = None
+    start: int | None = None
+    end: int | None = None
     next_chunk: "DocumentChunk | None" = None
+
+
+class ChunkSpan(NamedTuple):
+    """Flat description of a chunk as a byte range of its document content."""
+
+    id: UUID
+    start: int
+    end: int
+    metadata: dict[str, str] | None = None
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+
+class EmbedderComparison(BaseModel):
+    texts: int
+    min_similarity: float
+    mean_similarity: float
+    tolerance: float
+
+    @property
+    def within_tolerance(self) -> bool:
+        return self.min_similarity >= 1 - self.tolerance
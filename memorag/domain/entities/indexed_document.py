@@ -0,0 +1,13 @@
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class IndexedDocument(BaseModel):
+    """Record of a document as it was last indexed into a collection."""
+
+    id: UUID
+    fingerprint: str
+    chunk_ids: set[UUID]
+    # Chunking and embedding settings the chunks were indexed with
+    settings: str = ""
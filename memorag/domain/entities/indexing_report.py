@@ -0,0 +1,10 @@
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class IndexingReport(BaseModel):
+    document_id: UUID
+    upserted: int
+    deleted: int
+    unchanged: bool = False
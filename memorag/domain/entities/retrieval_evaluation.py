@@ -0,0 +1,31 @@
+from pydantic import BaseModel
+
+
+class EvaluationQuery(BaseModel):
+    """A query of an evaluation dataset, with the ids or names of its relevant documents."""
+
+    query: str
+    expected: list[str]
+
+
+class StageLatency(BaseModel):
+    """Latency of a pipeline stage over the queries of an evaluation, in seconds."""
+
+    calls: int
+    mean: float
+    p50: float
+    p95: float
+
+
+class RetrievalEvaluation(BaseModel):
+    """Quality of the documents retrieved and reranked for a dataset, averaged over queries."""
+
+    queries: int
+    k: int
+    recall: float
+    mrr: float
+    ndcg: float
+    latencies: dict[str, StageLatency]
+
+    def meets(self, min_recall: float) -> bool:
+        return self.recall >= min_recall
@@ -0,0 +1,29 @@
+from datetime import datetime, timezone
+
+from pydantic import BaseModel, field_validator
+
+from .document import DocumentType
+
+
+class SearchFilter(BaseModel):
+    """
+    Restricts a search to the chunks of some documents: of a type, with a name, or
+    inserted within a date range. Unset fields do not restrict the search.
+    """
+
+    document_type: DocumentType | None = None
+    document_name: str | None = None
+    inserted_after: datetime | None = None
+    inserted_before: datetime | None = None
+
+    @field_validator("inserted_after", "inserted_before")
+    @classmethod
+    def _as_utc(cls, value: datetime | None) -> datetime | None:
+        # Chunks are timestamped in UTC, so dates without a timezone are taken as UTC
+        if value is not None and value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value
+
+    @property
+    def is_empty(self) -> bool:
+        return all(value is None for value in self.model_dump().values())
@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class SnapshotHeader(BaseModel):
+    """Describes the vectors of a snapshot, to refuse loading them into a different setup."""
+
+    embedding_model: str
+    # Backends of a model produce slightly different vectors, e.g. int8-quantized ones
+    embedding_backend: str
+    embedding_dim: int
+    collection: str
+    created_at: datetime
+
+
+class SnapshotReport(BaseModel):
+    vectors: int
+    seconds: float
+
+    @property
+    def vectors_per_second(self) -> float:
+        return self.vectors / self.seconds if self.seconds > 0 else 0.0
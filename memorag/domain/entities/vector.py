@@ -7,10 +7,12 @@ from pydantic import BaseModel, ConfigDict
 
 class Vector(BaseModel):
     id: UUID
-    vector: np.ndarray
+    vector: np.ndarray | None = None
     inserted_at: datetime
     content: bytes
     metadata: dict | None = None
+    score: float | None = None
+    rerank_score: float | None = None
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
@@ -1,8 +1,25 @@
 from .chunker import Chunker
 from .embedder import Embedder
 from .generator import Generator
+from .index_manifest import IndexManifest
+from .lexical_index import LexicalIndex
 from .llm import LLM
 from .reranker import Reranker
+from .search_cache import SearchCache
+from .snapshot_file import SnapshotFile
+from .tokenizer import Tokenizer
 from .vector_store import VectorStore
 
-__all__ = ["Embedder", "VectorStore", "Reranker", "Generator", "LLM", "Chunker"]
+__all__ = [
+    "Embedder",
+    "VectorStore",
+    "Reranker",
+    "Generator",
+    "LLM",
+    "Chunker",
+    "IndexManifest",
+    "SearchCache",
+    "LexicalIndex",
+    "Tokenizer",
+    "SnapshotFile",
+]
@@ -1,9 +1,18 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 
-from memorag.domain.entities import Document
+from memorag.domain.entities import Document, DocumentChunk
 
 
 class Chunker(ABC):
     @abstractmethod
     def chunk(self, document: Document) -> Document:
         pass
+
+    @abstractmethod
+    def iter_chunks(self, document: Document) -> Iterator[DocumentChunk]:
+        """
+        Yield the chunks of the document one at a time, reading its content
+        incrementally through `Document.iter_content`.
+        """
+        pass
@@ -9,6 +9,11 @@ class Embedder(ABC):
         """Convert the input text into a vector embedding."""
         pass
 
+    @abstractmethod
+    def embed_batch(self, texts: list[str]) -> np.ndarray:
+        """Convert a list of texts into a matrix of embeddings, one row per text."""
+        pass
+
     @abstractmethod
     def get_embedding_dimension(self) -> int:
         """Return the dimension of the embeddings produced by this embedder."""
@@ -7,3 +7,7 @@ class Generator(ABC):
     def generate(self, context: str, query: str) -> PyGenerator[str, None, None]:
         """Generates a natural language response based on the context and the user query."""
         pass
+
+    def count_tokens(self, context: str, query: str) -> int | None:
+        """Returns the number of tokens of the prompt, or None when it cannot be counted."""
+        return None
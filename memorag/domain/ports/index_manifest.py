@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+from uuid import UUID
+
+from memorag.domain.entities import IndexedDocument
+
+
+class IndexManifest(ABC):
+    @abstractmethod
+    def get(self, document_id: UUID, collection_name: str) -> IndexedDocument | None:
+        """Return what was last indexed for the document, if it was indexed before."""
+        pass
+
+    @abstractmethod
+    def save(self, document: IndexedDocument, collection_name: str) -> None:
+        """Record the fingerprint and chunks of a document that has just been indexed."""
+        pass
+
+    @abstractmethod
+    def delete(self, document_id: UUID, collection_name: str) -> None:
+        """Forget a document, e.g. once its chunks have been removed from the collection."""
+        pass
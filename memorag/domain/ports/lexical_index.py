@@ -0,0 +1,30 @@
+from abc import ABC, abstractmethod
+from uuid import UUID
+
+from memorag.domain.entities import SearchFilter, Vector
+
+
+class LexicalIndex(ABC):
+    @abstractmethod
+    def index(self, vectors: list[Vector], collection_name: str) -> None:
+        """Index the content of chunks by their terms, replacing chunks indexed before."""
+        pass
+
+    @abstractmethod
+    def delete(self, ids: list[UUID], collection_name: str) -> None:
+        """Delete the chunks with the given ids."""
+        pass
+
+    @abstractmethod
+    def search(
+        self,
+        query: str,
+        top_k: int,
+        collection_name: str,
+        filters: SearchFilter | None = None,
+    ) -> list[Vector]:
+        """
+        Search for the chunks matching `filters` that best match the terms of the query,
+        best first.
+        """
+        pass
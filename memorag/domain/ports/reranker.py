@@ -5,6 +5,29 @@ from memorag.domain.entities import Vector
 
 class Reranker(ABC):
     @abstractmethod
-    def rerank(self, query: str, vectors: list[Vector]) -> list[Vector]:
-        """Rerank the list of documents based on their relevance to the query."""
+    def rerank(
+        self,
+        query: str,
+        vectors: list[Vector],
+        top_n: int | None = None,
+        min_score: float | None = None,
+    ) -> list[Vector]:
+        """
+        Rerank the list of documents based on their relevance to the query, recording
+        their relevance in `rerank_score`. Only the `top_n` most relevant documents scoring
+        at least `min_score` are kept.
+        """
         pass
+
+    def rerank_many(
+        self,
+        queries: list[str],
+        vectors: list[list[Vector]],
+        top_n: int | None = None,
+        min_score: float | None = None,
+    ) -> list[list[Vector]]:
+        """Reranks the documents retrieved for each of several queries, as `rerank` does."""
+        return [
+            self.rerank(query, query_vectors, top_n=top_n, min_score=min_score)
+            for query, query_vectors in zip(queries, vectors, strict=True)
+        ]
@@ -0,0 +1,34 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from memorag.domain.entities import CachedSearch
+
+
+class SearchCache(ABC):
+    @abstractmethod
+    def get(
+        self, query: str, query_vector: np.ndarray, parameters: str, collection_name: str
+    ) -> CachedSearch | None:
+        """
+        Return the result of a previous search run with the same parameters, for the same
+        query or one whose embedding is similar enough.
+        """
+        pass
+
+    @abstractmethod
+    def save(
+        self,
+        query: str,
+        query_vector: np.ndarray,
+        parameters: str,
+        collection_name: str,
+        result: CachedSearch,
+    ) -> None:
+        """Record the sources and the complete answer of a search."""
+        pass
+
+    @abstractmethod
+    def invalidate(self, collection_name: str) -> None:
+        """Forget every search of a collection, e.g. once documents were written to it."""
+        pass
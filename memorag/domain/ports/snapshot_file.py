@@ -0,0 +1,24 @@
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+
+from ..entities import SnapshotHeader, Vector
+
+
+class SnapshotFile(ABC):
+    @abstractmethod
+    def write(self, path: str, header: SnapshotHeader, batches: Iterable[list[Vector]]) -> int:
+        """
+        Writes the header and the vectors of every batch, embeddings included, consuming
+        the batches one at a time. Returns the number of vectors written.
+        """
+        pass
+
+    @abstractmethod
+    def read_header(self, path: str) -> SnapshotHeader:
+        """Reads only the header of a snapshot."""
+        pass
+
+    @abstractmethod
+    def read(self, path: str) -> Iterator[list[Vector]]:
+        """Reads the vectors of a snapshot back, in the batches they were written in."""
+        pass
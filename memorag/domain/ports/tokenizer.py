@@ -0,0 +1,13 @@
+from abc import ABC, abstractmethod
+
+
+class Tokenizer(ABC):
+    @abstractmethod
+    def count(self, text: str) -> int:
+        """Returns the number of tokens the LLM splits the text into."""
+        pass
+
+    @property
+    def max_input_tokens(self) -> int | None:
+        """The number of tokens the LLM accepts in a prompt, or None when it is unknown."""
+        return None
@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from uuid import UUID
 
 import numpy as np
 
-from ..entities import Vector
+from ..entities import SearchFilter, Vector
 
 
 class VectorStore(ABC):
@@ -16,9 +18,59 @@ class VectorStore(ABC):
         """Index multiple vectors with associated metadata."""
         pass
 
+    @abstractmethod
+    def delete_vectors(self, ids: list[UUID], collection_name: str) -> None:
+        """Delete the vectors with the given ids."""
+        pass
+
     @abstractmethod
     def search_similar(
-        self, query_vector: np.ndarray, top_k: int, collection_name: str
+        self,
+        query_vector: np.ndarray,
+        top_k: int,
+        collection_name: str,
+        with_vectors: bool = False,
+        score_threshold: float | None = None,
+        filters: SearchFilter | None = None,
     ) -> list[Vector]:
-        """Search for the most similar vectors to the query vector."""
+        """
+        Search for the most similar vectors to the query vector, scored by similarity.
+        Vectors scoring below `score_threshold` or not matching `filters` are left out.
+        Embeddings are only returned when `with_vectors` is set.
+        """
+        pass
+
+    def search_similar_batch(
+        self,
+        query_vectors: np.ndarray,
+        top_k: int,
+        collection_name: str,
+        with_vectors: bool = False,
+        score_threshold: float | None = None,
+        filters: SearchFilter | None = None,
+    ) -> list[list[Vector]]:
+        """
+        Searches for the vectors most similar to each row of `query_vectors`, as
+        `search_similar` does, returning one list of results per query.
+        """
+        return [
+            self.search_similar(
+                query_vector,
+                top_k,
+                collection_name,
+                with_vectors=with_vectors,
+                score_threshold=score_threshold,
+                filters=filters,
+            )
+            for query_vector in query_vectors
+        ]
+
+    @abstractmethod
+    def scroll_vectors(
+        self, collection_name: str, batch_size: int = 256
+    ) -> Iterator[list[Vector]]:
+        """
+        Iterates over every vector of the collection with its embedding, in batches of at
+        most `batch_size`. Raises `ValueError` when the collection does not exist.
+        """
         pass
@@ -1,11 +1,70 @@
-from .cross_encoder import CrossEncoderReranker
-from .litellm_generator import LiteLLMGenerator
-from .qdrant import QdrantVectorStore
-from .sentence_transformer import SentenceTransformerEmbedder
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .cached_embedder import CachedEmbedder
+    from .columnar_snapshot import ColumnarSnapshotFile
+    from .cross_encoder import CrossEncoderReranker
+    from .document_type_chunker import DocumentTypeChunker
+    from .fixed_size_chunker import FixedSizeChunker
+    from .json_lines_exporter import JsonLinesExporter
+    from .litellm_generator import LiteLLMGenerator
+    from .litellm_tokenizer import LiteLLMTokenizer
+    from .local_vector_store import LocalVectorStore
+    from .markdown_chunker import MarkdownChunker
+    from .prometheus_exporter import PrometheusExporter
+    from .qdrant import QdrantCollectionConfig, QdrantVectorStore
+    from .sentence_transformer import SentenceTransformerEmbedder
+    from .sqlite_lexical_index import SqliteLexicalIndex
+    from .sqlite_manifest import SqliteIndexManifest
+    from .sqlite_search_cache import SqliteSearchCache
+
+# Adapters are imported from their module on first access, so that using one of them does
+# not import the heavy dependencies (torch, qdrant-client, litellm) of all the others
+_MODULES = {
+    "CachedEmbedder": ".cached_embedder",
+    "ColumnarSnapshotFile": ".columnar_snapshot",
+    "CrossEncoderReranker": ".cross_encoder",
+    "DocumentTypeChunker": ".document_type_chunker",
+    "FixedSizeChunker": ".fixed_size_chunker",
+    "JsonLinesExporter": ".json_lines_exporter",
+    "LiteLLMGenerator": ".litellm_generator",
+    "LiteLLMTokenizer": ".litellm_tokenizer",
+    "LocalVectorStore": ".local_vector_store",
+    "MarkdownChunker": ".markdown_chunker",
+    "PrometheusExporter": ".prometheus_exporter",
+    "QdrantCollectionConfig": ".qdrant",
+    "QdrantVectorStore": ".qdrant",
+    "SentenceTransformerEmbedder": ".sentence_transformer",
+    "SqliteLexicalIndex": ".sqlite_lexical_index",
+    "SqliteIndexManifest": ".sqlite_manifest",
+    "SqliteSearchCache": ".sqlite_search_cache",
+}
+
+
+def __getattr__(name: str) -> object:
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(module, __name__), name)
+
 
 __all__ = [
     "SentenceTransformerEmbedder",
     "QdrantVectorStore",
+    "QdrantCollectionConfig",
     "LiteLLMGenerator",
     "CrossEncoderReranker",
+    "FixedSizeChunker",
+    "MarkdownChunker",
+    "DocumentTypeChunker",
+    "CachedEmbedder",
+    "SqliteIndexManifest",
+    "PrometheusExporter",
+    "JsonLinesExporter",
+    "SqliteSearchCache",
+    "LocalVectorStore",
+    "SqliteLexicalIndex",
+    "LiteLLMTokenizer",
+    "ColumnarSnapshotFile",
 ]
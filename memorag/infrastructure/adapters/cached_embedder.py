@@ -0,0 +1,163 @@
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from memorag.domain.ports import Embedder
+
+
+class CachedEmbedder(Embedder):
+    """
+    Embedder decorator persisting embeddings on disk, keyed by model name and the sha256 of
+    the text, so unchanged texts are never embedded twice. Vectors live in a float32 file
+    read through a memory map, and an sqlite index maps keys to rows. Once the file reaches
+    `max_size_bytes`, the least recently used rows are overwritten.
+    """
+
+    _DTYPE = np.dtype(np.float32)
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        model_name: str,
+        cache_dir: str,
+        max_size_bytes: int = 512 * 1024 * 1024,
+    ) -> None:
+        self._embedder = embedder
+        self.model_name = model_name
+        self._dimension = embedder.get_embedding_dimension()
+        self._row_size = self._dimension * self._DTYPE.itemsize
+        self.max_entries = max(1, max_size_bytes // self._row_size)
+
+        directory = Path(cache_dir) / hashlib.sha256(model_name.encode()).hexdigest()[:16]
+        directory.mkdir(parents=True, exist_ok=True)
+        self._vectors_path = directory / "vectors.f32"
+        self._vectors: np.ndarray | None = None
+        self._lock = threading.Lock()
+
+        self._index = sqlite3.connect(directory / "index.sqlite", check_same_thread=False)
+        with self._index:
+            self._index.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, row INTEGER NOT NULL UNIQUE, last_used INTEGER NOT NULL)"
+            )
+            self._index.execute(
+                "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+        self._reset_if_incompatible()
+        (self._clock,) = self._index.execute(
+            "SELECT COALESCE(MAX(last_used), 0) FROM embeddings"
+        ).fetchone()
+
+    def _reset_if_incompatible(self) -> None:
+        row = self._index.execute("SELECT value FROM meta WHERE name = 'dimension'").fetchone()
+        if row is not None and int(row[0]) == self._dimension:
+            return
+
+        with self._index:
+            self._index.execute("DELETE FROM embeddings")
+            self._index.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES ('dimension', ?)",
+                (str(self._dimension),),
+            )
+        self._vectors_path.write_bytes(b"")
+
+    @staticmethod
+    def _key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _file_rows(self) -> int:
+        return self._vectors_path.stat().st_size // self._row_size
+
+    def _read_rows(self, rows: list[int]) -> np.ndarray:
+        if self._vectors is None or self._vectors.shape[0] <= max(rows):
+            self._vectors = np.memmap(
+                self._vectors_path,
+                dtype=self._DTYPE,
+                mode="r",
+                shape=(self._file_rows(), self._dimension),
+            )
+        return np.array(self._vectors[rows])
+
+    def _allocate_rows(self, count: int) -> list[int]:
+        file_rows = self._file_rows()
+        rows = list(range(file_rows, min(file_rows + count, self.max_entries)))
+        missing = count - len(rows)
+        if missing > 0:
+            evicted = self._index.execute(
+                "SELECT key, row FROM embeddings ORDER BY last_used LIMIT ?", (missing,)
+            ).fetchall()
+            self._index.executemany(
+                "DELETE FROM embeddings WHERE key = ?", [(key,) for key, _ in evicted]
+            )
+            rows.extend(row for _, row in evicted)
+        return rows
+
+    def _store(self, keys: list[str], embeddings: np.ndarray) -> None:
+        # A batch larger than the whole cache only keeps its last entries
+        keys = keys[-self.max_entries :]
+        embeddings = embeddings[-self.max_entries :]
+        with self._index:
+            rows = self._allocate_rows(len(keys))
+            with open(self._vectors_path, "r+b") as f:
+                for row, embedding in zip(rows, embeddings, strict=True):
+                    f.seek(row * self._row_size)
+                    f.write(np.asarray(embedding, dtype=self._DTYPE).tobytes())
+            self._clock += 1
+            self._index.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, row, last_used) VALUES (?, ?, ?)",
+                [(key, row, self._clock) for key, row in zip(keys, rows, strict=True)],
+            )
+
+    def _lookup(self, keys: list[str]) -> dict[str, int]:
+        found: dict[str, int] = {}
+        unique_keys = list(dict.fromkeys(keys))
+        # Stay well below sqlite's limit on the number of bound parameters
+        for start in range(0, len(unique_keys), 500):
+            batch = unique_keys[start : start + 500]
+            placeholders = ",".join("?" * len(batch))
+            found.update(
+                self._index.execute(
+                    f"SELECT key, row FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+            )
+        if found:
+            self._clock += 1
+            with self._index:
+                self._index.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(self._clock, key) for key in found],
+                )
+        return found
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: list[str]) -> np.ndarray:
+        embeddings = np.empty((len(texts), self._dimension), dtype=self._DTYPE)
+        if not texts:
+            return embeddings
+
+        keys = [self._key(text) for text in texts]
+        with self._lock:
+            found = self._lookup(keys)
+            hits = [i for i, key in enumerate(keys) if key in found]
+            if hits:
+                embeddings[hits] = self._read_rows([found[keys[i]] for i in hits])
+
+            missing = {
+                key: text for key, text in zip(keys, texts, strict=True) if key not in found
+            }
+            if missing:
+                computed = self._embedder.embed_batch(list(missing.values()))
+                self._store(list(missing), computed)
+                computed_by_key = dict(zip(missing, computed, strict=True))
+                for i, key in enumerate(keys):
+                    if key in missing:
+                        embeddings[i] = computed_by_key[key]
+        return embeddings
+
+    def get_embedding_dimension(self) -> int:
+        return self._dimension
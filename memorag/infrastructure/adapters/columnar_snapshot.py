@@ -0,0 +1,139 @@
+import json
+import os
+import struct
+import zlib
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from typing import BinaryIO
+from uuid import UUID
+
+import numpy as np
+
+from memorag.domain.entities import SnapshotHeader, Vector
+from memorag.domain.ports import SnapshotFile
+
+_MAGIC = b"MEMORAG-SNAPSHOT"
+_VERSION = 1
+
+PRECISIONS = {"float32": np.dtype("<f4"), "float16": np.dtype("<f2")}
+
+_LENGTH = struct.Struct("<I")
+# Number of vectors of a block and size of its compressed payloads
+_BLOCK = struct.Struct("<IQ")
+
+
+class ColumnarSnapshotFile(SnapshotFile):
+    """
+    Snapshot file storing vectors in blocks, column by column: the embeddings of a block
+    as one contiguous float32 or float16 matrix, and their ids, contents and metadata
+    alongside as zlib-compressed JSON lines. A block of zero vectors ends the file, so
+    that a truncated file is detected rather than partially loaded.
+    """
+
+    def __init__(self, precision: str = "float32") -> None:
+        if precision not in PRECISIONS:
+            choices = ", ".join(PRECISIONS)
+            raise ValueError(f"Unknown precision '{precision}'. Choose one of: {choices}")
+        self.precision = precision
+
+    @staticmethod
+    def _read_exactly(file: BinaryIO, size: int) -> bytes:
+        data = file.read(size)
+        if len(data) != size:
+            raise ValueError("Snapshot file is truncated")
+        return data
+
+    def _read_header(self, file: BinaryIO) -> tuple[SnapshotHeader, np.dtype]:
+        if file.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError("Not a snapshot file")
+        (length,) = _LENGTH.unpack(self._read_exactly(file, _LENGTH.size))
+        data = json.loads(self._read_exactly(file, length))
+        if data["version"] != _VERSION:
+            raise ValueError(f"Unsupported snapshot version {data['version']}")
+        return SnapshotHeader.model_validate(data["header"]), PRECISIONS[data["precision"]]
+
+    @staticmethod
+    def _payload_line(vector: Vector) -> bytes:
+        payload = {
+            "id": str(vector.id),
+            "content": vector.content.decode("utf-8"),
+            "inserted_at": vector.inserted_at.isoformat(),
+            "metadata": vector.metadata,
+        }
+        return json.dumps(payload).encode("utf-8") + b"\n"
+
+    def _write_block(self, file: BinaryIO, header: SnapshotHeader, batch: list[Vector]) -> None:
+        embeddings = []
+        for vector in batch:
+            if vector.vector is None:
+                raise ValueError(f"Vector data missing for vector {vector.id}")
+            embeddings.append(vector.vector)
+        matrix = np.stack(embeddings).astype(PRECISIONS[self.precision])
+        if matrix.shape[1] != header.embedding_dim:
+            raise ValueError(
+                f"Vectors have {matrix.shape[1]} dimensions, not {header.embedding_dim}"
+            )
+
+        payloads = zlib.compress(b"".join(map(self._payload_line, batch)))
+        file.write(_BLOCK.pack(len(batch), len(payloads)))
+        file.write(matrix.tobytes())
+        file.write(payloads)
+
+    def write(self, path: str, header: SnapshotHeader, batches: Iterable[list[Vector]]) -> int:
+        """The file only appears at `path` once completely written."""
+        partial_path = path + ".partial"
+        written = 0
+        try:
+            with open(partial_path, "wb") as file:
+                data = json.dumps(
+                    {
+                        "version": _VERSION,
+                        "precision": self.precision,
+                        "header": header.model_dump(mode="json"),
+                    }
+                ).encode("utf-8")
+                file.write(_MAGIC + _LENGTH.pack(len(data)) + data)
+                for batch in batches:
+                    if batch:
+                        self._write_block(file, header, batch)
+                        written += len(batch)
+                file.write(_BLOCK.pack(0, 0))
+            os.replace(partial_path, path)
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+        return written
+
+    def read_header(self, path: str) -> SnapshotHeader:
+        with open(path, "rb") as file:
+            header, _ = self._read_header(file)
+        return header
+
+    def read(self, path: str) -> Iterator[list[Vector]]:
+        with open(path, "rb") as file:
+            header, dtype = self._read_header(file)
+            row_size = header.embedding_dim * dtype.itemsize
+            while True:
+                count, payloads_size = _BLOCK.unpack(self._read_exactly(file, _BLOCK.size))
+                if count == 0:
+                    return
+
+                matrix = np.frombuffer(self._read_exactly(file, count * row_size), dtype=dtype)
+                embeddings = matrix.reshape(count, header.embedding_dim).astype(np.float32)
+                lines = zlib.decompress(self._read_exactly(file, payloads_size)).splitlines()
+                if len(lines) != count:
+                    raise ValueError("Snapshot file is corrupted")
+
+                vectors = []
+                for line, embedding in zip(lines, embeddings, strict=True):
+                    payload = json.loads(line)
+                    vectors.append(
+                        Vector(
+                            id=UUID(payload["id"]),
+                            vector=embedding,
+                            inserted_at=datetime.fromisoformat(payload["inserted_at"]),
+                            content=payload["content"].encode("utf-8"),
+                            metadata=payload["metadata"],
+                        )
+                    )
+                yield vectors
@@ -1,21 +1,113 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from uuid import UUID
+
 from sentence_transformers import CrossEncoder
 
 from memorag.domain.entities import Vector
 from memorag.domain.ports import Reranker
 
+from .model_backends import backend_options
+
 
 class CrossEncoderReranker(Reranker):
-    def __init__(self, model: str) -> None:
-        self.model = CrossEncoder(model)
+    """
+    Reranks with a sentence-transformers cross-encoder, scoring pairs `batch_size` at a
+    time and truncated to `max_length` tokens (the model's own limit when None). Scores of
+    the last `cache_size` (query, chunk) pairs are cached, chunk ids changing with their
+    content. `backend` runs the model with PyTorch, ONNX Runtime, an int8-quantized ONNX
+    export of the model, or OpenVINO.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        batch_size: int = 32,
+        max_length: int | None = None,
+        backend: str = "torch",
+        cache_size: int = 4096,
+    ) -> None:
+        self.model = CrossEncoder(model, max_length=max_length, **backend_options(backend))
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self._scores: OrderedDict[tuple[str, UUID], float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _score(self, pairs: list[tuple[str, Vector]]) -> list[float]:
+        """Scores (query, chunk) pairs, those missing from the cache in a single batch."""
+        query_keys = {
+            query: hashlib.sha256(query.encode("utf-8")).hexdigest() for query, _ in pairs
+        }
+        keys = [(query_keys[query], vector.id) for query, vector in pairs]
+        with self._lock:
+            cached = {key: self._scores[key] for key in keys if key in self._scores}
+            for key in cached:
+                self._scores.move_to_end(key)
+
+        missing = {key: pair for key, pair in zip(keys, pairs, strict=True) if key not in cached}
+        if missing:
+            predicted = self.model.predict(
+                [(query, vector.content.decode()) for query, vector in missing.values()],
+                batch_size=self.batch_size,
+            )
+            computed = dict(zip(missing, map(float, predicted), strict=True))
+            cached |= computed
+            with self._lock:
+                self._scores.update(computed)
+                while len(self._scores) > self.cache_size:
+                    self._scores.popitem(last=False)
 
-    def rerank(self, query: str, vectors: list[Vector]) -> list[Vector]:
-        pairs = [(query, doc.content.decode()) for doc in vectors]
-        scores = self.model.predict(pairs)
+        return [cached[key] for key in keys]
 
+    @staticmethod
+    def _rank(
+        vectors: list[Vector], scores: list[float], top_n: int | None, min_score: float | None
+    ) -> list[Vector]:
         ranked = sorted(
             zip(vectors, scores, strict=True),
             key=lambda x: x[1],
             reverse=True,
         )
+        if min_score is not None:
+            ranked = [(doc, score) for doc, score in ranked if score >= min_score]
+
+        return [
+            doc.model_copy(update={"rerank_score": float(score)}) for doc, score in ranked[:top_n]
+        ]
+
+    def rerank(
+        self,
+        query: str,
+        vectors: list[Vector],
+        top_n: int | None = None,
+        min_score: float | None = None,
+    ) -> list[Vector]:
+        if not vectors:
+            return []
+
+        scores = self._score([(query, vector) for vector in vectors])
+        return self._rank(vectors, scores, top_n, min_score)
+
+    def rerank_many(
+        self,
+        queries: list[str],
+        vectors: list[list[Vector]],
+        top_n: int | None = None,
+        min_score: float | None = None,
+    ) -> list[list[Vector]]:
+        """Scores the pairs of all the queries together, filling every batch of the model."""
+        pairs = [
+            (query, vector)
+            for query, query_vectors in zip(queries, vectors, strict=True)
+            for vector in query_vectors
+        ]
+        scores = self._score(pairs) if pairs else []
 
-        return [doc for doc, _ in ranked]
+        reranked = []
+        start = 0
+        for query_vectors in vectors:
+            end = start + len(query_vectors)
+            reranked.append(self._rank(query_vectors, scores[start:end], top_n, min_score))
+            start = end
+        return reranked
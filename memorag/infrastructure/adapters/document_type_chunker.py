@@ -0,0 +1,21 @@
+from collections.abc import Iterator
+
+from memorag.domain.entities import Document, DocumentChunk, DocumentType
+from memorag.domain.ports import Chunker
+
+
+class DocumentTypeChunker(Chunker):
+    """Delegates chunking to the chunker registered for the type of each document."""
+
+    def __init__(self, chunkers: dict[DocumentType, Chunker], default: Chunker) -> None:
+        self.chunkers = chunkers
+        self.default = default
+
+    def _chunker_for(self, document: Document) -> Chunker:
+        return self.chunkers.get(document.type, self.default)
+
+    def chunk(self, document: Document) -> Document:
+        return self._chunker_for(document).chunk(document)
+
+    def iter_chunks(self, document: Document) -> Iterator[DocumentChunk]:
+        return self._chunker_for(document).iter_chunks(document)
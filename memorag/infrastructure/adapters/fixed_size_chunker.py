@@ -0,0 +1,160 @@
+from collections.abc import Iterator
+
+from memorag.domain.entities import ChunkSpan, Document, DocumentChunk
+from memorag.domain.ports import Chunker
+
+# Separators tried in order when looking for a natural place to end a chunk
+_SEPARATORS = (b"\n\n", b"\n", b" ")
+
+
+class ChunkScanner:
+    """Incremental splitting state of one document, fed with a growing buffer."""
+
+    def __init__(self, chunker: "FixedSizeChunker") -> None:
+        self.chunker = chunker
+        self.start = 0
+
+    @property
+    def keep_from(self) -> int:
+        """Absolute offset before which buffered content is no longer needed."""
+        return self.start
+
+    def scan(
+        self, buffer: bytes | bytearray, base: int, final: bool
+    ) -> list[tuple[int, int, dict[str, str]]]:
+        """
+        Returns the chunk ranges, with their metadata, found in the buffer whose first
+        byte is at absolute offset `base`.
+        """
+        ranges, self.start = self.chunker.split_spans(
+            buffer, base, self.start, base + len(buffer), final
+        )
+        return [(start, end, {}) for start, end in ranges]
+
+
+class FixedSizeChunker(Chunker):
+    """
+    Splits documents into chunks of at most `chunk_size` bytes, consecutive chunks sharing
+    about `chunk_overlap` bytes. Chunks preferably end on a paragraph, line or word boundary
+    and never split a UTF-8 character.
+    """
+
+    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200) -> None:
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be at least 1")
+        if not 0 <= chunk_overlap < chunk_size:
+            raise ValueError("Chunk overlap must be positive and smaller than the chunk size")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+
+    @staticmethod
+    def _is_continuation_byte(buffer: bytes | bytearray, index: int) -> bool:
+        return index < len(buffer) and buffer[index] & 0xC0 == 0x80
+
+    def _find_end(self, buffer: bytes | bytearray, base: int, start: int, limit: int) -> int:
+        lower = start + self.chunk_size // 2
+        for separator in _SEPARATORS:
+            position = buffer.rfind(separator, lower - base, limit - base)
+            if position != -1:
+                return base + position + len(separator)
+
+        end = limit
+        while end > start + 1 and self._is_continuation_byte(buffer, end - base):
+            end -= 1
+        return end
+
+    def _next_start(self, buffer: bytes | bytearray, base: int, start: int, end: int) -> int:
+        next_start = end - self.chunk_overlap
+        if self.chunk_overlap == 0 or next_start <= start:
+            return end
+
+        # Start the overlap on a word boundary when there is one
+        position = buffer.find(b" ", next_start - base, end - base)
+        if position != -1 and base + position + 1 < end:
+            return base + position + 1
+        while next_start < end and self._is_continuation_byte(buffer, next_start - base):
+            next_start += 1
+        return next_start
+
+    def split_spans(
+        self, buffer: bytes | bytearray, base: int, start: int, stop: int, final: bool
+    ) -> tuple[list[tuple[int, int]], int]:
+        """
+        Splits the range [start, stop) of the buffer, whose first byte is at absolute
+        offset `base`, into chunk ranges. Unless `final` is set, the trailing part that
+        could still grow with more data is left unsplit. Returns the ranges and the
+        offset from which splitting should resume.
+        """
+        ranges = []
+        while start < stop:
+            limit = start + self.chunk_size
+            if limit >= stop:
+                if not final:
+                    break
+                if buffer[start - base : stop - base].strip():
+                    ranges.append((start, stop))
+                start = stop
+                break
+
+            end = self._find_end(buffer, base, start, limit)
+            ranges.append((start, end))
+            start = self._next_start(buffer, base, start, end)
+        return ranges, start
+
+    def _new_scanner(self) -> ChunkScanner:
+        return ChunkScanner(self)
+
+    def _chunk_metadata(
+        self, document: Document, metadata: dict[str, str], index: int
+    ) -> dict[str, str]:
+        return (document.metadata or {}) | metadata | {"chunk_index": str(index)}
+
+    def chunk(self, document: Document) -> Document:
+        document = document.materialize()
+        ranges = self._new_scanner().scan(document.content, 0, final=True)
+
+        view = memoryview(document.content)
+        chunked_document = document.model_copy()
+        chunked_document.set_chunk_spans(
+            [
+                ChunkSpan(
+                    id=document.chunk_id(view[start:end]),
+                    start=start,
+                    end=end,
+                    metadata=self._chunk_metadata(document, metadata, index),
+                )
+                for index, (start, end, metadata) in enumerate(ranges)
+            ]
+        )
+        return chunked_document
+
+    def iter_chunks(self, document: Document) -> Iterator[DocumentChunk]:
+        buffer = bytearray()
+        base = 0
+        index = 0
+        scanner = self._new_scanner()
+
+        blocks = document.iter_content()
+        while True:
+            block = next(blocks, None)
+            final = block is None
+            if block is not None:
+                buffer += block
+
+            for start, end, metadata in scanner.scan(buffer, base, final=final):
+                content = bytes(buffer[start - base : end - base])
+                yield DocumentChunk(
+                    id=document.chunk_id(content),
+                    content=content,
+                    metadata=self._chunk_metadata(document, metadata, index),
+                    start=start,
+                    end=end,
+                )
+                index += 1
+
+            if final:
+                return
+
+            # Drop what has been consumed so the buffer stays around one block in size
+            del buffer[: scanner.keep_from - base]
+            base = scanner.keep_from
@@ -0,0 +1,31 @@
+import json
+import threading
+from datetime import datetime, timezone
+
+from memorag.application.instrumentation import Instrumentation, StageRecord
+
+
+class JsonLinesExporter(Instrumentation):
+    """Appends every stage record to a file as one JSON object per line."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")  # noqa: SIM115
+
+    def record(self, record: StageRecord) -> None:
+        line = json.dumps(
+            {
+                "timestamp": datetime.now(tz=timezone.utc).isoformat(),
+                "stage": record.stage,
+                "duration_ms": round(record.duration * 1000, 3),
+                **record.attributes,
+            }
+        )
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
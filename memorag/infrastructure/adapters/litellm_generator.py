@@ -2,8 +2,6 @@ from collections.abc import Generator as PyGenerator
 from enum import Enum
 from typing import TypedDict
 
-import litellm
-
 from memorag.domain.ports import Generator
 
 
@@ -47,9 +45,21 @@ Question:
 Answer:
 """
 
-    def generate(self, context: str, query: str) -> PyGenerator[str, None, None]:
+    def _build_messages(self, context: str, query: str) -> list[LiteLLMMessage]:
         user_content = self._build_user_prompt(context, query)
-        messages = [self.system_message, self._build_message(LiteLLMRole.USER, user_content)]
+        return [self.system_message, self._build_message(LiteLLMRole.USER, user_content)]
+
+    def count_tokens(self, context: str, query: str) -> int | None:
+        import litellm
+
+        messages = self._build_messages(context, query)
+        return litellm.token_counter(model=self.model_name, messages=messages)
+
+    def generate(self, context: str, query: str) -> PyGenerator[str, None, None]:
+        # Imported on first use, as searches returning raw chunks never need it
+        import litellm
+
+        messages = self._build_messages(context, query)
 
         try:
             response = litellm.completion(model=self.model_name, messages=messages, stream=True)
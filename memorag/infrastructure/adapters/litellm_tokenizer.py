@@ -0,0 +1,29 @@
+from functools import cached_property
+
+from memorag.domain.ports import Tokenizer
+
+
+class LiteLLMTokenizer(Tokenizer):
+    """
+    Counts tokens with the tokenizer litellm associates with `model_name`, which falls back
+    to a generic one for models it does not know.
+    """
+
+    def __init__(self, model_name: str) -> None:
+        self.model_name = model_name
+
+    def count(self, text: str) -> int:
+        import litellm
+
+        return litellm.token_counter(model=self.model_name, text=text)
+
+    @cached_property
+    def max_input_tokens(self) -> int | None:
+        import litellm
+
+        try:
+            info = litellm.get_model_info(self.model_name)
+        except Exception:
+            # litellm raises a bare Exception for models missing from its model map
+            return None
+        return info.get("max_input_tokens")
@@ -0,0 +1,481 @@
+import json
+import math
+import sqlite3
+import threading
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+from uuid import UUID
+
+import numpy as np
+
+from memorag.domain.entities import SearchFilter, Vector
+from memorag.domain.ports import VectorStore
+
+from .sqlite_filter import filter_clause
+
+_QUANTIZATIONS = {"float16": np.dtype(np.float16), "int8": np.dtype(np.int8)}
+
+# Rows scored at once, bounding the memory used by a brute-force scan
+_BLOCK_ROWS = 16384
+
+
+class _IvfIndex:
+    """
+    Inverted file index: rows are clustered around centroids with k-means, and a search
+    only scans the rows of the clusters whose centroids are nearest to the query.
+    """
+
+    def __init__(self, centroids: np.ndarray) -> None:
+        self.centroids = centroids
+
+    @classmethod
+    def train(cls, sample: np.ndarray, n_lists: int, iterations: int = 10) -> "_IvfIndex":
+        rng = np.random.default_rng(0)
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            for i in range(n_lists):
+                members = sample[assignments == i]
+                if len(members):
+                    centroid = members.mean(axis=0)
+                    centroids[i] = centroid / (np.linalg.norm(centroid) or 1.0)
+        return cls(centroids)
+
+    def assign(self, vectors: np.ndarray) -> np.ndarray:
+        return np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+
+    def probe(self, query: np.ndarray, n_probe: int) -> np.ndarray:
+        similarities = self.centroids @ query
+        n_probe = min(n_probe, len(similarities))
+        return np.argpartition(-similarities, n_probe - 1)[:n_probe]
+
+
+class _LocalCollection:
+    """
+    One collection stored in a directory: quantized unit vectors in a row-major file read
+    through a memory map, one float32 scale per row for int8, the IVF cluster of each row
+    once the collection is large enough, and ids and payloads in an sqlite sidecar.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        dimension: int,
+        quantization: str,
+        ivf_threshold: int,
+        n_probe: int,
+    ) -> None:
+        self.dimension = dimension
+        self.quantization = quantization
+        self.ivf_threshold = ivf_threshold
+        self.n_probe = n_probe
+        self._dtype = _QUANTIZATIONS[quantization]
+        self._row_size = dimension * self._dtype.itemsize
+
+        directory.mkdir(parents=True, exist_ok=True)
+        self._vectors_path = directory / "vectors.bin"
+        self._scales_path = directory / "scales.f32"
+        self._centroids_path = directory / "centroids.npy"
+        self._lists_path = directory / "lists.i32"
+        for path in (self._vectors_path, self._scales_path, self._lists_path):
+            path.touch()
+
+        self._payloads = sqlite3.connect(directory / "payloads.sqlite", check_same_thread=False)
+        with self._payloads:
+            self._payloads.execute(
+                "CREATE TABLE IF NOT EXISTS points ("
+                "id TEXT PRIMARY KEY, row INTEGER NOT NULL UNIQUE, payload TEXT NOT NULL)"
+            )
+            self._payloads.execute(
+                "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+        self._check_meta()
+
+        rows = self._vectors_path.stat().st_size // self._row_size
+        self._alive = np.zeros(rows, dtype=bool)
+        self._row_by_id: dict[str, int] = {}
+        for point_id, row in self._payloads.execute("SELECT id, row FROM points"):
+            self._alive[row] = True
+            self._row_by_id[point_id] = row
+
+        self._matrix: np.ndarray | None = None
+        self._scales: np.ndarray | None = None
+        self._ivf: _IvfIndex | None = None
+        self._lists: np.ndarray | None = None
+        if self._centroids_path.exists():
+            self._ivf = _IvfIndex(np.load(self._centroids_path))
+
+    def _check_meta(self) -> None:
+        expected = {"dimension": str(self.dimension), "quantization": self.quantization}
+        stored = dict(self._payloads.execute("SELECT name, value FROM meta").fetchall())
+        if not stored:
+            with self._payloads:
+                self._payloads.executemany(
+                    "INSERT INTO meta (name, value) VALUES (?, ?)", expected.items()
+                )
+        elif {name: stored.get(name) for name in expected} != expected:
+            raise ValueError(
+                f"Collection was created with dimension {stored.get('dimension')} and "
+                f"{stored.get('quantization')} quantization, which differ from the "
+                f"configured {self.dimension} and {self.quantization}"
+            )
+
+    @property
+    def size(self) -> int:
+        return len(self._row_by_id)
+
+    def _read_matrix(self) -> np.ndarray:
+        rows = len(self._alive)
+        if self._matrix is None or self._matrix.shape[0] != rows:
+            self._matrix = np.memmap(
+                self._vectors_path, dtype=self._dtype, mode="r", shape=(rows, self.dimension)
+            )
+        return self._matrix
+
+    def _read_scales(self) -> np.ndarray:
+        if self._scales is None:
+            self._scales = np.fromfile(self._scales_path, dtype=np.float32)
+        return self._scales
+
+    def _quantize(self, embeddings: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        if self.quantization == "float16":
+            return embeddings.astype(np.float16), np.ones(len(embeddings), dtype=np.float32)
+        scales = np.abs(embeddings).max(axis=1) / 127
+        scales[scales == 0] = 1.0
+        quantized = np.round(embeddings / scales[:, None]).astype(np.int8)
+        return quantized, scales.astype(np.float32)
+
+    def _dequantize(self, rows: np.ndarray | slice) -> np.ndarray:
+        block = np.asarray(self._read_matrix()[rows], dtype=np.float32)
+        if self.quantization == "int8":
+            block *= self._read_scales()[rows][:, None]
+        return block
+
+    @staticmethod
+    def _write_rows(path: Path, rows: list[int], values: np.ndarray) -> None:
+        row_size = values.itemsize * (values.shape[1] if values.ndim == 2 else 1)
+        with open(path, "r+b") as f:
+            for row, value in zip(rows, values, strict=True):
+                f.seek(row * row_size)
+                f.write(np.ascontiguousarray(value).tobytes())
+
+    def _allocate_rows(self, ids: list[str]) -> list[int]:
+        free_rows = iter(np.flatnonzero(~self._alive).tolist())
+        next_row = len(self._alive)
+        rows = []
+        for point_id in ids:
+            row = self._row_by_id.get(point_id)
+            if row is None:
+                row = next(free_rows, None)
+            if row is None:
+                row = next_row
+                next_row += 1
+            rows.append(row)
+        return rows
+
+    def upsert(self, vectors: list[Vector], embeddings: np.ndarray) -> None:
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings = embeddings / np.where(norms == 0, 1.0, norms)
+        ids = [str(vector.id) for vector in vectors]
+        rows = self._allocate_rows(ids)
+
+        quantized, scales = self._quantize(embeddings)
+        self._write_rows(self._vectors_path, rows, quantized)
+        self._write_rows(self._scales_path, rows, scales)
+        if self._ivf is not None:
+            self._read_lists()
+            self._write_rows(self._lists_path, rows, self._ivf.assign(embeddings))
+
+        with self._payloads:
+            self._payloads.executemany(
+                "DELETE FROM points WHERE id = ?", [(point_id,) for point_id in ids]
+            )
+            self._payloads.executemany(
+                "INSERT INTO points (id, row, payload) VALUES (?, ?, ?)",
+                [
+                    (point_id, row, json.dumps(self._build_payload(vector)))
+                    for point_id, row, vector in zip(ids, rows, vectors, strict=True)
+                ],
+            )
+
+        if max(rows) >= len(self._alive):
+            self._alive = np.concatenate(
+                [self._alive, np.zeros(max(rows) + 1 - len(self._alive), dtype=bool)]
+            )
+        self._alive[rows] = True
+        self._row_by_id.update(zip(ids, rows, strict=True))
+        self._scales = None
+        self._lists = None
+
+    def delete(self, ids: list[UUID]) -> None:
+        rows = [row for id in ids if (row := self._row_by_id.pop(str(id), None)) is not None]
+        with self._payloads:
+            self._payloads.executemany(
+                "DELETE FROM points WHERE id = ?", [(str(id),) for id in ids]
+            )
+        self._alive[rows] = False
+
+    def _read_lists(self) -> np.ndarray:
+        """Returns the cluster of every row, assigning the rows missing from the file."""
+        if self._lists is not None:
+            return self._lists
+        assert self._ivf is not None
+
+        lists = np.fromfile(self._lists_path, dtype=np.int32)
+        if len(lists) < len(self._alive):
+            start = len(lists)
+            missing = [
+                self._ivf.assign(
+                    self._dequantize(slice(s, min(s + _BLOCK_ROWS, len(self._alive))))
+                )
+                for s in range(start, len(self._alive), _BLOCK_ROWS)
+            ]
+            lists = np.concatenate([lists, *missing])
+            with open(self._lists_path, "r+b") as f:
+                f.seek(start * lists.itemsize)
+                f.write(lists[start:].tobytes())
+        self._lists = lists
+        return lists
+
+    def _train_ivf_if_needed(self) -> None:
+        """(Re)trains the clusters once the collection outgrows brute force or doubles."""
+        if self.size < self.ivf_threshold:
+            return
+        trained_on = self._payloads.execute(
+            "SELECT value FROM meta WHERE name = 'ivf_trained_on'"
+        ).fetchone()
+        if self._ivf is not None and trained_on is not None and self.size < 2 * int(trained_on[0]):
+            return
+
+        n_lists = int(math.sqrt(self.size))
+        alive_rows = np.flatnonzero(self._alive)
+        rng = np.random.default_rng(0)
+        sample_rows = np.sort(
+            rng.choice(alive_rows, size=min(len(alive_rows), 256 * n_lists), replace=False)
+        )
+        self._ivf = _IvfIndex.train(self._dequantize(sample_rows), n_lists)
+        np.save(self._centroids_path, self._ivf.centroids)
+        self._lists_path.write_bytes(b"")
+        self._lists = None
+        with self._payloads:
+            self._payloads.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES ('ivf_trained_on', ?)",
+                (str(self.size),),
+            )
+
+    def _candidate_rows(self, query: np.ndarray) -> np.ndarray | None:
+        """Rows worth scoring for the query, or None to scan the whole collection."""
+        self._train_ivf_if_needed()
+        if self._ivf is None or self.size < self.ivf_threshold:
+            return None
+        probed = self._ivf.probe(query, self.n_probe)
+        return np.flatnonzero(np.isin(self._read_lists(), probed) & self._alive)
+
+    def matching_rows(self, filters: SearchFilter) -> np.ndarray:
+        """Sorted rows whose payload matches the filters."""
+        condition, parameters = filter_clause(filters, "payload")
+        rows = self._payloads.execute(
+            f"SELECT row FROM points WHERE {condition}", parameters
+        ).fetchall()
+        return np.sort(np.fromiter((row for (row,) in rows), dtype=np.int64, count=len(rows)))
+
+    def search(
+        self,
+        query_vector: np.ndarray,
+        top_k: int,
+        score_threshold: float | None,
+        filters: SearchFilter | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the best rows and their cosine similarities, best first."""
+        if self.size == 0 or top_k < 1:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        query = np.asarray(query_vector, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1.0)
+
+        candidates = self._candidate_rows(query)
+        if filters is not None and not filters.is_empty:
+            allowed = self.matching_rows(filters)
+            # A selective filter leaves few enough rows to score them all exactly
+            if candidates is None or len(allowed) < self.ivf_threshold:
+                candidates = allowed
+            else:
+                candidates = np.intersect1d(candidates, allowed, assume_unique=True)
+        if candidates is None:
+            rows = np.flatnonzero(self._alive)
+            scores = np.concatenate(
+                [
+                    self._dequantize(slice(start, start + _BLOCK_ROWS)) @ query
+                    for start in range(0, len(self._alive), _BLOCK_ROWS)
+                ]
+            )[rows]
+        else:
+            rows = candidates
+            scores = np.concatenate(
+                [
+                    self._dequantize(rows[start : start + _BLOCK_ROWS]) @ query
+                    for start in range(0, len(rows), _BLOCK_ROWS)
+                ]
+                or [np.empty(0, dtype=np.float32)]
+            )
+
+        if score_threshold is not None:
+            kept = scores >= score_threshold
+            rows, scores = rows[kept], scores[kept]
+        if len(rows) > top_k:
+            best = np.argpartition(-scores, top_k - 1)[:top_k]
+            rows, scores = rows[best], scores[best]
+        order = np.argsort(-scores, kind="stable")
+        return rows[order], scores[order]
+
+    def payloads(self, rows: list[int]) -> dict[int, tuple[str, dict]]:
+        placeholders = ",".join("?" * len(rows))
+        return {
+            row: (point_id, json.loads(payload))
+            for point_id, row, payload in self._payloads.execute(
+                f"SELECT id, row, payload FROM points WHERE row IN ({placeholders})", rows
+            )
+        }
+
+    def rows_after(self, row: int, limit: int) -> list[int]:
+        """The first `limit` rows in use after `row`, in order."""
+        return [
+            next_row
+            for (next_row,) in self._payloads.execute(
+                "SELECT row FROM points WHERE row > ? ORDER BY row LIMIT ?", (row, limit)
+            )
+        ]
+
+    def vectors(self, rows: np.ndarray) -> np.ndarray:
+        return self._dequantize(rows)
+
+    @staticmethod
+    def _build_payload(vector: Vector) -> dict:
+        return {
+            "content": vector.content.decode("utf-8"),
+            "inserted_at": vector.inserted_at.isoformat(),
+            "metadata": vector.metadata,
+        }
+
+
+class LocalVectorStore(VectorStore):
+    """
+    Vector store kept in local files, for single-user deployments without a Qdrant server.
+    Embeddings are stored as float16 or int8 unit vectors read through a memory map and
+    scored by cosine similarity, scanning the whole collection below `ivf_threshold`
+    vectors and only the `n_probe` nearest clusters of an IVF index above it.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        embedding_dim: int,
+        quantization: str = "float16",
+        ivf_threshold: int = 20000,
+        n_probe: int = 16,
+    ) -> None:
+        if quantization not in _QUANTIZATIONS:
+            choices = ", ".join(_QUANTIZATIONS)
+            raise ValueError(f"Unknown quantization '{quantization}'. Choose one of: {choices}")
+        self.path = Path(path)
+        self.embedding_dim = embedding_dim
+        self.quantization = quantization
+        self.ivf_threshold = ivf_threshold
+        self.n_probe = n_probe
+        self._collections: dict[str, _LocalCollection] = {}
+        self._lock = threading.Lock()
+
+    def _collection(self, collection_name: str) -> _LocalCollection:
+        collection = self._collections.get(collection_name)
+        if collection is None:
+            collection = _LocalCollection(
+                self.path / collection_name,
+                self.embedding_dim,
+                self.quantization,
+                self.ivf_threshold,
+                self.n_probe,
+            )
+            self._collections[collection_name] = collection
+        return collection
+
+    def index_vector(self, vector: Vector, collection_name: str) -> None:
+        return self.index_vectors([vector], collection_name)
+
+    def index_vectors(self, vectors: list[Vector], collection_name: str) -> None:
+        if not vectors:
+            return
+        # Later duplicates win, as with successive upserts
+        vectors = list({vector.id: vector for vector in vectors}.values())
+        embeddings = []
+        for vector in vectors:
+            if vector.vector is None:
+                raise ValueError(f"Vector data missing for vector {vector.id}")
+            embeddings.append(vector.vector)
+        with self._lock:
+            self._collection(collection_name).upsert(
+                vectors, np.stack(embeddings).astype(np.float32, copy=False)
+            )
+
+    def delete_vectors(self, ids: list[UUID], collection_name: str) -> None:
+        if not ids:
+            return
+        with self._lock:
+            self._collection(collection_name).delete(ids)
+
+    @staticmethod
+    def _build_vector(point_id: str, payload: dict, embedding: np.ndarray | None) -> Vector:
+        return Vector(
+            id=UUID(point_id),
+            vector=embedding,
+            inserted_at=datetime.fromisoformat(payload["inserted_at"]),
+            content=payload["content"].encode("utf-8"),
+            metadata=payload.get("metadata"),
+        )
+
+    def scroll_vectors(
+        self, collection_name: str, batch_size: int = 256
+    ) -> Iterator[list[Vector]]:
+        """Embeddings are returned as stored, as quantized unit vectors."""
+        if not (self.path / collection_name).is_dir():
+            raise ValueError(f"Collection '{collection_name}' does not exist")
+
+        last_row = -1
+        while True:
+            with self._lock:
+                collection = self._collection(collection_name)
+                rows = collection.rows_after(last_row, batch_size)
+                if not rows:
+                    return
+                payloads = collection.payloads(rows)
+                embeddings = collection.vectors(np.asarray(rows))
+            yield [
+                self._build_vector(*payloads[row], embedding)
+                for row, embedding in zip(rows, embeddings, strict=True)
+            ]
+            last_row = rows[-1]
+
+    def search_similar(
+        self,
+        query_vector: np.ndarray,
+        top_k: int,
+        collection_name: str,
+        with_vectors: bool = False,
+        score_threshold: float | None = None,
+        filters: SearchFilter | None = None,
+    ) -> list[Vector]:
+        with self._lock:
+            collection = self._collection(collection_name)
+            rows, scores = collection.search(query_vector, top_k, score_threshold, filters)
+            if len(rows) == 0:
+                return []
+            payloads = collection.payloads(rows.tolist())
+            embeddings = collection.vectors(rows) if with_vectors else None
+
+        vectors = []
+        for i, (row, score) in enumerate(zip(rows.tolist(), scores.tolist(), strict=True)):
+            vector = self._build_vector(
+                *payloads[row], embeddings[i] if embeddings is not None else None
+            )
+            vectors.append(vector.model_copy(update={"score": score}))
+        return vectors
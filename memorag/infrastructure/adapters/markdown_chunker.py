@@ -0,0 +1,100 @@
+import re
+
+from .fixed_size_chunker import ChunkScanner, FixedSizeChunker
+
+_HEADING = re.compile(rb" {0,3}(#{1,6})[ \t]+(.*?)[ \t#]*\r?$")
+_FENCE = re.compile(rb" {0,3}(`{3,}|~{3,})(.*?)\r?$")
+
+
+class _MarkdownScanner(ChunkScanner):
+    def __init__(self, chunker: FixedSizeChunker) -> None:
+        super().__init__(chunker)
+        self.position = 0
+        # Whether the line at `position` started in data that was already split, so that
+        # it can no longer be a heading or a fence
+        self.mid_line = False
+        # Opening fence of the code block being scanned, closed by the same character
+        # repeated at least as many times
+        self.fence: bytes | None = None
+        self.headings: list[tuple[int, str]] = []
+        self.section_metadata: dict[str, str] = {}
+
+    def _close_section(
+        self,
+        buffer: bytes | bytearray,
+        base: int,
+        stop: int,
+        final: bool,
+        ranges: list[tuple[int, int, dict[str, str]]],
+    ) -> None:
+        section_ranges, self.start = self.chunker.split_spans(
+            buffer, base, self.start, stop, final
+        )
+        ranges.extend((start, end, self.section_metadata) for start, end in section_ranges)
+
+    def _enter_section(self, level: int, title: str) -> None:
+        while self.headings and self.headings[-1][0] >= level:
+            self.headings.pop()
+        self.headings.append((level, title))
+        self.section_metadata = {"heading": " > ".join(title for _, title in self.headings)}
+
+    def _toggle_fence(self, fence: re.Match[bytes]) -> None:
+        marker = fence.group(1)
+        if self.fence is None:
+            self.fence = marker
+        elif (
+            marker[0] == self.fence[0]
+            and len(marker) >= len(self.fence)
+            and not fence.group(2).strip()
+        ):
+            self.fence = None
+
+    def scan(
+        self, buffer: bytes | bytearray, base: int, final: bool
+    ) -> list[tuple[int, int, dict[str, str]]]:
+        ranges: list[tuple[int, int, dict[str, str]]] = []
+        data_end = base + len(buffer)
+
+        while self.position < data_end:
+            newline = buffer.find(b"\n", self.position - base)
+            if newline == -1 and not final:
+                if data_end - self.start > self.chunker.chunk_size:
+                    # Split lines longer than a chunk, e.g. minified files, without waiting
+                    # for their end to keep the buffer bounded
+                    self._close_section(buffer, base, data_end, False, ranges)
+                    self.position = data_end
+                    self.mid_line = True
+                break
+            line_end = data_end if newline == -1 else base + newline + 1
+            content_end = line_end - 1 if newline != -1 else line_end
+
+            if self.mid_line:
+                self.mid_line = False
+            elif fence := _FENCE.match(buffer, self.position - base, content_end - base):
+                self._toggle_fence(fence)
+            elif self.fence is None and (
+                heading := _HEADING.match(buffer, self.position - base, content_end - base)
+            ):
+                self._close_section(buffer, base, self.position, True, ranges)
+                title = heading.group(2).decode("utf-8", errors="replace")
+                self._enter_section(len(heading.group(1)), title)
+
+            self.position = line_end
+            if self.position - self.start > self.chunker.chunk_size:
+                # Split oversized sections as they grow to keep the buffer bounded
+                self._close_section(buffer, base, self.position, False, ranges)
+
+        if final:
+            self._close_section(buffer, base, data_end, True, ranges)
+        return ranges
+
+
+class MarkdownChunker(FixedSizeChunker):
+    """
+    Splits markdown documents into one chunk per section, starting a new section at every
+    heading outside of code blocks. Sections larger than `chunk_size` are split further
+    like `FixedSizeChunker` does. Each chunk records the path of headings it belongs to.
+    """
+
+    def _new_scanner(self) -> _MarkdownScanner:
+        return _MarkdownScanner(self)
@@ -0,0 +1,19 @@
+# Runtimes the sentence-transformers embedding and reranking models can be run with. Kept
+# apart from the adapters so that the CLI can list them without importing PyTorch
+BACKENDS = ("torch", "onnx", "onnx-int8", "openvino")
+
+# Dynamically int8-quantized ONNX export, as produced by sentence-transformers'
+# `export_dynamic_quantized_onnx_model(model, "avx512_vnni", ...)`
+ONNX_INT8_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
+
+def backend_options(backend: str) -> dict:
+    """
+    Keyword arguments loading a sentence-transformers model with `backend`. Raises
+    `ValueError` for unknown backends.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'. Choose one of: {', '.join(BACKENDS)}")
+    if backend == "onnx-int8":
+        return {"backend": "onnx", "model_kwargs": {"file_name": ONNX_INT8_FILE}}
+    return {"backend": backend}
@@ -0,0 +1,66 @@
+import threading
+
+from memorag.application.instrumentation import Instrumentation, StageRecord
+
+_DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class PrometheusExporter(Instrumentation):
+    """
+    Aggregates stage records into a duration histogram and attribute counters per stage,
+    rendered in the Prometheus text exposition format.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = _DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._bucket_counts: dict[str, list[int]] = {}
+        self._sums: dict[str, float] = {}
+        self._counts: dict[str, int] = {}
+        self._attributes: dict[tuple[str, str], int] = {}
+
+    def record(self, record: StageRecord) -> None:
+        with self._lock:
+            bucket_counts = self._bucket_counts.setdefault(record.stage, [0] * len(self.buckets))
+            for i, bound in enumerate(self.buckets):
+                if record.duration <= bound:
+                    bucket_counts[i] += 1
+            self._sums[record.stage] = self._sums.get(record.stage, 0.0) + record.duration
+            self._counts[record.stage] = self._counts.get(record.stage, 0) + 1
+            for name, value in record.attributes.items():
+                key = (record.stage, name)
+                self._attributes[key] = self._attributes.get(key, 0) + value
+
+    def render(self) -> str:
+        with self._lock:
+            lines = [
+                "# HELP memorag_stage_duration_seconds Time spent in each pipeline stage.",
+                "# TYPE memorag_stage_duration_seconds histogram",
+            ]
+            for stage, bucket_counts in self._bucket_counts.items():
+                for bound, count in zip(self.buckets, bucket_counts, strict=True):
+                    lines.append(
+                        f'memorag_stage_duration_seconds_bucket{{stage="{stage}",le="{bound}"}} '
+                        f"{count}"
+                    )
+                lines.append(
+                    f'memorag_stage_duration_seconds_bucket{{stage="{stage}",le="+Inf"}} '
+                    f"{self._counts[stage]}"
+                )
+                lines.append(
+                    f'memorag_stage_duration_seconds_sum{{stage="{stage}"}} {self._sums[stage]}'
+                )
+                lines.append(
+                    f'memorag_stage_duration_seconds_count{{stage="{stage}"}} '
+                    f"{self._counts[stage]}"
+                )
+
+            lines += [
+                "# HELP memorag_stage_attribute_total Sum of the counts reported by each stage.",
+                "# TYPE memorag_stage_attribute_total counter",
+            ]
+            for (stage, name), value in self._attributes.items():
+                lines.append(
+                    f'memorag_stage_attribute_total{{stage="{stage}",attribute="{name}"}} {value}'
+                )
+        return "\n".join(lines) + "\n"
@@ -1,26 +1,197 @@
+from collections.abc import Callable, Iterator
 from datetime import datetime
+from typing import Any, Literal, TypeVar
 from uuid import UUID
 
+import grpc
+import httpx
 import numpy as np
+from pydantic import BaseModel
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, PointStruct, ScoredPoint, VectorParams
+from qdrant_client.http.exceptions import UnexpectedResponse
+from qdrant_client.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    CollectionParamsDiff,
+    DatetimeRange,
+    Disabled,
+    Distance,
+    FieldCondition,
+    Filter,
+    HnswConfigDiff,
+    MatchValue,
+    PayloadSchemaType,
+    PointIdsList,
+    PointStruct,
+    QuantizationSearchParams,
+    QueryRequest,
+    Record,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    ScoredPoint,
+    SearchParams,
+    VectorParams,
+    VectorParamsDiff,
+)
 
-from memorag.domain.entities import Vector
+from memorag.domain.entities import SearchFilter, Vector
 from memorag.domain.ports import VectorStore
 
+T = TypeVar("T")
 
-class QdrantVectorStore(VectorStore):
-    def __init__(self, host: str, port: int, embedding_dim: int) -> None:
-        self._client = QdrantClient(host=host, port=port)
-        self.embedding_dim = embedding_dim
+# Payload fields filtered on, indexed so that filtering does not scan every payload
+PAYLOAD_INDEXES = {
+    "metadata.document_id": PayloadSchemaType.KEYWORD,
+    "metadata.document_name": PayloadSchemaType.KEYWORD,
+    "metadata.document_type": PayloadSchemaType.KEYWORD,
+    "inserted_at": PayloadSchemaType.DATETIME,
+}
 
-    def _create_collection_if_not_exist(self, collection_name: str) -> None:
-        if self._client.collection_exists(collection_name):
-            return
 
-        self._client.create_collection(
+class QdrantCollectionConfig(BaseModel):
+    """
+    Storage and index settings of the Qdrant collections, trading recall for memory and
+    latency. Unset HNSW parameters keep the server defaults (m=16, ef_construct=100).
+    `on_disk` keeps the original vectors on disk, which is mostly useful with quantization
+    as the quantized vectors stay in RAM. With `rescore`, the best candidates found with
+    the quantized vectors are scored again with the original ones, `oversampling` times
+    more candidates than requested being fetched to make up for the quantization error.
+    """
+
+    hnsw_m: int | None = None
+    hnsw_ef_construct: int | None = None
+    hnsw_ef: int | None = None
+    on_disk: bool = False
+    on_disk_payload: bool = False
+    quantization: Literal["none", "scalar", "binary"] = "none"
+    rescore: bool = True
+    oversampling: float | None = None
+
+    def hnsw_config(self) -> HnswConfigDiff | None:
+        if self.hnsw_m is None and self.hnsw_ef_construct is None:
+            return None
+        return HnswConfigDiff(m=self.hnsw_m, ef_construct=self.hnsw_ef_construct)
+
+    def quantization_config(self) -> ScalarQuantization | BinaryQuantization | None:
+        if self.quantization == "scalar":
+            return ScalarQuantization(
+                scalar=ScalarQuantizationConfig(type=ScalarType.INT8, always_ram=True)
+            )
+        if self.quantization == "binary":
+            return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+        return None
+
+    def search_params(self) -> SearchParams | None:
+        quantization = None
+        if self.quantization != "none":
+            quantization = QuantizationSearchParams(
+                rescore=self.rescore, oversampling=self.oversampling
+            )
+        if self.hnsw_ef is None and quantization is None:
+            return None
+        return SearchParams(hnsw_ef=self.hnsw_ef, quantization=quantization)
+
+
+class _QdrantMapper:
+    """Conversions between domain vectors and Qdrant points."""
+
+    embedding_dim: int
+    collection_config: QdrantCollectionConfig
+    _verified_collections: set[str]
+
+    @staticmethod
+    def _client_options(
+        prefer_grpc: bool, pool_size: int | None, keep_alive: bool
+    ) -> dict[str, Any]:
+        """
+        Connection pooling options of the client: `pool_size` gRPC channels, or REST
+        connections kept alive between requests unless `keep_alive` is disabled. The
+        client disables keep-alive for local servers by default, opening a new connection
+        for every request.
+        """
+        if prefer_grpc:
+            return {"pool_size": pool_size}
+        return {
+            "limits": httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size if keep_alive else 0,
+            )
+        }
+
+    @staticmethod
+    def _is_collection_not_found(error: Exception) -> bool:
+        if isinstance(error, UnexpectedResponse):
+            return error.status_code == 404
+        if isinstance(error, grpc.Call):
+            return error.code() == grpc.StatusCode.NOT_FOUND
+        # Embedded Qdrant
+        return isinstance(error, ValueError) and "not found" in str(error)
+
+    def invalidate_collection(self, collection_name: str) -> None:
+        """
+        Forgets that the collection exists, so that it is checked, and created if missing,
+        on next use. To be called when the collection is deleted by another process.
+        """
+        self._verified_collections.discard(collection_name)
+
+    def _create_collection_arguments(self, collection_name: str) -> dict:
+        return dict(
             collection_name=collection_name,
-            vectors_config=VectorParams(size=self.embedding_dim, distance=Distance.COSINE),
+            vectors_config=VectorParams(
+                size=self.embedding_dim,
+                distance=Distance.COSINE,
+                on_disk=self.collection_config.on_disk or None,
+            ),
+            on_disk_payload=self.collection_config.on_disk_payload or None,
+            hnsw_config=self.collection_config.hnsw_config(),
+            quantization_config=self.collection_config.quantization_config(),
+        )
+
+    @staticmethod
+    def _embedding_of(vector: Vector) -> np.ndarray:
+        if vector.vector is None:
+            raise ValueError(f"Vector data missing for vector {vector.id}")
+        return vector.vector
+
+    @staticmethod
+    def _build_filter(filters: SearchFilter | None) -> Filter | None:
+        if filters is None or filters.is_empty:
+            return None
+
+        conditions = []
+        if filters.document_type is not None:
+            conditions.append(
+                FieldCondition(
+                    key="metadata.document_type",
+                    match=MatchValue(value=filters.document_type.value),
+                )
+            )
+        if filters.document_name is not None:
+            conditions.append(
+                FieldCondition(
+                    key="metadata.document_name", match=MatchValue(value=filters.document_name)
+                )
+            )
+        if filters.inserted_after is not None or filters.inserted_before is not None:
+            conditions.append(
+                FieldCondition(
+                    key="inserted_at",
+                    range=DatetimeRange(gte=filters.inserted_after, lte=filters.inserted_before),
+                )
+            )
+        return Filter(must=conditions)
+
+    def _build_payload(self, vector: Vector) -> dict:
+        return {
+            "content": vector.content.decode("utf-8"),
+            "inserted_at": vector.inserted_at.isoformat(),
+            "metadata": vector.metadata,
+        }
+
+    def _build_matrix_from_vectors(self, vectors: list[Vector]) -> np.ndarray:
+        return np.stack([self._embedding_of(vector) for vector in vectors]).astype(
+            np.float32, copy=False
         )
 
     def _build_points_from_vectors(self, vectors: list[Vector]) -> list[PointStruct]:
@@ -28,33 +199,24 @@ class QdrantVectorStore(VectorStore):
         for vector in vectors:
             point = PointStruct(
                 id=str(vector.id),
-                vector=vector.vector.tolist(),
-                payload={
-                    "content": vector.content.decode("utf-8"),
-                    "inserted_at": vector.inserted_at.isoformat(),
-                    "metadata": vector.metadata,
-                },
+                vector=self._embedding_of(vector).tolist(),
+                payload=self._build_payload(vector),
             )
             points.append(point)
         return points
 
     def _build_vectors_from_points(
-        self, points: list[PointStruct] | list[ScoredPoint]
+        self, points: list[PointStruct] | list[ScoredPoint] | list[Record]
     ) -> list[Vector]:
         vectors = []
         for point in points:
             payload = point.payload or {}
-            # Handle cases where vector might be missing or in a different format
+            # Vectors are only present when explicitly requested with `with_vectors`
             vec_data = point.vector
-            if vec_data is None:
-                # Should not happen if we request with_vectors=True, but strictly
-                # speaking it's optional
-                # For now assuming it is present as our domain entity requires it.
-                raise ValueError(f"Vector data missing for point {point.id}")
-
             vector = Vector(
                 id=UUID(str(point.id)),
-                vector=np.array(vec_data),
+                vector=np.asarray(vec_data, dtype=np.float32) if vec_data is not None else None,
+                score=getattr(point, "score", None),
                 inserted_at=datetime.fromisoformat(payload["inserted_at"]),
                 content=payload["content"].encode("utf-8"),
                 metadata=payload.get("metadata"),
@@ -62,25 +224,201 @@ class QdrantVectorStore(VectorStore):
             vectors.append(vector)
         return vectors
 
+
+class QdrantVectorStore(_QdrantMapper, VectorStore):
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        embedding_dim: int,
+        grpc_port: int = 6334,
+        prefer_grpc: bool = False,
+        location: str | None = None,
+        collection_config: QdrantCollectionConfig | None = None,
+        pool_size: int | None = None,
+        keep_alive: bool = True,
+    ) -> None:
+        """
+        Connects to the Qdrant server at `host`, unless a `location` is given, in which case
+        an embedded Qdrant is used instead (":memory:" or a local directory). Collections
+        are created with the settings of `collection_config`.
+
+        Collections are checked, and created if missing, once per process: a collection
+        deleted in the meantime is recreated when Qdrant reports it as not found.
+        """
+        # Payload indexes have no effect in embedded Qdrant, which filters by scanning
+        self._index_payload = location is None
+        if location is not None:
+            self._client = QdrantClient(location=location)
+        else:
+            self._client = QdrantClient(
+                host=host,
+                port=port,
+                grpc_port=grpc_port,
+                prefer_grpc=prefer_grpc,
+                **self._client_options(prefer_grpc, pool_size, keep_alive),
+            )
+        self.embedding_dim = embedding_dim
+        self.collection_config = collection_config or QdrantCollectionConfig()
+        self._verified_collections = set()
+
+    def _create_payload_indexes(self, collection_name: str) -> None:
+        if not self._index_payload:
+            return
+        for field_name, field_schema in PAYLOAD_INDEXES.items():
+            self._client.create_payload_index(
+                collection_name=collection_name,
+                field_name=field_name,
+                field_schema=field_schema,
+            )
+
+    def _create_collection_if_not_exist(self, collection_name: str) -> None:
+        if collection_name in self._verified_collections:
+            return
+
+        if not self._client.collection_exists(collection_name):
+            self._client.create_collection(**self._create_collection_arguments(collection_name))
+            self._create_payload_indexes(collection_name)
+        self._verified_collections.add(collection_name)
+
+    def _in_collection(self, collection_name: str, operation: Callable[[], T]) -> T:
+        """Runs the operation, recreating the collection once if it no longer exists."""
+        self._create_collection_if_not_exist(collection_name)
+        try:
+            return operation()
+        except Exception as e:
+            if not self._is_collection_not_found(e):
+                raise
+        self.invalidate_collection(collection_name)
+        self._create_collection_if_not_exist(collection_name)
+        return operation()
+
+    def configure_collection(self, collection_name: str) -> None:
+        """
+        Applies the collection settings to an existing collection, creating it when missing.
+        Qdrant rebuilds the HNSW graph and the quantized vectors in the background, the
+        collection remaining searchable meanwhile.
+        """
+        self.invalidate_collection(collection_name)
+        if not self._client.collection_exists(collection_name):
+            self._create_collection_if_not_exist(collection_name)
+            return
+
+        config = self.collection_config
+        self._client.update_collection(
+            collection_name=collection_name,
+            vectors_config={"": VectorParamsDiff(on_disk=config.on_disk)},
+            collection_params=CollectionParamsDiff(on_disk_payload=config.on_disk_payload),
+            hnsw_config=config.hnsw_config(),
+            quantization_config=config.quantization_config() or Disabled.DISABLED,
+        )
+        self._create_payload_indexes(collection_name)
+
     def index_vector(self, vector: Vector, collection_name: str) -> None:
         return self.index_vectors([vector], collection_name)
 
     def index_vectors(self, vectors: list[Vector], collection_name: str) -> None:
-        self._create_collection_if_not_exist(collection_name)
-        points = self._build_points_from_vectors(vectors)
-        self._client.upsert(
-            collection_name=collection_name,
-            points=points,
+        if not vectors:
+            return
+        # Vectors are sent as one contiguous matrix instead of per-point Python lists
+        matrix = self._build_matrix_from_vectors(vectors)
+        payload = [self._build_payload(vector) for vector in vectors]
+        self._in_collection(
+            collection_name,
+            lambda: self._client.upload_collection(
+                collection_name=collection_name,
+                vectors=matrix,
+                payload=payload,
+                ids=[str(vector.id) for vector in vectors],
+                batch_size=len(vectors),
+                wait=True,
+            ),
+        )
+
+    def delete_vectors(self, ids: list[UUID], collection_name: str) -> None:
+        if not ids:
+            return
+        self._in_collection(
+            collection_name,
+            lambda: self._client.delete(
+                collection_name=collection_name,
+                points_selector=PointIdsList(points=[str(id) for id in ids]),
+            ),
         )
 
     def search_similar(
-        self, query_vector: np.ndarray, top_k: int, collection_name: str
+        self,
+        query_vector: np.ndarray,
+        top_k: int,
+        collection_name: str,
+        with_vectors: bool = False,
+        score_threshold: float | None = None,
+        filters: SearchFilter | None = None,
     ) -> list[Vector]:
-        self._create_collection_if_not_exist(collection_name)
-        response = self._client.query_points(
-            collection_name=collection_name,
-            query=query_vector.tolist(),
-            limit=top_k,
-            with_vectors=True,
+        response = self._in_collection(
+            collection_name,
+            lambda: self._client.query_points(
+                collection_name=collection_name,
+                query=query_vector,
+                query_filter=self._build_filter(filters),
+                limit=top_k,
+                with_payload=True,
+                with_vectors=with_vectors,
+                score_threshold=score_threshold,
+                search_params=self.collection_config.search_params(),
+            ),
         )
         return self._build_vectors_from_points(response.points)
+
+    def scroll_vectors(
+        self, collection_name: str, batch_size: int = 256
+    ) -> Iterator[list[Vector]]:
+        if not self._client.collection_exists(collection_name):
+            raise ValueError(f"Collection '{collection_name}' does not exist")
+
+        offset = None
+        while True:
+            records, offset = self._client.scroll(
+                collection_name=collection_name,
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True,
+            )
+            if records:
+                yield self._build_vectors_from_points(records)
+            if offset is None:
+                return
+
+    def search_similar_batch(
+        self,
+        query_vectors: np.ndarray,
+        top_k: int,
+        collection_name: str,
+        with_vectors: bool = False,
+        score_threshold: float | None = None,
+        filters: SearchFilter | None = None,
+    ) -> list[list[Vector]]:
+        """Searches for all the queries in a single request."""
+        query_filter = self._build_filter(filters)
+        requests = [
+            QueryRequest(
+                query=query_vector.tolist(),
+                filter=query_filter,
+                limit=top_k,
+                with_payload=True,
+                with_vector=with_vectors,
+                score_threshold=score_threshold,
+                params=self.collection_config.search_params(),
+            )
+            for query_vector in query_vectors
+        ]
+        if not requests:
+            return []
+        responses = self._in_collection(
+            collection_name,
+            lambda: self._client.query_batch_points(
+                collection_name=collection_name, requests=requests
+            ),
+        )
+        return [self._build_vectors_from_points(response.points) for response in responses]
@@ -3,14 +3,40 @@ from sentence_transformers import SentenceTransformer
 
 from memorag.domain.ports import Embedder
 
+from .model_backends import backend_options
+
 
 class SentenceTransformerEmbedder(Embedder):
-    def __init__(self, model_name: str) -> None:
-        self._model = SentenceTransformer(model_name)
+    """
+    Embeds with a sentence-transformers model, run with PyTorch, ONNX Runtime, an
+    int8-quantized ONNX export of the model, or OpenVINO depending on `backend`.
+    """
+
+    def __init__(self, model_name: str, batch_size: int = 32, backend: str = "torch") -> None:
+        self._model = SentenceTransformer(model_name, **backend_options(backend))
+        self.model_name = model_name
+        self.backend = backend
+        self.batch_size = batch_size
 
     def embed(self, text: str) -> np.ndarray:
         embedding = self._model.encode(text, convert_to_numpy=True)
         return embedding
 
+    def embed_batch(self, texts: list[str]) -> np.ndarray:
+        if not texts:
+            return np.empty((0, self.get_embedding_dimension()), dtype=np.float32)
+
+        # Sort by length so each batch holds texts of similar size and padding stays minimal
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+        embeddings = np.empty((len(texts), self.get_embedding_dimension()), dtype=np.float32)
+        for start in range(0, len(order), self.batch_size):
+            indices = order[start : start + self.batch_size]
+            embeddings[indices] = self._model.encode(
+                [texts[i] for i in indices],
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+            )
+        return embeddings
+
     def get_embedding_dimension(self) -> int:
         return self._model.get_sentence_embedding_dimension() or 0
@@ -0,0 +1,24 @@
+from memorag.domain.entities import SearchFilter
+
+
+def filter_clause(filters: SearchFilter | None, column: str) -> tuple[str, list[str]]:
+    """
+    Returns an SQL condition selecting the rows whose JSON payload, in `column`, matches
+    the filters, with its parameters. Dates are compared as instants whatever their offset.
+    """
+    clauses = []
+    parameters = []
+    if filters is not None:
+        if filters.document_type is not None:
+            clauses.append(f"json_extract({column}, '$.metadata.document_type') = ?")
+            parameters.append(filters.document_type.value)
+        if filters.document_name is not None:
+            clauses.append(f"json_extract({column}, '$.metadata.document_name') = ?")
+            parameters.append(filters.document_name)
+        if filters.inserted_after is not None:
+            clauses.append(f"julianday(json_extract({column}, '$.inserted_at')) >= julianday(?)")
+            parameters.append(filters.inserted_after.isoformat())
+        if filters.inserted_before is not None:
+            clauses.append(f"julianday(json_extract({column}, '$.inserted_at')) <= julianday(?)")
+            parameters.append(filters.inserted_before.isoformat())
+    return " AND ".join(clauses) or "1", parameters
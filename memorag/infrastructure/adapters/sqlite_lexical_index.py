@@ -0,0 +1,105 @@
+import json
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from uuid import UUID
+
+from memorag.domain.entities import SearchFilter, Vector
+from memorag.domain.ports import LexicalIndex
+
+from .sqlite_filter import filter_clause
+
+_TERM = re.compile(r"\w+")
+
+
+class SqliteLexicalIndex(LexicalIndex):
+    """
+    Lexical index stored in a local sqlite database, ranking chunks with the BM25 of its
+    FTS5 full-text search. Underscores are kept within terms so that identifiers such as
+    config keys match as a whole.
+    """
+
+    def __init__(self, path: str) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS chunks ("
+                "rowid INTEGER PRIMARY KEY, collection TEXT NOT NULL, chunk_id TEXT NOT NULL,"
+                " payload TEXT NOT NULL, UNIQUE (collection, chunk_id))"
+            )
+            self._connection.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts "
+                "USING fts5(content, tokenize = \"unicode61 tokenchars '_'\")"
+            )
+
+    def _delete(self, chunk_ids: list[str], collection_name: str) -> None:
+        for chunk_id in chunk_ids:
+            row = self._connection.execute(
+                "SELECT rowid FROM chunks WHERE collection = ? AND chunk_id = ?",
+                (collection_name, chunk_id),
+            ).fetchone()
+            if row is not None:
+                self._connection.execute("DELETE FROM chunks WHERE rowid = ?", row)
+                self._connection.execute("DELETE FROM chunks_fts WHERE rowid = ?", row)
+
+    def index(self, vectors: list[Vector], collection_name: str) -> None:
+        with self._lock, self._connection:
+            self._delete([str(vector.id) for vector in vectors], collection_name)
+            for vector in vectors:
+                payload = {
+                    "inserted_at": vector.inserted_at.isoformat(),
+                    "metadata": vector.metadata,
+                }
+                cursor = self._connection.execute(
+                    "INSERT INTO chunks (collection, chunk_id, payload) VALUES (?, ?, ?)",
+                    (collection_name, str(vector.id), json.dumps(payload)),
+                )
+                self._connection.execute(
+                    "INSERT INTO chunks_fts (rowid, content) VALUES (?, ?)",
+                    (cursor.lastrowid, vector.content.decode("utf-8")),
+                )
+
+    def delete(self, ids: list[UUID], collection_name: str) -> None:
+        with self._lock, self._connection:
+            self._delete([str(id) for id in ids], collection_name)
+
+    def search(
+        self,
+        query: str,
+        top_k: int,
+        collection_name: str,
+        filters: SearchFilter | None = None,
+    ) -> list[Vector]:
+        terms = dict.fromkeys(_TERM.findall(query.lower()))
+        if not terms:
+            return []
+
+        match = " OR ".join(f'"{term}"' for term in terms)
+        condition, parameters = filter_clause(filters, "chunks.payload")
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT chunks.chunk_id, chunks.payload, chunks_fts.content,"
+                " -bm25(chunks_fts) AS score "
+                "FROM chunks_fts JOIN chunks ON chunks.rowid = chunks_fts.rowid "
+                f"WHERE chunks_fts MATCH ? AND chunks.collection = ? AND {condition} "
+                "ORDER BY score DESC LIMIT ?",
+                (match, collection_name, *parameters, top_k),
+            ).fetchall()
+
+        vectors = []
+        for chunk_id, payload, content, score in rows:
+            payload = json.loads(payload)
+            vectors.append(
+                Vector(
+                    id=UUID(chunk_id),
+                    inserted_at=datetime.fromisoformat(payload["inserted_at"]),
+                    content=content.encode("utf-8"),
+                    metadata=payload["metadata"],
+                    score=score,
+                )
+            )
+        return vectors
@@ -0,0 +1,81 @@
+import sqlite3
+import threading
+from pathlib import Path
+from uuid import UUID
+
+from memorag.domain.entities import IndexedDocument
+from memorag.domain.ports import IndexManifest
+
+
+class SqliteIndexManifest(IndexManifest):
+    """Index manifest stored in a local sqlite database."""
+
+    def __init__(self, path: str) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                "collection TEXT NOT NULL, document_id TEXT NOT NULL, fingerprint TEXT NOT NULL,"
+                " PRIMARY KEY (collection, document_id))"
+            )
+            columns = {row[1] for row in self._connection.execute("PRAGMA table_info(documents)")}
+            if "settings" not in columns:
+                # Manifests written before settings were recorded: their documents are
+                # indexed again once, under the current settings
+                self._connection.execute(
+                    "ALTER TABLE documents ADD COLUMN settings TEXT NOT NULL DEFAULT ''"
+                )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS chunks ("
+                "collection TEXT NOT NULL, document_id TEXT NOT NULL, chunk_id TEXT NOT NULL,"
+                " PRIMARY KEY (collection, document_id, chunk_id))"
+            )
+
+    def get(self, document_id: UUID, collection_name: str) -> IndexedDocument | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT fingerprint, settings FROM documents"
+                " WHERE collection = ? AND document_id = ?",
+                (collection_name, str(document_id)),
+            ).fetchone()
+            if row is None:
+                return None
+            chunk_ids = self._connection.execute(
+                "SELECT chunk_id FROM chunks WHERE collection = ? AND document_id = ?",
+                (collection_name, str(document_id)),
+            ).fetchall()
+        return IndexedDocument(
+            id=document_id,
+            fingerprint=row[0],
+            chunk_ids={UUID(chunk_id) for (chunk_id,) in chunk_ids},
+            settings=row[1],
+        )
+
+    def _delete(self, document_id: UUID, collection_name: str) -> None:
+        for table in ("documents", "chunks"):
+            self._connection.execute(
+                f"DELETE FROM {table} WHERE collection = ? AND document_id = ?",
+                (collection_name, str(document_id)),
+            )
+
+    def save(self, document: IndexedDocument, collection_name: str) -> None:
+        with self._lock, self._connection:
+            self._delete(document.id, collection_name)
+            self._connection.execute(
+                "INSERT INTO documents (collection, document_id, fingerprint, settings)"
+                " VALUES (?, ?, ?, ?)",
+                (collection_name, str(document.id), document.fingerprint, document.settings),
+            )
+            self._connection.executemany(
+                "INSERT INTO chunks (collection, document_id, chunk_id) VALUES (?, ?, ?)",
+                [
+                    (collection_name, str(document.id), str(chunk_id))
+                    for chunk_id in document.chunk_ids
+                ],
+            )
+
+    def delete(self, document_id: UUID, collection_name: str) -> None:
+        with self._lock, self._connection:
+            self._delete(document_id, collection_name)
@@ -0,0 +1,159 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from memorag.domain.entities import CachedSearch, Vector
+from memorag.domain.ports import SearchCache
+
+
+class SqliteSearchCache(SearchCache):
+    """
+    Search cache stored in a local sqlite database, so it is shared by CLI invocations and
+    server processes. A search hits the cache when the same query, ignoring case and
+    whitespace, was run with the same parameters, or else when the cosine similarity of
+    the query embeddings reaches `similarity_threshold` (None to only match exact queries).
+    Entries expire after `ttl_seconds`, and the least recently used are evicted beyond
+    `max_entries`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        similarity_threshold: float | None = 0.95,
+        ttl_seconds: float = 24 * 60 * 60,
+        max_entries: int = 1000,
+    ) -> None:
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS searches ("
+                "id INTEGER PRIMARY KEY, collection TEXT NOT NULL, parameters TEXT NOT NULL,"
+                " query TEXT NOT NULL, embedding BLOB NOT NULL, result TEXT NOT NULL,"
+                " created_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS searches_lookup "
+                "ON searches (collection, parameters, query)"
+            )
+
+    @staticmethod
+    def _normalize(query: str) -> str:
+        return " ".join(query.split()).casefold()
+
+    @staticmethod
+    def _unit(query_vector: np.ndarray) -> np.ndarray:
+        vector = np.asarray(query_vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _find_similar(
+        self, query_vector: np.ndarray, parameters: str, collection_name: str
+    ) -> int | None:
+        if self.similarity_threshold is None:
+            return None
+
+        rows = self._connection.execute(
+            "SELECT id, embedding FROM searches WHERE collection = ? AND parameters = ?",
+            (collection_name, parameters),
+        ).fetchall()
+        if not rows:
+            return None
+
+        query_vector = self._unit(query_vector)
+        embeddings = np.stack(
+            [np.frombuffer(embedding, dtype=np.float32) for _, embedding in rows]
+        )
+        if embeddings.shape[1] != query_vector.shape[0]:
+            return None
+        similarities = embeddings @ query_vector
+        best = int(np.argmax(similarities))
+        return rows[best][0] if similarities[best] >= self.similarity_threshold else None
+
+    def get(
+        self, query: str, query_vector: np.ndarray, parameters: str, collection_name: str
+    ) -> CachedSearch | None:
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM searches WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+            row = self._connection.execute(
+                "SELECT id FROM searches WHERE collection = ? AND parameters = ? AND query = ?",
+                (collection_name, parameters, self._normalize(query)),
+            ).fetchone()
+            search_id = row[0] if row is not None else None
+            if search_id is None:
+                search_id = self._find_similar(query_vector, parameters, collection_name)
+            if search_id is None:
+                return None
+
+            self._connection.execute(
+                "UPDATE searches SET last_used = ? WHERE id = ?", (now, search_id)
+            )
+            (result,) = self._connection.execute(
+                "SELECT result FROM searches WHERE id = ?", (search_id,)
+            ).fetchone()
+
+        data = json.loads(result)
+        return CachedSearch(
+            answer=data["answer"],
+            sources=[Vector.model_validate(source) for source in data["sources"]],
+        )
+
+    def save(
+        self,
+        query: str,
+        query_vector: np.ndarray,
+        parameters: str,
+        collection_name: str,
+        result: CachedSearch,
+    ) -> None:
+        serialized = json.dumps(
+            {
+                "answer": result.answer,
+                "sources": [
+                    source.model_dump(mode="json", exclude={"vector"}) for source in result.sources
+                ],
+            }
+        )
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM searches WHERE collection = ? AND parameters = ? AND query = ?",
+                (collection_name, parameters, self._normalize(query)),
+            )
+            self._connection.execute(
+                "INSERT INTO searches "
+                "(collection, parameters, query, embedding, result, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    collection_name,
+                    parameters,
+                    self._normalize(query),
+                    self._unit(query_vector).tobytes(),
+                    serialized,
+                    now,
+                    now,
+                ),
+            )
+            self._connection.execute(
+                "DELETE FROM searches WHERE id IN "
+                "(SELECT id FROM searches ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def invalidate(self, collection_name: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM searches WHERE collection = ?", (collection_name,)
+            )
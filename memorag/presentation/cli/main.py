@@ -1,8 +1,11 @@
+import sys
+from datetime import datetime
 from typing import Annotated
-from unittest.mock import MagicMock
 
 import typer
 
+from memorag.infrastructure.adapters.model_backends import BACKENDS
+
 app = typer.Typer()
 
 
@@ -18,34 +21,242 @@ def _parse_document_type(value: str):
         raise typer.BadParameter(f"Invalid filetype '{value}'. Choose one of: {choices}") from e
 
 
+def _check_choice(value: str, choices: tuple[str, ...]) -> str:
+    if value not in choices:
+        raise typer.BadParameter(f"Invalid value '{value}'. Choose one of: {', '.join(choices)}")
+    return value
+
+
+def _instrumentation(ctx: typer.Context, *extra):
+    """Combines the instrumentations enabled by the global options with `extra` ones."""
+    instrumentations = [*ctx.meta.get("instrumentations", []), *extra]
+    if not instrumentations:
+        return None
+
+    from memorag.application.instrumentation import InstrumentationGroup
+
+    return InstrumentationGroup(instrumentations)
+
+
+def _search_filter(document_type, document_name, inserted_after, inserted_before):
+    """Returns the filter of the search options, or None when none of them is set."""
+    from memorag.domain.entities import SearchFilter
+
+    filters = SearchFilter(
+        document_type=document_type,
+        document_name=document_name,
+        inserted_after=inserted_after,
+        inserted_before=inserted_before,
+    )
+    return None if filters.is_empty else filters
+
+
+def _backend(ctx: typer.Context):
+    """Returns the client of the running server when one is configured, local services else."""
+    if ctx.obj["server_url"] is not None:
+        from memorag.presentation.server import MemoRAGClient
+
+        if ctx.meta.get("instrumentations"):
+            typer.echo(
+                "Profiling and tracing happen on the server, see its /metrics endpoint.", err=True
+            )
+        return MemoRAGClient(ctx.obj["server_url"])
+
+    from memorag.presentation.services import Services
+
+    return Services(ctx.obj, instrumentation=_instrumentation(ctx))
+
+
 @app.callback()
 def main(
     ctx: typer.Context,
     embedding_model: str = typer.Option(
         "all-MiniLM-L6-v2", help="SentenceTransformer embedding model name"
     ),
+    embedding_backend: str = typer.Option(
+        "torch",
+        help="Runtime of the embedding model: torch, onnx, onnx-int8 (int8-quantized ONNX) "
+        "or openvino. Check it with `memorag check-embedder` before switching",
+        callback=lambda value: _check_choice(value, BACKENDS),
+    ),
     rerank_model: str = typer.Option(
         "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1", help="CrossEncoder reranking model name"
     ),
+    rerank_batch_size: int = typer.Option(
+        32, help="Number of (query, chunk) pairs scored together by the reranker"
+    ),
+    rerank_max_length: int | None = typer.Option(
+        None,
+        help="Number of tokens pairs are truncated to before reranking (model limit if unset)",
+    ),
+    rerank_backend: str = typer.Option(
+        "torch",
+        help="Runtime of the reranker: torch, onnx, onnx-int8 (int8-quantized ONNX) or openvino",
+        callback=lambda value: _check_choice(value, BACKENDS),
+    ),
     llm_model: str = typer.Option(
         "mistral/mistral-tiny", help="LLM model name (e.g., mistral/mistral-tiny, ollama/llama2)"
     ),
+    context_tokens: int = typer.Option(
+        4000, help="Maximum number of tokens of retrieved chunks in the prompt of the LLM"
+    ),
+    context_dedup_threshold: float = typer.Option(
+        0.95,
+        help="Cosine similarity from which a chunk is left out of the prompt as a duplicate "
+        "of a better ranked one (0 to leave out exact duplicates only)",
+    ),
     embedding_dim: int = typer.Option(384, help="Embedding vector dimension"),
+    embedding_batch_size: int = typer.Option(
+        32, help="Number of chunks embedded together in a single forward pass"
+    ),
+    embedding_cache_dir: str | None = typer.Option(
+        None, help="Directory where embeddings are cached across runs (disabled when unset)"
+    ),
+    embedding_cache_size: int = typer.Option(
+        512, help="Maximum size of the embedding cache, in megabytes"
+    ),
+    vector_store: str = typer.Option(
+        "qdrant",
+        help="Where vectors are stored: a Qdrant server (qdrant) or local files (local)",
+        callback=lambda value: _check_choice(value, ("qdrant", "local")),
+    ),
+    local_store_path: str = typer.Option(
+        "~/.local/share/memorag/vectors", help="Directory of the local vector store"
+    ),
+    local_store_quantization: str = typer.Option(
+        "float16",
+        help="Precision of the vectors in the local vector store",
+        callback=lambda value: _check_choice(value, ("float16", "int8")),
+    ),
     qdrant_host: str = typer.Option("localhost", help="Qdrant host"),
     qdrant_port: int = typer.Option(6333, help="Qdrant port"),
+    qdrant_grpc_port: int = typer.Option(6334, help="Qdrant gRPC port"),
+    qdrant_prefer_grpc: bool = typer.Option(
+        False, help="Talk to Qdrant over gRPC instead of REST"
+    ),
+    qdrant_pool_size: int | None = typer.Option(
+        None, help="Maximum number of connections (or gRPC channels) to Qdrant"
+    ),
+    qdrant_keep_alive: bool = typer.Option(
+        True, help="Reuse connections to Qdrant across requests instead of reconnecting"
+    ),
+    qdrant_hnsw_m: int | None = typer.Option(
+        None, help="Edges per node of the HNSW graph of new collections (Qdrant default: 16)"
+    ),
+    qdrant_hnsw_ef_construct: int | None = typer.Option(
+        None, help="Neighbours considered when building the HNSW graph (Qdrant default: 100)"
+    ),
+    qdrant_hnsw_ef: int | None = typer.Option(
+        None, help="Neighbours considered when searching the HNSW graph (Qdrant default)"
+    ),
+    qdrant_on_disk: bool = typer.Option(
+        False, help="Keep the original vectors of new collections on disk instead of in RAM"
+    ),
+    qdrant_on_disk_payload: bool = typer.Option(
+        False, help="Keep the payloads of new collections on disk instead of in RAM"
+    ),
+    qdrant_quantization: str = typer.Option(
+        "none",
+        help="Quantization of the vectors of new collections, kept in RAM: none, scalar (int8) "
+        "or binary (1 bit per dimension)",
+        callback=lambda value: _check_choice(value, ("none", "scalar", "binary")),
+    ),
+    qdrant_rescore: bool = typer.Option(
+        True, help="Score the candidates found with quantized vectors with the original ones"
+    ),
+    qdrant_oversampling: float | None = typer.Option(
+        None, help="Factor by which more candidates are fetched before rescoring"
+    ),
+    collection: str = typer.Option(
+        "infos", help="Collection, or namespace, documents are indexed into and searched in"
+    ),
+    hybrid: bool = typer.Option(
+        False, help="Also index chunks by their terms, and retrieve by both meaning and terms"
+    ),
+    lexical_index_path: str = typer.Option(
+        "~/.local/share/memorag/lexical.sqlite", help="Path of the lexical index"
+    ),
+    search_cache: bool = typer.Option(
+        False, help="Replay the answers of identical or similar previous searches"
+    ),
+    search_cache_path: str = typer.Option(
+        "~/.cache/memorag/search_cache.sqlite", help="Path of the search cache"
+    ),
+    search_cache_similarity: float = typer.Option(
+        0.95, help="Minimum cosine similarity for a previous query to be considered the same"
+    ),
+    search_cache_ttl: float = typer.Option(
+        24 * 60 * 60, help="Number of seconds after which cached searches expire"
+    ),
+    server_url: str | None = typer.Option(
+        None, help="URL of a running `memorag serve` process to send commands to"
+    ),
+    profile: bool = typer.Option(
+        False, help="Print a breakdown of the time spent in each stage after the command"
+    ),
+    trace_file: str | None = typer.Option(
+        None, help="File to which a JSON line is appended for every stage invocation"
+    ),
 ):
     """
     Global configuration for the MemoRAG application.
     """
     ctx.obj = dict(
         embedding_model=embedding_model,
+        embedding_backend=embedding_backend,
         rerank_model=rerank_model,
+        rerank_batch_size=rerank_batch_size,
+        rerank_max_length=rerank_max_length,
+        rerank_backend=rerank_backend,
         llm_model=llm_model,
+        context_tokens=context_tokens,
+        context_dedup_threshold=context_dedup_threshold,
         embedding_dim=embedding_dim,
+        embedding_batch_size=embedding_batch_size,
+        embedding_cache_dir=embedding_cache_dir,
+        embedding_cache_size=embedding_cache_size,
+        vector_store=vector_store,
+        local_store_path=local_store_path,
+        local_store_quantization=local_store_quantization,
         qdrant_host=qdrant_host,
         qdrant_port=qdrant_port,
+        qdrant_grpc_port=qdrant_grpc_port,
+        qdrant_prefer_grpc=qdrant_prefer_grpc,
+        qdrant_pool_size=qdrant_pool_size,
+        qdrant_keep_alive=qdrant_keep_alive,
+        qdrant_hnsw_m=qdrant_hnsw_m,
+        qdrant_hnsw_ef_construct=qdrant_hnsw_ef_construct,
+        qdrant_hnsw_ef=qdrant_hnsw_ef,
+        qdrant_on_disk=qdrant_on_disk,
+        qdrant_on_disk_payload=qdrant_on_disk_payload,
+        qdrant_quantization=qdrant_quantization,
+        qdrant_rescore=qdrant_rescore,
+        qdrant_oversampling=qdrant_oversampling,
+        collection=collection,
+        hybrid=hybrid,
+        lexical_index_path=lexical_index_path,
+        search_cache=search_cache,
+        search_cache_path=search_cache_path,
+        search_cache_similarity=search_cache_similarity,
+        search_cache_ttl=search_cache_ttl,
+        server_url=server_url,
     )
 
+    instrumentations = []
+    if profile:
+        from memorag.application.instrumentation import StageProfile
+
+        stage_profile = StageProfile()
+        instrumentations.append(stage_profile)
+        ctx.call_on_close(lambda: typer.echo("\n" + stage_profile.format(), err=True))
+    if trace_file is not None:
+        from memorag.infrastructure.adapters import JsonLinesExporter
+
+        exporter = JsonLinesExporter(trace_file)
+        instrumentations.append(exporter)
+        ctx.call_on_close(exporter.close)
+    ctx.meta["instrumentations"] = instrumentations
+
 
 @app.command()
 def index(
@@ -60,50 +271,137 @@ def index(
             callback=lambda ctx, param, value: _parse_document_type(value),
         ),
     ] = "text",
+    stream: Annotated[
+        bool,
+        typer.Option(
+            help="Read, chunk, embed and upsert the file incrementally to keep memory bounded"
+        ),
+    ] = False,
+    batch_size: Annotated[
+        int, typer.Option(help="Number of chunks per upsert in streaming mode", show_default=True)
+    ] = 64,
+    chunk_size: Annotated[
+        int, typer.Option(help="Maximum size of a chunk, in bytes", show_default=True)
+    ] = 1000,
+    chunk_overlap: Annotated[
+        int,
+        typer.Option(help="Number of bytes shared by consecutive chunks", show_default=True),
+    ] = 200,
+    incremental: Annotated[
+        bool,
+        typer.Option(help="Only upsert new chunks and delete stale ones since the last indexing"),
+    ] = False,
+    manifest_path: Annotated[
+        str,
+        typer.Option(
+            help="Path of the manifest recording what has been indexed", show_default=True
+        ),
+    ] = "~/.cache/memorag/manifest.sqlite",
 ):
-    from memorag.application.use_cases import IndexDocument
-    from memorag.domain.entities import Document
-    from memorag.domain.ports import Chunker
-    from memorag.infrastructure.adapters import QdrantVectorStore, SentenceTransformerEmbedder
-
-    embedding_model = ctx.obj["embedding_model"]
-    qdrant_host = ctx.obj["qdrant_host"]
-    qdrant_port = ctx.obj["qdrant_port"]
-    embedding_dim = ctx.obj["embedding_dim"]
-
-    chunker = MagicMock(spec=Chunker)  # Placeholder for Chunker implementation
-
-    def mock_chunk(document: Document) -> Document:
-        # Simple mock chunking: create one chunk with the whole content
-        from memorag.domain.entities import DocumentChunk
-
-        chunk = DocumentChunk(
-            id=document.id,
-            content=document.content,
-            metadata=document.metadata,
-            next_chunk=None,
+    try:
+        message = _backend(ctx).index(
+            text=text,
+            filepath=filepath,
+            filetype=filetype,
+            stream=stream,
+            batch_size=batch_size,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            incremental=incremental,
+            manifest_path=manifest_path,
+            collection_name=ctx.obj["collection"],
         )
-        document._chunk = chunk
-        return document
+    except (ValueError, RuntimeError) as e:
+        typer.echo(str(e), err=True)
+        raise typer.Exit(code=1) from e
+    typer.echo(message)
+
+
+_DEFAULT_INCLUDE = ["**/*.md", "**/*.markdown", "**/*.txt", "**/*.rst"]
+_DEFAULT_EXCLUDE = [".*", "*/.*"]
+
+
+@app.command()
+def index_dir(
+    ctx: typer.Context,
+    directory: Annotated[str, typer.Argument(help="Directory to index")],
+    include: Annotated[
+        list[str] | None,
+        typer.Option(
+            help="Glob of the files to index, relative to the directory. Can be repeated. "
+            f"Defaults to {', '.join(_DEFAULT_INCLUDE)}"
+        ),
+    ] = None,
+    exclude: Annotated[
+        list[str] | None,
+        typer.Option(
+            help="Pattern of the relative paths to skip, '*' matching across directories. "
+            f"Can be repeated. Defaults to {', '.join(_DEFAULT_EXCLUDE)}"
+        ),
+    ] = None,
+    workers: Annotated[
+        int | None,
+        typer.Option(
+            help="Number of processes reading and chunking files, one per CPU by default"
+        ),
+    ] = None,
+    writers: Annotated[
+        int, typer.Option(help="Number of concurrent upserts", show_default=True)
+    ] = 2,
+    batch_size: Annotated[
+        int,
+        typer.Option(help="Number of chunks embedded and upserted at once", show_default=True),
+    ] = 64,
+    chunk_size: Annotated[
+        int, typer.Option(help="Maximum size of a chunk, in bytes", show_default=True)
+    ] = 1000,
+    chunk_overlap: Annotated[
+        int,
+        typer.Option(help="Number of bytes shared by consecutive chunks", show_default=True),
+    ] = 200,
+):
+    """
+    Indexes every matching file of a directory, the type of each file being guessed from
+    its extension. Files are read and chunked in parallel processes, their chunks embedded
+    together in batches and upserted by concurrent writers. Always runs locally, even with
+    --server-url.
+    """
+    from memorag.presentation.services import Services, find_files
 
-    chunker.chunk.side_effect = mock_chunk
-    embedder = SentenceTransformerEmbedder(model_name=embedding_model)
-    vector_store = QdrantVectorStore(
-        host=qdrant_host, port=qdrant_port, embedding_dim=embedding_dim
+    filepaths = find_files(
+        directory,
+        include if include else _DEFAULT_INCLUDE,
+        exclude if exclude is not None else _DEFAULT_EXCLUDE,
     )
-    index_uc = IndexDocument(embedder=embedder, vector_store=vector_store, chunker=chunker)
+    if not filepaths:
+        typer.echo(f"No file to index in {directory}.", err=True)
+        raise typer.Exit(code=1)
 
-    use_case: IndexDocument = index_uc
-    if text is not None:
-        document = Document.from_text(text)
-    else:
-        if filepath is None:
-            typer.echo("Either text or filepath must be provided.", err=True)
-            raise typer.Exit(code=1)
+    services = Services(ctx.obj, instrumentation=_instrumentation(ctx))
+    try:
+        with typer.progressbar(length=len(filepaths), label="Indexing", file=sys.stderr) as bar:
+            report = services.index_files(
+                filepaths,
+                batch_size=batch_size,
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap,
+                workers=workers,
+                writers=writers,
+                on_document=lambda document: bar.update(1),
+            )
+    except (ValueError, RuntimeError) as e:
+        typer.echo(str(e), err=True)
+        raise typer.Exit(code=1) from e
 
-        document = Document.from_filepath(filepath, filetype)  # type: ignore
-    use_case.execute(document)
-    typer.echo(f"Indexed document: {document.id} - {document.name}")
+    for failure in report.failures:
+        typer.echo(f"Skipped {failure}", err=True)
+    typer.echo(
+        f"Indexed {report.documents} documents ({report.chunks} chunks) in "
+        f"{report.seconds:.1f}s: {report.documents_per_second:.1f} "
+        f"documents/s, {report.chunks_per_second:.1f} chunks/s"
+    )
+    if report.failures:
+        raise typer.Exit(code=1)
 
 
 @app.command()
@@ -114,38 +412,48 @@ def search(
         int, typer.Option(help="Number of top similar documents to retrieve", show_default=True)
     ] = 10,
     raw: Annotated[bool, typer.Option(help="Output raw answer without llm processing")] = False,
+    top_n: Annotated[
+        int | None,
+        typer.Option(help="Number of reranked documents to keep in the answer context"),
+    ] = None,
+    min_score: Annotated[
+        float | None,
+        typer.Option(help="Minimum rerank score for a document to be kept in the context"),
+    ] = None,
+    score_threshold: Annotated[
+        float | None,
+        typer.Option(help="Minimum similarity score for a document to be retrieved"),
+    ] = None,
+    document_type: Annotated[
+        str | None,
+        typer.Option(
+            help="Only search documents of this type",
+            callback=lambda value: _parse_document_type(value) if value is not None else None,
+        ),
+    ] = None,
+    document_name: Annotated[
+        str | None, typer.Option(help="Only search the document with this file name")
+    ] = None,
+    inserted_after: Annotated[
+        datetime | None,
+        typer.Option(help="Only search chunks indexed at or after this date (UTC by default)"),
+    ] = None,
+    inserted_before: Annotated[
+        datetime | None,
+        typer.Option(help="Only search chunks indexed at or before this date (UTC by default)"),
+    ] = None,
 ):
-    from memorag.application.use_cases import SearchDocuments
-    from memorag.infrastructure.adapters import (
-        CrossEncoderReranker,
-        LiteLLMGenerator,
-        QdrantVectorStore,
-        SentenceTransformerEmbedder,
-    )
-
-    embedding_model = ctx.obj["embedding_model"]
-    rerank_model = ctx.obj["rerank_model"]
-    llm_model = ctx.obj["llm_model"]
-    qdrant_host = ctx.obj["qdrant_host"]
-    qdrant_port = ctx.obj["qdrant_port"]
-    embedding_dim = ctx.obj["embedding_dim"]
-
-    # Instantiate adapters
-    reranker = CrossEncoderReranker(model=rerank_model)
-    generator = LiteLLMGenerator(model_name=llm_model)
-    embedder = SentenceTransformerEmbedder(model_name=embedding_model)
-    vector_store = QdrantVectorStore(
-        host=qdrant_host, port=qdrant_port, embedding_dim=embedding_dim
+    response = _backend(ctx).search(
+        query,
+        top_k,
+        raw,
+        top_n=top_n,
+        min_score=min_score,
+        score_threshold=score_threshold,
+        filters=_search_filter(document_type, document_name, inserted_after, inserted_before),
+        collection_name=ctx.obj["collection"],
     )
 
-    # Instantiate use cases with their specific dependencies
-    search_uc = SearchDocuments(
-        embedder=embedder, vector_store=vector_store, reranker=reranker, generator=generator
-    )
-
-    use_case: SearchDocuments = search_uc
-    response = use_case.execute(query, top_k, raw)
-
     typer.echo("--------------------------------------------------")
     typer.echo("🤖 Answer: ", nl=False)
     for chunk in response.answer:
@@ -153,12 +461,407 @@ def search(
     typer.echo("\n--------------------------------------------------")
     typer.echo("\n📚 Sources (All might not be relevant):")
     for i, source in enumerate(response.sources, 1):
+        scores = ", ".join(
+            f"{name} : {value:.3f}"
+            for name, value in (("similarity", source.score), ("relevance", source.rerank_score))
+            if value is not None
+        )
         typer.echo(
-            (
-                f"  [{i}] - document name : {source.document_name}, chunk id : {source.id},",
-                f"document id : {source.document_id}",
+            f"  [{i}] - document name : {source.document_name}, chunk id : {source.id}, "
+            f"document id : {source.document_id}" + (f", {scores}" if scores else "")
+        )
+
+
+@app.command()
+def search_batch(
+    ctx: typer.Context,
+    queries_file: Annotated[str, typer.Argument(help="File with one query per line")],
+    output: Annotated[
+        str | None,
+        typer.Option(help="File the JSON lines results are written to, standard output if unset"),
+    ] = None,
+    top_k: Annotated[
+        int, typer.Option(help="Number of top similar documents to retrieve", show_default=True)
+    ] = 10,
+    raw: Annotated[bool, typer.Option(help="Output raw answers without llm processing")] = False,
+    top_n: Annotated[
+        int | None,
+        typer.Option(help="Number of reranked documents to keep in the answer context"),
+    ] = None,
+    min_score: Annotated[
+        float | None,
+        typer.Option(help="Minimum rerank score for a document to be kept in the context"),
+    ] = None,
+    score_threshold: Annotated[
+        float | None,
+        typer.Option(help="Minimum similarity score for a document to be retrieved"),
+    ] = None,
+    document_type: Annotated[
+        str | None,
+        typer.Option(
+            help="Only search documents of this type",
+            callback=lambda value: _parse_document_type(value) if value is not None else None,
+        ),
+    ] = None,
+    document_name: Annotated[
+        str | None, typer.Option(help="Only search the document with this file name")
+    ] = None,
+    inserted_after: Annotated[
+        datetime | None,
+        typer.Option(help="Only search chunks indexed at or after this date (UTC by default)"),
+    ] = None,
+    inserted_before: Annotated[
+        datetime | None,
+        typer.Option(help="Only search chunks indexed at or before this date (UTC by default)"),
+    ] = None,
+    batch_size: Annotated[
+        int, typer.Option(help="Number of queries searched for together", show_default=True)
+    ] = 64,
+    concurrency: Annotated[
+        int,
+        typer.Option(help="Number of answers generated at the same time", show_default=True),
+    ] = 4,
+):
+    """
+    Searches for every query of a file, writing one JSON line per query with its answer and
+    sources, in the order of the file. Queries are embedded, retrieved and reranked together
+    in batches, and their answers generated concurrently. Always runs locally, even with
+    --server-url.
+    """
+    import json
+    from contextlib import nullcontext
+
+    from memorag.application.pipeline import batched
+    from memorag.presentation.services import Services
+
+    with open(queries_file, encoding="utf-8") as f:
+        queries = [line.strip() for line in f if line.strip()]
+
+    services = Services(ctx.obj, instrumentation=_instrumentation(ctx))
+    filters = _search_filter(document_type, document_name, inserted_after, inserted_before)
+    failures = 0
+    with (
+        open(output, "w", encoding="utf-8") if output is not None else nullcontext(sys.stdout)
+    ) as out:
+        for batch in batched(queries, batch_size):
+            responses = services.search_many(
+                batch,
+                top_k,
+                raw,
+                top_n=top_n,
+                min_score=min_score,
+                score_threshold=score_threshold,
+                filters=filters,
+                collection_name=ctx.obj["collection"],
+                concurrency=concurrency,
+            )
+            for query, response in zip(batch, responses, strict=True):
+                result: dict = {"query": query}
+                try:
+                    result["answer"] = "".join(response.answer)
+                except Exception as e:
+                    failures += 1
+                    result["error"] = str(e)
+                result["sources"] = [
+                    {
+                        "id": str(source.id),
+                        "document_id": source.document_id,
+                        "document_name": source.document_name,
+                        "score": source.score,
+                        "rerank_score": source.rerank_score,
+                    }
+                    for source in response.sources
+                ]
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+
+    if failures:
+        typer.echo(f"{failures} of {len(queries)} answers failed.", err=True)
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def evaluate(
+    ctx: typer.Context,
+    dataset_file: Annotated[
+        str,
+        typer.Argument(
+            help="JSON lines file of queries and the ids or names of their relevant documents, "
+            'e.g. {"query": "Why Qdrant?", "expected": ["adr-001.md"]}'
+        ),
+    ],
+    k: Annotated[
+        int, typer.Option(help="Number of ranked documents the metrics look at", show_default=True)
+    ] = 10,
+    top_k: Annotated[
+        int, typer.Option(help="Number of top similar documents to retrieve", show_default=True)
+    ] = 10,
+    top_n: Annotated[
+        int | None,
+        typer.Option(help="Number of reranked documents to keep"),
+    ] = None,
+    min_score: Annotated[
+        float | None,
+        typer.Option(help="Minimum rerank score for a document to be kept"),
+    ] = None,
+    score_threshold: Annotated[
+        float | None,
+        typer.Option(help="Minimum similarity score for a document to be retrieved"),
+    ] = None,
+    min_recall: Annotated[
+        float | None,
+        typer.Option(help="Fail when the recall@k is below this value"),
+    ] = None,
+    json_output: Annotated[
+        bool, typer.Option("--json", help="Print the report as JSON, to compare configurations")
+    ] = False,
+):
+    """
+    Measures the quality of retrieval and reranking on a dataset, with the recall@k, MRR and
+    nDCG@k of the documents ranked by their best chunk, alongside the latency of each stage.
+    Run it with different settings (--top-k, quantization, reranker backend, ...) to pick
+    the fastest configuration keeping --min-recall. Always runs locally, without the search
+    cache.
+    """
+    from memorag.domain.entities import EvaluationQuery
+    from memorag.presentation.services import Services
+
+    try:
+        with open(dataset_file, encoding="utf-8") as f:
+            dataset = [EvaluationQuery.model_validate_json(line) for line in f if line.strip()]
+        evaluation = Services(ctx.obj, instrumentation=_instrumentation(ctx)).evaluate(
+            dataset,
+            k=k,
+            top_k=top_k,
+            top_n=top_n,
+            min_score=min_score,
+            score_threshold=score_threshold,
+        )
+    except ValueError as e:
+        # Invalid dataset lines raise pydantic's ValidationError, a ValueError
+        typer.echo(str(e), err=True)
+        raise typer.Exit(code=1) from e
+
+    if json_output:
+        typer.echo(evaluation.model_dump_json(indent=2))
+    else:
+        typer.echo(
+            f"{evaluation.queries} queries: recall@{k} {evaluation.recall:.3f}, "
+            f"MRR@{k} {evaluation.mrr:.3f}, nDCG@{k} {evaluation.ndcg:.3f}"
+        )
+        typer.echo(f"\n{'stage':<22}{'calls':>7}{'mean ms':>12}{'p50 ms':>12}{'p95 ms':>12}")
+        for stage, latency in evaluation.latencies.items():
+            typer.echo(
+                f"{stage:<22}{latency.calls:>7}{latency.mean * 1000:>12.2f}"
+                f"{latency.p50 * 1000:>12.2f}{latency.p95 * 1000:>12.2f}"
             )
+
+    if min_recall is not None and not evaluation.meets(min_recall):
+        typer.echo(f"Recall@{k} is below {min_recall}.", err=True)
+        raise typer.Exit(code=1)
+
+
+# Typical chunks of technical decision records, used when no texts are provided
+_SAMPLE_TEXTS = [
+    "We picked Qdrant as the vector database because it runs locally and supports filters.",
+    "ADR-042: Use PostgreSQL for transactional data and keep analytics in the warehouse.",
+    "Set embedding_cache_dir to reuse embeddings of unchanged chunks across runs.",
+    "The team decided to deprecate the v1 REST API by the end of the quarter.",
+    "Retries use exponential backoff with jitter, capped at 30 seconds.",
+    "Pourquoi avons-nous choisi Kafka plutôt que RabbitMQ pour les événements ?",
+    "Migration plan: dual-write for two weeks, then switch reads and drop the old table.",
+    "def chunk(document): return splitter.split(document.content)",
+]
+
+
+@app.command()
+def check_embedder(
+    ctx: typer.Context,
+    texts_file: Annotated[
+        str | None,
+        typer.Option(help="File with one text per line to compare embeddings on"),
+    ] = None,
+    tolerance: Annotated[
+        float,
+        typer.Option(help="Largest accepted cosine distance to the PyTorch embeddings"),
+    ] = 0.01,
+):
+    """
+    Checks that the embeddings of the configured --embedding-backend stay within a cosine
+    tolerance of the reference PyTorch ones, so switching backends keeps search quality.
+    Collections stay bound to the backend they were indexed with: the next index run
+    re-embeds them and snapshots made with another backend are refused.
+    """
+    from memorag.presentation.services import Services
+
+    texts = _SAMPLE_TEXTS
+    if texts_file is not None:
+        with open(texts_file, encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()]
+
+    try:
+        comparison = Services(ctx.obj).compare_embedders(texts, tolerance)
+    except ValueError as e:
+        typer.echo(str(e), err=True)
+        raise typer.Exit(code=1) from e
+
+    typer.echo(
+        f"Compared {comparison.texts} embeddings of {ctx.obj['embedding_backend']} with torch: "
+        f"cosine similarity min {comparison.min_similarity:.5f}, "
+        f"mean {comparison.mean_similarity:.5f}"
+    )
+    if not comparison.within_tolerance:
+        typer.echo(f"Embeddings are not within the {tolerance} tolerance.", err=True)
+        raise typer.Exit(code=1)
+    typer.echo(f"Embeddings are within the {tolerance} tolerance.")
+
+
+@app.command()
+def configure_collection(ctx: typer.Context):
+    """
+    Applies the --qdrant-* collection settings (HNSW, on-disk storage, quantization) to the
+    existing Qdrant collection, which are otherwise only used when it is created, and
+    creates its payload indexes. Qdrant rebuilds the collection in the background.
+    """
+    from memorag.presentation.services import Services
+
+    try:
+        message = Services(ctx.obj).configure_collection()
+    except ValueError as e:
+        typer.echo(str(e), err=True)
+        raise typer.Exit(code=1) from e
+    typer.echo(message)
+
+
+@app.command()
+def export(
+    ctx: typer.Context,
+    path: Annotated[str, typer.Argument(help="Path of the snapshot file to write")],
+    precision: Annotated[
+        str,
+        typer.Option(
+            help="Precision of the stored vectors, float16 halving the file size",
+            show_default=True,
+            callback=lambda value: _check_choice(value, ("float32", "float16")),
+        ),
+    ] = "float32",
+    batch_size: Annotated[
+        int,
+        typer.Option(
+            help="Number of vectors read from the vector store at once", show_default=True
+        ),
+    ] = 1024,
+):
+    """
+    Writes every vector of the collection, with its content and metadata, to a snapshot
+    file recording the embedding model, to back it up or move it to another vector store
+    without embedding the documents again. The snapshot records the --embedding-model,
+    --embedding-backend and --embedding-dim given, which must be the ones the collection
+    was indexed with. Always runs locally, even with --server-url.
+    """
+    from memorag.presentation.services import Services
+
+    try:
+        report = Services(ctx.obj).export_collection(
+            path, precision=precision, batch_size=batch_size
         )
+    except (ValueError, OSError) as e:
+        typer.echo(str(e), err=True)
+        raise typer.Exit(code=1) from e
+    typer.echo(
+        f"Exported {report.vectors} vectors in {report.seconds:.1f}s: "
+        f"{report.vectors_per_second:.0f} vectors/s"
+    )
+
+
+@app.command("import")
+def import_(
+    ctx: typer.Context,
+    path: Annotated[str, typer.Argument(help="Path of the snapshot file to load")],
+    writers: Annotated[
+        int, typer.Option(help="Number of concurrent upserts", show_default=True)
+    ] = 4,
+    batch_size: Annotated[
+        int, typer.Option(help="Number of vectors per upsert", show_default=True)
+    ] = 256,
+):
+    """
+    Loads the vectors of a snapshot file written by export into the collection, with
+    concurrent batched upserts. Snapshots made with another embedding model, backend or
+    dimension than the configured one are refused. Always runs locally, even with
+    --server-url.
+    """
+    from memorag.presentation.services import Services
+
+    try:
+        report = Services(ctx.obj).import_collection(path, batch_size=batch_size, writers=writers)
+    except (ValueError, OSError) as e:
+        typer.echo(str(e), err=True)
+        raise typer.Exit(code=1) from e
+    typer.echo(
+        f"Imported {report.vectors} vectors in {report.seconds:.1f}s: "
+        f"{report.vectors_per_second:.0f} vectors/s"
+    )
+
+
+@app.command()
+def doctor(
+    ctx: typer.Context,
+    startup: Annotated[
+        bool,
+        typer.Option(help="Report the cold import time of the CLI, adapters and dependencies"),
+    ] = False,
+):
+    """
+    Diagnoses the installation. With --startup, imports each module in a fresh interpreter
+    and reports how long it took and which heavy dependencies it pulled in, to find what
+    slows down short commands.
+    """
+    from memorag.presentation.services import STARTUP_MODULES, import_time
+
+    if not startup:
+        typer.echo("Nothing to check, pass --startup for the import time report.", err=True)
+        raise typer.Exit(code=1)
+
+    typer.echo(f"{'module':<54}{'import ms':>10}  heavy dependencies")
+    for module in STARTUP_MODULES:
+        try:
+            seconds, heavy = import_time(module)
+        except RuntimeError as e:
+            typer.echo(f"{module:<54}{'failed':>10}  {e}")
+            continue
+        typer.echo(f"{module:<54}{seconds * 1000:>10.1f}  {', '.join(heavy)}".rstrip())
+
+
+@app.command()
+def serve(
+    ctx: typer.Context,
+    host: Annotated[
+        str, typer.Option(help="Address to listen on", show_default=True)
+    ] = "127.0.0.1",
+    port: Annotated[int, typer.Option(help="Port to listen on", show_default=True)] = 8765,
+):
+    """
+    Runs a long-lived server keeping models loaded, to which commands can be sent with
+    --server-url. Stage metrics are exposed in the Prometheus format on /metrics.
+    """
+    from memorag.infrastructure.adapters import PrometheusExporter
+    from memorag.presentation.server import create_server
+    from memorag.presentation.services import Services
+
+    metrics = PrometheusExporter()
+    services = Services(ctx.obj, instrumentation=_instrumentation(ctx, metrics))
+    typer.echo("Loading models...")
+    services.warm_up()
+
+    server = create_server(services, host, port, metrics=metrics)
+    typer.echo(f"MemoRAG server listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
 
 
 if __name__ == "__main__":
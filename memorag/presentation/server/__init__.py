@@ -0,0 +1,4 @@
+from .app import create_server
+from .client import MemoRAGClient
+
+__all__ = ["create_server", "MemoRAGClient"]
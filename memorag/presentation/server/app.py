@@ -0,0 +1,126 @@
+import json
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING
+
+from memorag.domain.entities import DocumentType, SearchFilter, Vector
+from memorag.presentation.services import Services
+
+if TYPE_CHECKING:
+    from memorag.infrastructure.adapters import PrometheusExporter
+
+
+def _serialize_source(source: Vector) -> dict:
+    return {
+        "id": str(source.id),
+        "content": source.content.decode("utf-8"),
+        "inserted_at": source.inserted_at.isoformat(),
+        "metadata": source.metadata,
+        "score": source.score,
+        "rerank_score": source.rerank_score,
+    }
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    services: Services
+    metrics: "PrometheusExporter | None"
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON body: {e}") from e
+        if not isinstance(body, dict):
+            raise ValueError("The request body must be a JSON object.")
+        return body
+
+    def _send_json(self, status: HTTPStatus, body: dict) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _write_line(self, body: dict) -> None:
+        self.wfile.write(json.dumps(body).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send_json(HTTPStatus.OK, {"status": "ok"})
+        elif self.path == "/metrics" and self.metrics is not None:
+            payload = self.metrics.render().encode("utf-8")
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        else:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self) -> None:
+        handlers = {"/index": self._index, "/search": self._search}
+        handler = handlers.get(self.path)
+        if handler is None:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown path {self.path}"})
+            return
+
+        try:
+            handler(self._read_json())
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+        except Exception as e:
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)})
+
+    def _index(self, body: dict) -> None:
+        message = self.services.index(
+            text=body.get("text"),
+            filepath=body.get("filepath"),
+            filetype=DocumentType(body.get("filetype", DocumentType.TEXT.value)),
+            stream=body.get("stream", False),
+            batch_size=body.get("batch_size", 64),
+            chunk_size=body.get("chunk_size", 1000),
+            chunk_overlap=body.get("chunk_overlap", 200),
+            incremental=body.get("incremental", False),
+            manifest_path=body.get("manifest_path", "~/.cache/memorag/manifest.sqlite"),
+            collection_name=body.get("collection"),
+        )
+        self._send_json(HTTPStatus.OK, {"message": message})
+
+    def _search(self, body: dict) -> None:
+        response = self.services.search(
+            query=body["query"],
+            top_k=body.get("top_k", 10),
+            raw=body.get("raw", False),
+            top_n=body.get("top_n"),
+            min_score=body.get("min_score"),
+            score_threshold=body.get("score_threshold"),
+            filters=SearchFilter(**body["filters"]) if body.get("filters") else None,
+            collection_name=body.get("collection"),
+        )
+
+        # The answer is streamed as JSON lines: the sources first, then each answer chunk
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        self._write_line({"sources": [_serialize_source(s) for s in response.sources]})
+        try:
+            for chunk in response.answer:
+                self._write_line({"answer": chunk})
+        except Exception as e:
+            self._write_line({"error": str(e)})
+
+
+def create_server(
+    services: Services, host: str, port: int, metrics: "PrometheusExporter | None" = None
+) -> ThreadingHTTPServer:
+    """
+    Creates an HTTP server answering index and search requests with warm services, and
+    exposing `metrics` on /metrics when given.
+    """
+    handler = type(
+        "RequestHandler", (_RequestHandler,), {"services": services, "metrics": metrics}
+    )
+    return ThreadingHTTPServer((host, port), handler)
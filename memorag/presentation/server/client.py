@@ -0,0 +1,113 @@
+import json
+import os
+from collections.abc import Generator
+from datetime import datetime
+from http.client import HTTPResponse
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+from uuid import UUID
+
+from memorag.domain.entities import DocumentType, SearchFilter, SearchResponse, Vector
+
+
+class MemoRAGClient:
+    """Sends index and search requests to a running `memorag serve` process."""
+
+    def __init__(self, base_url: str, timeout: float = 600.0) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def _post(self, path: str, body: dict) -> HTTPResponse:
+        request = Request(
+            f"{self.base_url}{path}",
+            data=json.dumps(body).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            return urlopen(request, timeout=self.timeout)
+        except HTTPError as e:
+            try:
+                message = json.loads(e.read())["error"]
+            except (ValueError, KeyError):
+                message = str(e)
+            raise RuntimeError(f"MemoRAG server error: {message}") from e
+        except URLError as e:
+            raise RuntimeError(f"Cannot reach MemoRAG server at {self.base_url}: {e}") from e
+
+    def index(
+        self,
+        text: str | None,
+        filepath: str | None,
+        filetype: DocumentType,
+        stream: bool,
+        batch_size: int,
+        chunk_size: int,
+        chunk_overlap: int,
+        incremental: bool,
+        manifest_path: str,
+        collection_name: str | None = None,
+    ) -> str:
+        with self._post(
+            "/index",
+            {
+                "text": text,
+                # The server may run from another directory
+                "filepath": os.path.abspath(filepath) if filepath is not None else None,
+                "filetype": filetype.value,
+                "stream": stream,
+                "batch_size": batch_size,
+                "chunk_size": chunk_size,
+                "chunk_overlap": chunk_overlap,
+                "incremental": incremental,
+                "manifest_path": os.path.expanduser(manifest_path),
+                "collection": collection_name,
+            },
+        ) as response:
+            return json.loads(response.read())["message"]
+
+    def search(
+        self,
+        query: str,
+        top_k: int,
+        raw: bool,
+        top_n: int | None = None,
+        min_score: float | None = None,
+        score_threshold: float | None = None,
+        filters: SearchFilter | None = None,
+        collection_name: str | None = None,
+    ) -> SearchResponse:
+        response = self._post(
+            "/search",
+            {
+                "query": query,
+                "top_k": top_k,
+                "raw": raw,
+                "top_n": top_n,
+                "min_score": min_score,
+                "score_threshold": score_threshold,
+                "filters": filters.model_dump(mode="json") if filters is not None else None,
+                "collection": collection_name,
+            },
+        )
+        sources = [
+            Vector(
+                id=UUID(source["id"]),
+                inserted_at=datetime.fromisoformat(source["inserted_at"]),
+                content=source["content"].encode("utf-8"),
+                metadata=source["metadata"],
+                score=source.get("score"),
+                rerank_score=source.get("rerank_score"),
+            )
+            for source in json.loads(response.readline())["sources"]
+        ]
+        return SearchResponse(answer=self._stream_answer(response), sources=sources)
+
+    @staticmethod
+    def _stream_answer(response: HTTPResponse) -> Generator[str, None, None]:
+        with response:
+            for line in response:
+                event = json.loads(line)
+                if "error" in event:
+                    raise RuntimeError(f"MemoRAG server error: {event['error']}")
+                yield event["answer"]
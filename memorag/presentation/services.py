@@ -0,0 +1,537 @@
+import fnmatch
+import json
+import os
+import subprocess
+import sys
+import threading
+from collections.abc import Callable
+from functools import cached_property
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from memorag.application.context import ContextBuilder
+    from memorag.application.instrumentation import Instrumentation
+    from memorag.application.use_cases import IndexDocument, SearchDocuments
+    from memorag.domain.entities import (
+        BatchIndexingReport,
+        Document,
+        DocumentType,
+        EmbedderComparison,
+        EvaluationQuery,
+        RetrievalEvaluation,
+        SearchFilter,
+        SearchResponse,
+        SnapshotReport,
+    )
+    from memorag.domain.ports import (
+        Chunker,
+        Embedder,
+        Generator,
+        IndexManifest,
+        LexicalIndex,
+        Reranker,
+        SearchCache,
+        VectorStore,
+    )
+    from memorag.infrastructure.adapters import QdrantVectorStore
+
+
+def find_files(directory: str, include: list[str], exclude: list[str]) -> list[str]:
+    """
+    Lists the files of `directory` matching one of the `include` globs (e.g. "**/*.md")
+    and none of the `exclude` patterns, which are matched against the path relative to
+    the directory with `*` also matching path separators (e.g. "node_modules*").
+    """
+    root = Path(directory)
+    files = set()
+    for pattern in include:
+        for path in root.glob(pattern):
+            relative = path.relative_to(root).as_posix()
+            if path.is_file() and not any(fnmatch.fnmatch(relative, p) for p in exclude):
+                files.add(str(path))
+    return sorted(files)
+
+
+# Dependencies taking seconds to import, which must only be imported by the commands using them
+HEAVY_MODULES = ("torch", "sentence_transformers", "qdrant_client", "litellm")
+
+# Modules whose import time `memorag doctor --startup` reports, from the CLI entry point to
+# each adapter and the heavy dependencies themselves
+STARTUP_MODULES = (
+    "memorag.presentation.cli.main",
+    "memorag.presentation.services",
+    "memorag.application.use_cases",
+    "memorag.infrastructure.adapters",
+    "memorag.infrastructure.adapters.local_vector_store",
+    "memorag.infrastructure.adapters.qdrant",
+    "memorag.infrastructure.adapters.sentence_transformer",
+    "memorag.infrastructure.adapters.cross_encoder",
+    "memorag.infrastructure.adapters.litellm_generator",
+    *HEAVY_MODULES,
+)
+
+_IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps([seconds, [name for name in {heavy!r} if name in sys.modules]]))
+"""
+
+
+def import_time(module: str) -> tuple[float, list[str]]:
+    """
+    Imports `module` in a fresh interpreter and returns how long it took, with the heavy
+    dependencies it imported along the way. Raises `RuntimeError` when the import fails.
+    """
+    script = _IMPORT_SCRIPT.format(module=module, heavy=HEAVY_MODULES)
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True)
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()
+        raise RuntimeError(error[-1] if error else f"Importing {module} failed")
+
+    # Some libraries print on import, the measurement is the last line
+    seconds, heavy = json.loads(result.stdout.strip().splitlines()[-1])
+    return seconds, heavy
+
+
+# Settings that the embeddings of a chunk depend on
+_EMBEDDING_SETTINGS = ("embedding_model", "embedding_backend", "embedding_dim")
+
+# Settings that the sources and answer of a search depend on, besides its parameters
+_SEARCH_SETTINGS = (
+    *_EMBEDDING_SETTINGS,
+    "rerank_model",
+    "rerank_backend",
+    "rerank_max_length",
+    "llm_model",
+    "hybrid",
+)
+
+
+class Services:
+    """
+    Builds adapters and use cases from the global configuration on first use, and keeps
+    them for the lifetime of the process so a long-running server loads models only once.
+    Heavy dependencies are imported lazily to keep short CLI invocations fast.
+    """
+
+    def __init__(self, config: dict, instrumentation: "Instrumentation | None" = None) -> None:
+        self.config = config
+        self.instrumentation = instrumentation
+        self._manifests: dict[str, IndexManifest] = {}
+        self._manifests_lock = threading.Lock()
+
+    def _settings(self, keys: tuple[str, ...], **extra: object) -> str:
+        """Identifies the values of configuration `keys` and `extra` settings."""
+        return json.dumps({key: self.config[key] for key in keys} | extra, sort_keys=True)
+
+    def _model_embedder(self, backend: str) -> "Embedder":
+        from memorag.infrastructure.adapters import SentenceTransformerEmbedder
+
+        return SentenceTransformerEmbedder(
+            model_name=self.config["embedding_model"],
+            batch_size=self.config["embedding_batch_size"],
+            backend=backend,
+        )
+
+    @cached_property
+    def embedder(self) -> "Embedder":
+        from memorag.infrastructure.adapters import CachedEmbedder
+
+        backend = self.config["embedding_backend"]
+        embedder = self._model_embedder(backend)
+        if self.config["embedding_cache_dir"] is None:
+            return embedder
+
+        # Backends produce slightly different vectors, which must not be mixed
+        return CachedEmbedder(
+            embedder=embedder,
+            model_name=f"{self.config['embedding_model']}:{backend}",
+            cache_dir=self.config["embedding_cache_dir"],
+            max_size_bytes=self.config["embedding_cache_size"] * 1024 * 1024,
+        )
+
+    @cached_property
+    def vector_store(self) -> "VectorStore":
+        from memorag.infrastructure.adapters import LocalVectorStore
+
+        if self.config["vector_store"] == "local":
+            return LocalVectorStore(
+                path=os.path.expanduser(self.config["local_store_path"]),
+                embedding_dim=self.config["embedding_dim"],
+                quantization=self.config["local_store_quantization"],
+            )
+
+        return self._qdrant_vector_store()
+
+    def _qdrant_vector_store(self) -> "QdrantVectorStore":
+        from memorag.infrastructure.adapters import QdrantCollectionConfig, QdrantVectorStore
+
+        return QdrantVectorStore(
+            host=self.config["qdrant_host"],
+            port=self.config["qdrant_port"],
+            embedding_dim=self.config["embedding_dim"],
+            grpc_port=self.config["qdrant_grpc_port"],
+            prefer_grpc=self.config["qdrant_prefer_grpc"],
+            pool_size=self.config["qdrant_pool_size"],
+            keep_alive=self.config["qdrant_keep_alive"],
+            collection_config=QdrantCollectionConfig(
+                hnsw_m=self.config["qdrant_hnsw_m"],
+                hnsw_ef_construct=self.config["qdrant_hnsw_ef_construct"],
+                hnsw_ef=self.config["qdrant_hnsw_ef"],
+                on_disk=self.config["qdrant_on_disk"],
+                on_disk_payload=self.config["qdrant_on_disk_payload"],
+                quantization=self.config["qdrant_quantization"],
+                rescore=self.config["qdrant_rescore"],
+                oversampling=self.config["qdrant_oversampling"],
+            ),
+        )
+
+    @cached_property
+    def reranker(self) -> "Reranker":
+        from memorag.infrastructure.adapters import CrossEncoderReranker
+
+        return CrossEncoderReranker(
+            model=self.config["rerank_model"],
+            batch_size=self.config["rerank_batch_size"],
+            max_length=self.config["rerank_max_length"],
+            backend=self.config["rerank_backend"],
+        )
+
+    @cached_property
+    def generator(self) -> "Generator":
+        from memorag.infrastructure.adapters import LiteLLMGenerator
+
+        return LiteLLMGenerator(model_name=self.config["llm_model"])
+
+    @cached_property
+    def context_builder(self) -> "ContextBuilder":
+        from memorag.application.context import ContextBuilder
+        from memorag.infrastructure.adapters import LiteLLMTokenizer
+
+        return ContextBuilder(
+            tokenizer=LiteLLMTokenizer(model_name=self.config["llm_model"]),
+            max_tokens=self.config["context_tokens"],
+            # 0 leaves out exact duplicates only, without retrieving the embeddings
+            dedup_threshold=self.config["context_dedup_threshold"] or None,
+        )
+
+    @cached_property
+    def search_cache(self) -> "SearchCache | None":
+        """
+        The search cache, opened when enabled or when one already exists, so that indexing
+        without the cache enabled still invalidates it.
+        """
+        path = os.path.expanduser(self.config["search_cache_path"])
+        if not self.config["search_cache"] and not os.path.exists(path):
+            return None
+
+        from memorag.infrastructure.adapters import SqliteSearchCache
+
+        return SqliteSearchCache(
+            path,
+            similarity_threshold=self.config["search_cache_similarity"],
+            ttl_seconds=self.config["search_cache_ttl"],
+        )
+
+    @cached_property
+    def lexical_index(self) -> "LexicalIndex | None":
+        """
+        The lexical index, opened when hybrid retrieval is enabled or when one already
+        exists, so that indexing without hybrid retrieval enabled still keeps it in sync.
+        """
+        path = os.path.expanduser(self.config["lexical_index_path"])
+        if not self.config["hybrid"] and not os.path.exists(path):
+            return None
+
+        from memorag.infrastructure.adapters import SqliteLexicalIndex
+
+        return SqliteLexicalIndex(path)
+
+    @cached_property
+    def search_documents(self) -> "SearchDocuments":
+        from memorag.application.use_cases import SearchDocuments
+
+        return SearchDocuments(
+            embedder=self.embedder,
+            vector_store=self.vector_store,
+            reranker=self.reranker,
+            generator=self.generator,
+            instrumentation=self.instrumentation,
+            search_cache=self.search_cache if self.config["search_cache"] else None,
+            lexical_index=self.lexical_index if self.config["hybrid"] else None,
+            collection_name=self.config["collection"],
+            context_builder=self.context_builder,
+            settings=self._settings(_SEARCH_SETTINGS),
+        )
+
+    def warm_up(self) -> None:
+        """
+        Loads every model and opens every connection ahead of the first request. Adapters
+        are cached properties without a lock, so the server's threads must find them built
+        rather than each build their own.
+        """
+        # The generator imports litellm on its first call, which takes seconds
+        import litellm  # noqa: F401
+
+        # Indexing uses the search cache and the lexical index even when searches do not
+        _ = self.search_documents, self.search_cache, self.lexical_index
+
+    def chunker(self, chunk_size: int, chunk_overlap: int) -> "Chunker":
+        from memorag.domain.entities import DocumentType
+        from memorag.infrastructure.adapters import (
+            DocumentTypeChunker,
+            FixedSizeChunker,
+            MarkdownChunker,
+        )
+
+        return DocumentTypeChunker(
+            chunkers={
+                DocumentType.MARKDOWN: MarkdownChunker(
+                    chunk_size=chunk_size, chunk_overlap=chunk_overlap
+                ),
+            },
+            default=FixedSizeChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap),
+        )
+
+    def index_manifest(self, path: str) -> "IndexManifest":
+        """
+        The manifest at `path`, opened on first use and kept like the other adapters, so
+        that a server indexing incrementally opens one connection per manifest.
+        """
+        from memorag.infrastructure.adapters import SqliteIndexManifest
+
+        path = os.path.expanduser(path)
+        with self._manifests_lock:
+            if path not in self._manifests:
+                self._manifests[path] = SqliteIndexManifest(path)
+            return self._manifests[path]
+
+    def index_document(
+        self,
+        chunk_size: int,
+        chunk_overlap: int,
+        manifest_path: str | None = None,
+        collection_name: str | None = None,
+    ) -> "IndexDocument":
+        from memorag.application.use_cases import IndexDocument
+
+        return IndexDocument(
+            embedder=self.embedder,
+            vector_store=self.vector_store,
+            chunker=self.chunker(chunk_size, chunk_overlap),
+            manifest=self.index_manifest(manifest_path) if manifest_path is not None else None,
+            instrumentation=self.instrumentation,
+            search_cache=self.search_cache,
+            lexical_index=self.lexical_index,
+            collection_name=collection_name or self.config["collection"],
+            settings=self._settings(
+                _EMBEDDING_SETTINGS, chunk_size=chunk_size, chunk_overlap=chunk_overlap
+            ),
+        )
+
+    def index(
+        self,
+        text: str | None,
+        filepath: str | None,
+        filetype: "DocumentType",
+        stream: bool,
+        batch_size: int,
+        chunk_size: int,
+        chunk_overlap: int,
+        incremental: bool,
+        manifest_path: str,
+        collection_name: str | None = None,
+    ) -> str:
+        """Indexes a text or a file and returns a summary of what was done."""
+        from memorag.domain.entities import Document
+
+        if stream and incremental:
+            raise ValueError("Streaming and incremental indexing cannot be used together.")
+
+        if text is not None:
+            document = Document.from_text(text)
+        elif filepath is not None:
+            document = Document.from_filepath(filepath, filetype, lazy=stream)
+        else:
+            raise ValueError("Either text or filepath must be provided.")
+
+        use_case = self.index_document(
+            chunk_size, chunk_overlap, manifest_path if incremental else None, collection_name
+        )
+        if incremental:
+            report = use_case.execute_incremental(document)
+            if report.unchanged:
+                return f"Document unchanged: {document.id} - {document.name}"
+            return (
+                f"Indexed document: {document.id} - {document.name} "
+                f"({report.upserted} chunks upserted, {report.deleted} deleted)"
+            )
+
+        if stream:
+            use_case.execute_stream(document, batch_size=batch_size)
+        else:
+            use_case.execute(document)
+        return f"Indexed document: {document.id} - {document.name}"
+
+    def index_files(
+        self,
+        filepaths: list[str],
+        batch_size: int,
+        chunk_size: int,
+        chunk_overlap: int,
+        workers: int | None,
+        writers: int,
+        on_document: "Callable[[Document], None] | None" = None,
+    ) -> "BatchIndexingReport":
+        """Indexes many files, their type being guessed from their extension."""
+        from memorag.domain.entities import Document, DocumentType
+
+        documents = (
+            Document.from_filepath(filepath, DocumentType.from_filepath(filepath), lazy=True)
+            for filepath in filepaths
+        )
+        return self.index_document(chunk_size, chunk_overlap).execute_many(
+            documents,
+            batch_size=batch_size,
+            workers=workers,
+            writers=writers,
+            on_document=on_document,
+        )
+
+    def search(
+        self,
+        query: str,
+        top_k: int,
+        raw: bool,
+        top_n: int | None = None,
+        min_score: float | None = None,
+        score_threshold: float | None = None,
+        filters: "SearchFilter | None" = None,
+        collection_name: str | None = None,
+    ) -> "SearchResponse":
+        return self.search_documents.execute(
+            query,
+            top_k,
+            raw,
+            top_n=top_n,
+            min_score=min_score,
+            score_threshold=score_threshold,
+            filters=filters,
+            collection_name=collection_name,
+        )
+
+    def search_many(
+        self,
+        queries: list[str],
+        top_k: int,
+        raw: bool,
+        top_n: int | None = None,
+        min_score: float | None = None,
+        score_threshold: float | None = None,
+        filters: "SearchFilter | None" = None,
+        collection_name: str | None = None,
+        concurrency: int = 4,
+    ) -> "list[SearchResponse]":
+        return self.search_documents.execute_many(
+            queries,
+            top_k,
+            raw,
+            top_n=top_n,
+            min_score=min_score,
+            score_threshold=score_threshold,
+            filters=filters,
+            collection_name=collection_name,
+            concurrency=concurrency,
+        )
+
+    def configure_collection(self) -> str:
+        """Applies the Qdrant collection settings to the existing collection."""
+        if self.config["vector_store"] != "qdrant":
+            raise ValueError("Only Qdrant collections can be configured.")
+
+        self._qdrant_vector_store().configure_collection(self.config["collection"])
+        return f"Configured collection: {self.config['collection']}"
+
+    def evaluate(
+        self,
+        dataset: "list[EvaluationQuery]",
+        k: int,
+        top_k: int,
+        top_n: int | None = None,
+        min_score: float | None = None,
+        score_threshold: float | None = None,
+    ) -> "RetrievalEvaluation":
+        """Evaluates retrieval and reranking on a dataset, bypassing the search cache."""
+        from memorag.application.instrumentation import InstrumentationGroup, StageLatencies
+        from memorag.application.use_cases import EvaluateRetrieval, SearchDocuments
+
+        latencies = StageLatencies()
+        instrumentations = [latencies]
+        if self.instrumentation is not None:
+            instrumentations.append(self.instrumentation)
+        search_documents = SearchDocuments(
+            embedder=self.embedder,
+            vector_store=self.vector_store,
+            reranker=self.reranker,
+            generator=self.generator,
+            instrumentation=InstrumentationGroup(instrumentations),
+            lexical_index=self.lexical_index if self.config["hybrid"] else None,
+            collection_name=self.config["collection"],
+        )
+        return EvaluateRetrieval(search_documents, latencies).execute(
+            dataset,
+            k=k,
+            top_k=top_k,
+            top_n=top_n,
+            min_score=min_score,
+            score_threshold=score_threshold,
+        )
+
+    def export_collection(
+        self, path: str, precision: str = "float32", batch_size: int = 1024
+    ) -> "SnapshotReport":
+        """Writes the vectors of the collection to a snapshot file, without embedding them."""
+        from memorag.application.use_cases import ExportCollection
+        from memorag.infrastructure.adapters import ColumnarSnapshotFile
+
+        return ExportCollection(
+            vector_store=self.vector_store,
+            snapshot_file=ColumnarSnapshotFile(precision=precision),
+            embedding_model=self.config["embedding_model"],
+            embedding_backend=self.config["embedding_backend"],
+            embedding_dim=self.config["embedding_dim"],
+            collection_name=self.config["collection"],
+        ).execute(os.path.expanduser(path), batch_size=batch_size)
+
+    def import_collection(
+        self,
+        path: str,
+        batch_size: int = 256,
+        writers: int = 4,
+    ) -> "SnapshotReport":
+        """Loads the vectors of a snapshot file made with the configured embedding model."""
+        from memorag.application.use_cases import ImportCollection
+        from memorag.infrastructure.adapters import ColumnarSnapshotFile
+
+        return ImportCollection(
+            vector_store=self.vector_store,
+            snapshot_file=ColumnarSnapshotFile(),
+            embedding_model=self.config["embedding_model"],
+            embedding_backend=self.config["embedding_backend"],
+            embedding_dim=self.config["embedding_dim"],
+            collection_name=self.config["collection"],
+            search_cache=self.search_cache,
+            lexical_index=self.lexical_index,
+        ).execute(os.path.expanduser(path), batch_size=batch_size, writers=writers)
+
+    def compare_embedders(self, texts: list[str], tolerance: float) -> "EmbedderComparison":
+        """Compares the configured embedding backend with the reference PyTorch one."""
+        from memorag.application.use_cases import CompareEmbedders
+
+        return CompareEmbedders(
+            embedder=self._model_embedder(self.config["embedding_backend"]),
+            reference=self._model_embedder("torch"),
+        ).execute(texts, tolerance)
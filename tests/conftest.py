@@ -0,0 +1,29 @@
+import uuid
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from memorag.domain.entities import Vector
+
+
+@pytest.fixture
+def make_vector():
+    """Builds vectors with a fresh id, the given fields and sensible defaults for the rest."""
+
+    def make(
+        content: bytes | str = b"content",
+        embedding=None,
+        metadata: dict | None = None,
+        score: float | None = None,
+    ) -> Vector:
+        return Vector(
+            id=uuid.uuid4(),
+            vector=None if embedding is None else np.asarray(embedding, dtype=np.float32),
+            inserted_at=datetime.now(tz=timezone.utc),
+            content=content.encode() if isinstance(content, str) else content,
+            metadata={"document_name": "adr.md"} if metadata is None else metadata,
+            score=score,
+        )
+
+    return make
@@ -0,0 +1,143 @@
+from unittest.mock import Mock
+
+import pytest
+
+from memorag.application.context import ContextBuilder, merge_overlapping
+
+
+@pytest.fixture
+def tokenizer():
+    # One token per word, the separator between passages being free
+    tokenizer = Mock(max_input_tokens=None)
+    tokenizer.count.side_effect = lambda text: len(text.split())
+    return tokenizer
+
+
+class TestMergeOverlapping:
+    def test_shared_text_is_written_once(self):
+        first = "The collection is sharded by tenant so that"
+        second = "sharded by tenant so that each shard stays small."
+
+        merged = merge_overlapping(first, second)
+
+        assert merged == "The collection is sharded by tenant so that each shard stays small."
+
+    def test_chunks_without_overlap_are_not_merged(self):
+        assert merge_overlapping("First paragraph.\n\n", "Second one.") is None
+
+    def test_short_coincidences_are_not_taken_for_overlaps(self):
+        assert merge_overlapping("ends with a", "a starts") is None
+
+
+class TestContextBuilder:
+    def test_exact_duplicates_are_left_out(self, tokenizer, make_vector):
+        vectors = [make_vector("same text"), make_vector("other text"), make_vector("same text")]
+
+        context = ContextBuilder(tokenizer).build("query", vectors)
+
+        assert context.text == "same text\n\nother text"
+        assert context.sources == vectors[:2]
+        assert context.duplicates == 1
+        assert context.tokens_saved == 2
+
+    def test_near_duplicates_are_left_out_by_embedding_similarity(self, tokenizer, make_vector):
+        vectors = [
+            make_vector("first version", embedding=[1.0, 0.0]),
+            make_vector("first version, reworded", embedding=[0.99, 0.05]),
+            make_vector("unrelated", embedding=[0.0, 1.0]),
+        ]
+
+        context = ContextBuilder(tokenizer, dedup_threshold=0.95).build("query", vectors)
+
+        assert context.sources == [vectors[0], vectors[2]]
+        assert context.duplicates == 1
+
+    def test_near_duplicates_are_kept_without_threshold(self, tokenizer, make_vector):
+        vectors = [
+            make_vector("first version", embedding=[1.0, 0.0]),
+            make_vector("first version, reworded", embedding=[0.99, 0.05]),
+        ]
+
+        context = ContextBuilder(tokenizer, dedup_threshold=None).build("query", vectors)
+
+        assert context.sources == vectors
+
+    def test_chunks_beyond_the_budget_are_dropped(self, tokenizer, make_vector):
+        vectors = [
+            make_vector("one two three"),
+            make_vector("four five six"),
+            make_vector("seven"),
+        ]
+
+        context = ContextBuilder(tokenizer, max_tokens=4).build("query", vectors)
+
+        # The second chunk does not fit, the smaller third one still does
+        assert context.text == "one two three\n\nseven"
+        assert context.dropped == 1
+        assert context.tokens == 4
+
+    def test_budget_is_lowered_to_the_window_of_the_llm(self, tokenizer, make_vector):
+        tokenizer.max_input_tokens = 103
+        vectors = [make_vector("one two"), make_vector("three")]
+
+        context = ContextBuilder(tokenizer, max_tokens=10).build("query", vectors)
+
+        # 100 tokens are kept for the prompt and 1 for the query
+        assert context.text == "one two"
+
+    def test_consecutive_chunks_of_a_document_are_merged(self, tokenizer, make_vector):
+        vectors = [
+            make_vector(
+                "shard stays small. Queries fan out to every shard.",
+                metadata={"document_id": "a", "chunk_index": "1"},
+            ),
+            make_vector("unrelated passage", metadata={"document_id": "b", "chunk_index": "1"}),
+            make_vector(
+                "The collection is sharded so each shard stays small.",
+                metadata={"document_id": "a", "chunk_index": "0"},
+            ),
+            make_vector("a later chunk", metadata={"document_id": "a", "chunk_index": "5"}),
+        ]
+
+        context = ContextBuilder(tokenizer).build("query", vectors)
+
+        assert context.text == (
+            "The collection is sharded so each shard stays small. Queries fan out to every "
+            "shard.\n\nunrelated passage\n\na later chunk"
+        )
+        assert context.merged == 1
+        assert context.sources == vectors
+
+    def test_chunks_with_a_stale_index_are_not_merged(self, tokenizer, make_vector):
+        # A new first chunk, the second one kept with its index from the previous version
+        vectors = [
+            make_vector("New intro paragraph.", metadata={"document_id": "a", "chunk_index": "0"}),
+            make_vector(
+                "Decision: use Qdrant.", metadata={"document_id": "a", "chunk_index": "1"}
+            ),
+        ]
+
+        context = ContextBuilder(tokenizer).build("query", vectors)
+
+        assert context.text == "New intro paragraph.\n\nDecision: use Qdrant."
+        assert context.merged == 0
+
+    def test_chunks_without_index_are_not_merged(self, tokenizer, make_vector):
+        vectors = [make_vector("first"), make_vector("second")]
+
+        context = ContextBuilder(tokenizer).build("query", vectors)
+
+        assert context.text == "first\n\nsecond"
+        assert context.merged == 0
+
+    def test_empty_context(self, tokenizer):
+        context = ContextBuilder(tokenizer).build("query", [])
+
+        assert context.text == ""
+        assert context.tokens == 0
+
+    def test_invalid_settings_are_rejected(self, tokenizer):
+        with pytest.raises(ValueError):
+            ContextBuilder(tokenizer, max_tokens=0)
+        with pytest.raises(ValueError):
+            ContextBuilder(tokenizer, dedup_threshold=1.5)
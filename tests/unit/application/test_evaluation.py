@@ -0,0 +1,38 @@
+import math
+
+import pytest
+
+from memorag.application.evaluation import ndcg_at_k, recall_at_k, reciprocal_rank
+
+
+class TestRecallAtK:
+    def test_share_of_expected_documents_in_the_first_k(self):
+        assert recall_at_k(["a", "b", "c"], {"a", "c", "d"}, k=2) == pytest.approx(1 / 3)
+        assert recall_at_k(["a", "b", "c"], {"a", "c", "d"}, k=3) == pytest.approx(2 / 3)
+
+    def test_without_expected_documents(self):
+        assert recall_at_k(["a"], set(), k=1) == 0.0
+
+
+class TestReciprocalRank:
+    def test_inverse_rank_of_the_first_expected_document(self):
+        assert reciprocal_rank(["a", "b", "c"], {"b", "c"}, k=3) == 0.5
+
+    def test_zero_when_no_expected_document_is_in_the_first_k(self):
+        assert reciprocal_rank(["a", "b", "c"], {"c"}, k=2) == 0.0
+
+
+class TestNdcgAtK:
+    def test_one_when_expected_documents_come_first(self):
+        assert ndcg_at_k(["a", "b", "c"], {"a", "b"}, k=3) == pytest.approx(1.0)
+
+    def test_lower_ranks_are_discounted(self):
+        ndcg = ndcg_at_k(["x", "a"], {"a"}, k=2)
+
+        assert ndcg == pytest.approx(1 / math.log2(3))
+
+    def test_ideal_gain_is_capped_at_k(self):
+        assert ndcg_at_k(["a"], {"a", "b", "c"}, k=1) == pytest.approx(1.0)
+
+    def test_zero_without_expected_document(self):
+        assert ndcg_at_k(["a"], set(), k=1) == 0.0
@@ -0,0 +1,18 @@
+from memorag.application.fusion import reciprocal_rank_fusion
+
+
+class TestReciprocalRankFusion:
+    def test_documents_ranked_by_several_retrievers_come_first(self, make_vector):
+        a, b, c = make_vector(), make_vector(), make_vector()
+
+        fused = reciprocal_rank_fusion([[a, b], [c, b]])
+
+        assert [v.id for v in fused] == [b.id, a.id, c.id]
+
+    def test_documents_are_kept_as_in_the_first_ranking(self, make_vector):
+        dense = make_vector(score=0.8)
+        lexical = dense.model_copy(update={"score": 12.0})
+
+        [fused] = reciprocal_rank_fusion([[dense], [lexical]])
+
+        assert fused.score == 0.8
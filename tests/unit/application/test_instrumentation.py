@@ -0,0 +1,100 @@
+import pytest
+
+from memorag.application.instrumentation import (
+    Instrumentation,
+    InstrumentationGroup,
+    NoInstrumentation,
+    StageLatencies,
+    StageProfile,
+    StageRecord,
+)
+
+
+class RecordingInstrumentation(Instrumentation):
+    def __init__(self):
+        self.records = []
+
+    def record(self, record: StageRecord) -> None:
+        self.records.append(record)
+
+
+class TestInstrumentation:
+    def test_stage_records_duration_and_attributes(self):
+        instrumentation = RecordingInstrumentation()
+
+        with instrumentation.stage("retrieve", top_k=5) as attributes:
+            attributes["candidates"] = 3
+
+        [record] = instrumentation.records
+        assert record.stage == "retrieve"
+        assert record.duration >= 0
+        assert record.attributes == {"top_k": 5, "candidates": 3}
+
+    def test_stage_records_failed_invocations(self):
+        instrumentation = RecordingInstrumentation()
+
+        with pytest.raises(ValueError), instrumentation.stage("embed"):
+            raise ValueError("boom")
+
+        assert [record.stage for record in instrumentation.records] == ["embed"]
+
+    def test_stream_records_first_item_and_item_count(self):
+        instrumentation = RecordingInstrumentation()
+
+        items = list(
+            instrumentation.stream("generate", iter(["a", "b"]), first_item_stage="first")
+        )
+
+        assert items == ["a", "b"]
+        assert [record.stage for record in instrumentation.records] == ["first", "generate"]
+        assert instrumentation.records[1].attributes == {"items": 2}
+
+    def test_no_instrumentation_returns_stream_unchanged(self):
+        stream = iter(["a"])
+
+        assert NoInstrumentation().stream("generate", stream) is stream
+
+    def test_group_forwards_records(self):
+        first, second = RecordingInstrumentation(), RecordingInstrumentation()
+
+        with InstrumentationGroup([first, second]).stage("embed"):
+            pass
+
+        assert len(first.records) == len(second.records) == 1
+
+
+class TestStageProfile:
+    def test_format_aggregates_stages(self):
+        profile = StageProfile()
+        profile.record(StageRecord("embed", 0.010, {"texts": 2}))
+        profile.record(StageRecord("embed", 0.030, {"texts": 3}))
+        profile.record(StageRecord("retrieve", 0.005, {}))
+
+        lines = profile.format().splitlines()
+
+        assert lines[1].split() == ["embed", "2", "40.00", "20.00", "texts=5"]
+        assert lines[2].split() == ["retrieve", "1", "5.00", "5.00"]
+
+
+class TestStageLatencies:
+    def test_summary_reports_percentiles_per_stage(self):
+        latencies = StageLatencies()
+        for duration in (0.1, 0.2, 0.3, 0.4):
+            latencies.record(StageRecord("retrieve", duration, {}))
+        latencies.record(StageRecord("rerank", 1.0, {}))
+
+        summary = latencies.summary()
+
+        assert list(summary) == ["retrieve", "rerank"]
+        assert summary["retrieve"].calls == 4
+        assert summary["retrieve"].mean == pytest.approx(0.25)
+        assert summary["retrieve"].p50 == pytest.approx(0.25)
+        assert summary["retrieve"].p95 == pytest.approx(0.385)
+
+    def test_reset_forgets_recorded_durations(self):
+        latencies = StageLatencies()
+        latencies.record(StageRecord("retrieve", 0.1, {}))
+
+        latencies.reset()
+
+        assert latencies.summary() == {}
@@ -0,0 +1,42 @@
+import pytest
+
+from memorag.application.pipeline import batched, prefetch
+
+
+class TestBatched:
+    def test_batched_groups_items(self):
+        assert list(batched(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+    def test_batched_rejects_invalid_size(self):
+        with pytest.raises(ValueError):
+            list(batched(range(5), 0))
+
+
+class TestPrefetch:
+    def test_prefetch_preserves_order(self):
+        assert list(prefetch(iter(range(100)), maxsize=3)) == list(range(100))
+
+    def test_prefetch_reraises_producer_errors(self):
+        def failing():
+            yield 1
+            raise ValueError("boom")
+
+        results = prefetch(failing(), maxsize=1)
+
+        assert next(results) == 1
+        with pytest.raises(ValueError, match="boom"):
+            next(results)
+
+    def test_prefetch_stops_producer_when_consumer_stops(self):
+        produced = []
+
+        def source():
+            for i in range(1000):
+                produced.append(i)
+                yield i
+
+        results = prefetch(source(), maxsize=2)
+        assert next(results) == 0
+        results.close()
+
+        assert len(produced) < 1000
@@ -0,0 +1,40 @@
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from memorag.application.use_cases.compare_embedders import CompareEmbedders
+
+
+class TestCompareEmbedders:
+    @pytest.fixture
+    def reference(self):
+        reference = Mock()
+        reference.embed_batch.return_value = np.array([[1.0, 0.0], [0.0, 2.0]])
+        return reference
+
+    def test_execute_measures_cosine_similarities(self, reference):
+        embedder = Mock()
+        embedder.embed_batch.return_value = np.array([[2.0, 0.0], [0.1, 1.0]])
+
+        comparison = CompareEmbedders(embedder, reference).execute(["a", "b"], tolerance=0.01)
+
+        assert comparison.texts == 2
+        assert comparison.min_similarity == pytest.approx(0.99504, abs=1e-5)
+        assert comparison.mean_similarity == pytest.approx(0.99752, abs=1e-5)
+        assert comparison.within_tolerance
+
+    def test_execute_flags_embeddings_out_of_tolerance(self, reference):
+        embedder = Mock()
+        embedder.embed_batch.return_value = np.array([[1.0, 0.0], [1.0, 1.0]])
+
+        comparison = CompareEmbedders(embedder, reference).execute(["a", "b"], tolerance=0.01)
+
+        assert not comparison.within_tolerance
+
+    def test_execute_rejects_mismatched_dimensions(self, reference):
+        embedder = Mock()
+        embedder.embed_batch.return_value = np.ones((2, 3))
+
+        with pytest.raises(ValueError, match="shapes"):
+            CompareEmbedders(embedder, reference).execute(["a", "b"])
@@ -0,0 +1,75 @@
+import uuid
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+
+from memorag.application.instrumentation import StageLatencies
+from memorag.application.use_cases.evaluate_retrieval import EvaluateRetrieval
+from memorag.domain.entities import EvaluationQuery, SearchResponse, Vector
+
+
+def _source(document_id, document_name):
+    return Vector(
+        id=uuid.uuid4(),
+        content=b"chunk",
+        inserted_at=datetime.now(),
+        metadata={"document_id": document_id, "document_name": document_name},
+    )
+
+
+class TestEvaluateRetrieval:
+    @pytest.fixture
+    def search_documents(self):
+        results = {
+            "first": [_source("1", "a.md"), _source("1", "a.md"), _source("2", "b.md")],
+            "second": [_source("3", "c.md"), _source("4", "d.md")],
+        }
+        search_documents = Mock()
+        search_documents.execute.side_effect = lambda query, **kwargs: SearchResponse(
+            answer=[], sources=results[query]
+        )
+        return search_documents
+
+    def test_execute_averages_metrics_over_queries(self, search_documents):
+        dataset = [
+            # Matched by document id, found first
+            EvaluationQuery(query="first", expected=["1"]),
+            # Matched by document name, found second
+            EvaluationQuery(query="second", expected=["d.md"]),
+        ]
+
+        evaluation = EvaluateRetrieval(search_documents, StageLatencies()).execute(
+            dataset, k=2, top_k=5, top_n=3
+        )
+
+        assert evaluation.queries == 2
+        assert evaluation.recall == 1.0
+        assert evaluation.mrr == pytest.approx((1 + 1 / 2) / 2)
+        assert 0 < evaluation.ndcg < 1
+        search_documents.execute.assert_called_with(
+            "second", top_k=5, raw=True, top_n=3, min_score=None, score_threshold=None
+        )
+
+    def test_execute_ranks_documents_by_their_best_chunk(self, search_documents):
+        # The second chunk of document 1 does not push document 2 beyond k
+        dataset = [EvaluationQuery(query="first", expected=["2"])]
+
+        evaluation = EvaluateRetrieval(search_documents, StageLatencies()).execute(dataset, k=2)
+
+        assert evaluation.recall == 1.0
+        assert evaluation.mrr == 0.5
+
+    def test_execute_reports_latencies_after_warm_up(self, search_documents):
+        latencies = StageLatencies()
+        dataset = [EvaluationQuery(query="first", expected=["1"])] * 3
+
+        evaluation = EvaluateRetrieval(search_documents, latencies).execute(dataset)
+
+        assert search_documents.execute.call_count == 4
+        assert evaluation.latencies["search"].calls == 3
+        assert evaluation.latencies["search"].p95 >= evaluation.latencies["search"].p50
+
+    def test_execute_rejects_empty_dataset(self, search_documents):
+        with pytest.raises(ValueError):
+            EvaluateRetrieval(search_documents, StageLatencies()).execute([])
@@ -0,0 +1,40 @@
+from unittest.mock import Mock
+
+import pytest
+
+from memorag.application.use_cases.export_collection import ExportCollection
+
+
+class TestExportCollection:
+    def test_execute_writes_scrolled_vectors_with_the_embedding_model(self, make_vector):
+        batches = [[make_vector(), make_vector()], [make_vector()]]
+        vector_store = Mock()
+        vector_store.scroll_vectors.return_value = iter(batches)
+        snapshot_file = Mock()
+        snapshot_file.write.side_effect = lambda path, header, blocks: sum(map(len, blocks))
+
+        report = ExportCollection(
+            vector_store,
+            snapshot_file,
+            "all-MiniLM-L6-v2",
+            "onnx-int8",
+            384,
+            collection_name="docs",
+        ).execute("docs.snapshot", batch_size=2)
+
+        assert report.vectors == 3
+        vector_store.scroll_vectors.assert_called_once_with("docs", batch_size=2)
+        path, header, _ = snapshot_file.write.call_args.args
+        assert path == "docs.snapshot"
+        assert (
+            header.embedding_model,
+            header.embedding_backend,
+            header.embedding_dim,
+            header.collection,
+        ) == ("all-MiniLM-L6-v2", "onnx-int8", 384, "docs")
+
+    def test_invalid_batch_size_is_rejected(self):
+        with pytest.raises(ValueError):
+            ExportCollection(Mock(), Mock(), "all-MiniLM-L6-v2", "torch", 384).execute(
+                "x", batch_size=0
+            )
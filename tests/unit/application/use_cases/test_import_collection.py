@@ -0,0 +1,87 @@
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+import pytest
+
+from memorag.application.use_cases.import_collection import ImportCollection
+from memorag.domain.entities import SnapshotHeader
+
+
+class TestImportCollection:
+    @pytest.fixture
+    def blocks(self, make_vector):
+        return [[make_vector() for _ in range(5)], [make_vector()]]
+
+    @pytest.fixture
+    def snapshot_file(self, blocks):
+        snapshot_file = Mock()
+        snapshot_file.read_header.return_value = SnapshotHeader(
+            embedding_model="all-MiniLM-L6-v2",
+            embedding_backend="torch",
+            embedding_dim=384,
+            collection="infos",
+            created_at=datetime.now(tz=timezone.utc),
+        )
+        snapshot_file.read.return_value = iter(blocks)
+        return snapshot_file
+
+    def test_execute_upserts_every_vector_in_batches(self, snapshot_file, blocks):
+        vector_store, lexical_index, search_cache = Mock(), Mock(), Mock()
+
+        report = ImportCollection(
+            vector_store,
+            snapshot_file,
+            "all-MiniLM-L6-v2",
+            "torch",
+            384,
+            collection_name="docs",
+            search_cache=search_cache,
+            lexical_index=lexical_index,
+        ).execute("infos.snapshot", batch_size=2, writers=2)
+
+        assert report.vectors == 6
+        batches = [call.kwargs["vectors"] for call in vector_store.index_vectors.call_args_list]
+        assert sorted(map(len, batches)) == [1, 1, 2, 2]
+        assert {vector.id for batch in batches for vector in batch} == {
+            vector.id for block in blocks for vector in block
+        }
+        assert lexical_index.index.call_count == 4
+        search_cache.invalidate.assert_called_once_with("docs")
+
+    def test_snapshot_of_another_embedding_model_is_refused(self, snapshot_file):
+        vector_store = Mock()
+
+        with pytest.raises(ValueError, match="all-MiniLM-L6-v2"):
+            ImportCollection(
+                vector_store, snapshot_file, "bge-small-en-v1.5", "torch", 384
+            ).execute("infos.snapshot")
+
+        snapshot_file.read.assert_not_called()
+        vector_store.index_vectors.assert_not_called()
+
+    def test_snapshot_of_another_embedding_backend_is_refused(self, snapshot_file):
+        vector_store = Mock()
+
+        with pytest.raises(ValueError, match="onnx-int8"):
+            ImportCollection(
+                vector_store, snapshot_file, "all-MiniLM-L6-v2", "onnx-int8", 384
+            ).execute("infos.snapshot")
+
+        vector_store.index_vectors.assert_not_called()
+
+    def test_upsert_errors_are_raised(self, snapshot_file):
+        vector_store, search_cache = Mock(), Mock()
+        vector_store.index_vectors.side_effect = RuntimeError("unavailable")
+
+        with pytest.raises(RuntimeError, match="unavailable"):
+            ImportCollection(
+                vector_store,
+                snapshot_file,
+                "all-MiniLM-L6-v2",
+                "torch",
+                384,
+                search_cache=search_cache,
+            ).execute("infos.snapshot", writers=1)
+
+        # Batches upserted before the error may already be searched
+        search_cache.invalidate.assert_called_once_with("infos")
@@ -4,15 +4,17 @@ from unittest.mock import Mock
 import numpy as np
 import pytest
 
+from memorag.application.instrumentation import StageProfile
 from memorag.application.use_cases.index_document import IndexDocument
-from memorag.domain.entities import Document, DocumentChunk, DocumentType
+from memorag.domain.entities import Document, DocumentChunk, DocumentType, IndexedDocument
+from memorag.infrastructure.adapters import FixedSizeChunker
 
 
 class TestIndexDocument:
     @pytest.fixture
     def mock_embedder(self):
         embedder = Mock()
-        embedder.embed.return_value = np.array([0.1, 0.2, 0.3])
+        embedder.embed_batch.return_value = np.array([[0.1, 0.2, 0.3]])
         return embedder
 
     @pytest.fixture
@@ -46,7 +48,8 @@ class TestIndexDocument:
 
         # Verify interactions
         mock_chunker.chunk.assert_called_once_with(doc)
-        mock_embedder.embed.assert_called_once_with("chunk content")
+        mock_embedder.embed_batch.assert_called_once_with(["chunk content"])
+        mock_embedder.embed.assert_not_called()
 
         # Verify vector store call
         mock_vector_store.index_vectors.assert_called_once()
@@ -61,3 +64,323 @@ class TestIndexDocument:
         assert np.array_equal(vectors[0].vector, np.array([0.1, 0.2, 0.3]))
         assert vectors[0].metadata["page"] == "1"
         assert vectors[0].metadata["document_id"] == str(doc.id)
+        assert vectors[0].metadata["document_type"] == "text"
+
+    def test_execute_embeds_all_chunks_in_one_batch(
+        self, mock_embedder, mock_vector_store, mock_chunker
+    ):
+        use_case = IndexDocument(mock_embedder, mock_vector_store, mock_chunker)
+        doc = Document(
+            id=uuid.uuid4(), name="test_doc", content=b"content", type=DocumentType.TEXT
+        )
+
+        chunk2 = DocumentChunk(id=uuid.uuid4(), content=b"second")
+        chunk1 = DocumentChunk(id=uuid.uuid4(), content=b"first", next_chunk=chunk2)
+        chunked_doc = doc.model_copy()
+        chunked_doc._chunk = chunk1
+        mock_chunker.chunk.return_value = chunked_doc
+        mock_embedder.embed_batch.return_value = np.array([[1.0, 0.0], [0.0, 1.0]])
+
+        use_case.execute(doc)
+
+        mock_embedder.embed_batch.assert_called_once_with(["first", "second"])
+        vectors = mock_vector_store.index_vectors.call_args.kwargs["vectors"]
+        assert [v.id for v in vectors] == [chunk1.id, chunk2.id]
+        assert np.array_equal(vectors[1].vector, np.array([0.0, 1.0]))
+
+    def test_execute_skips_documents_without_chunks(
+        self, mock_embedder, mock_vector_store, mock_chunker
+    ):
+        use_case = IndexDocument(mock_embedder, mock_vector_store, mock_chunker)
+        doc = Document(id=uuid.uuid4(), name="empty", content=b"", type=DocumentType.TEXT)
+        mock_chunker.chunk.return_value = doc
+
+        use_case.execute(doc)
+
+        mock_embedder.embed_batch.assert_not_called()
+        mock_vector_store.index_vectors.assert_not_called()
+
+    def test_execute_records_chunk_embed_and_upsert_stages(
+        self, mock_embedder, mock_vector_store, mock_chunker
+    ):
+        profile = StageProfile()
+        use_case = IndexDocument(
+            mock_embedder, mock_vector_store, mock_chunker, instrumentation=profile
+        )
+        doc = Document(
+            id=uuid.uuid4(), name="test_doc", content=b"content", type=DocumentType.TEXT
+        )
+        chunked_doc = doc.model_copy()
+        chunked_doc._chunk = DocumentChunk(id=uuid.uuid4(), content=b"chunk")
+        mock_chunker.chunk.return_value = chunked_doc
+
+        use_case.execute(doc)
+
+        stages = {line.split()[0]: line.split()[4:] for line in profile.format().splitlines()[1:]}
+        assert stages == {"chunk": ["chunks=1"], "embed": ["texts=1"], "upsert": ["vectors=1"]}
+
+    def test_execute_invalidates_search_cache(
+        self, mock_embedder, mock_vector_store, mock_chunker
+    ):
+        search_cache = Mock()
+        use_case = IndexDocument(
+            mock_embedder, mock_vector_store, mock_chunker, search_cache=search_cache
+        )
+        doc = Document(
+            id=uuid.uuid4(), name="test_doc", content=b"content", type=DocumentType.TEXT
+        )
+        chunked_doc = doc.model_copy()
+        chunked_doc._chunk = DocumentChunk(id=uuid.uuid4(), content=b"chunk")
+        mock_chunker.chunk.return_value = chunked_doc
+
+        use_case.execute(doc)
+
+        search_cache.invalidate.assert_called_once_with("infos")
+
+    def test_execute_indexes_chunks_in_lexical_index(
+        self, mock_embedder, mock_vector_store, mock_chunker
+    ):
+        lexical_index = Mock()
+        use_case = IndexDocument(
+            mock_embedder, mock_vector_store, mock_chunker, lexical_index=lexical_index
+        )
+        doc = Document(
+            id=uuid.uuid4(), name="test_doc", content=b"content", type=DocumentType.TEXT
+        )
+        chunked_doc = doc.model_copy()
+        chunked_doc._chunk = DocumentChunk(id=uuid.uuid4(), content=b"chunk")
+        mock_chunker.chunk.return_value = chunked_doc
+
+        use_case.execute(doc)
+
+        vectors = mock_vector_store.index_vectors.call_args.kwargs["vectors"]
+        lexical_index.index.assert_called_once_with(vectors, collection_name="infos")
+
+    def test_execute_stream_upserts_fixed_size_batches(
+        self, mock_embedder, mock_vector_store, mock_chunker
+    ):
+        use_case = IndexDocument(mock_embedder, mock_vector_store, mock_chunker)
+        doc = Document(id=uuid.uuid4(), name="big_doc", content=b"content", type=DocumentType.TEXT)
+        chunks = [DocumentChunk(id=uuid.uuid4(), content=f"chunk {i}".encode()) for i in range(5)]
+        mock_chunker.iter_chunks.return_value = iter(chunks)
+        mock_embedder.embed_batch.side_effect = lambda texts: np.ones((len(texts), 3))
+
+        use_case.execute_stream(doc, batch_size=2, max_pending_batches=1)
+
+        mock_chunker.iter_chunks.assert_called_once_with(doc)
+        mock_chunker.chunk.assert_not_called()
+        batches = [
+            call.kwargs["vectors"] for call in mock_vector_store.index_vectors.call_args_list
+        ]
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert [v.id for batch in batches for v in batch] == [c.id for c in chunks]
+        assert all(v.metadata["document_name"] == "big_doc" for batch in batches for v in batch)
+
+    def test_execute_stream_propagates_embedding_errors(
+        self, mock_embedder, mock_vector_store, mock_chunker
+    ):
+        use_case = IndexDocument(mock_embedder, mock_vector_store, mock_chunker)
+        doc = Document(id=uuid.uuid4(), name="doc", content=b"content", type=DocumentType.TEXT)
+        mock_chunker.iter_chunks.return_value = iter(
+            [DocumentChunk(id=uuid.uuid4(), content=b"chunk")]
+        )
+        mock_embedder.embed_batch.side_effect = RuntimeError("model crashed")
+
+        with pytest.raises(RuntimeError, match="model crashed"):
+            use_case.execute_stream(doc)
+
+        mock_vector_store.index_vectors.assert_not_called()
+
+    def _chunked(self, doc, *contents):
+        chunked_doc = doc.model_copy()
+        chunk = None
+        for content in reversed(contents):
+            chunk = DocumentChunk(id=doc.chunk_id(content), content=content, next_chunk=chunk)
+        chunked_doc._chunk = chunk
+        return chunked_doc
+
+    def test_execute_incremental_requires_manifest(
+        self, mock_embedder, mock_vector_store, mock_chunker
+    ):
+        use_case = IndexDocument(mock_embedder, mock_vector_store, mock_chunker)
+
+        with pytest.raises(ValueError):
+            use_case.execute_incremental(Document.from_text("content"))
+
+    def test_execute_incremental_indexes_new_document(
+        self, mock_embedder, mock_vector_store, mock_chunker
+    ):
+        manifest = Mock()
+        manifest.get.return_value = None
+        use_case = IndexDocument(mock_embedder, mock_vector_store, mock_chunker, manifest)
+        doc = Document.from_text("a b")
+        mock_chunker.chunk.return_value = self._chunked(doc, b"a", b"b")
+        mock_embedder.embed_batch.side_effect = lambda texts: np.ones((len(texts), 3))
+
+        report = use_case.execute_incremental(doc)
+
+        assert (report.upserted, report.deleted, report.unchanged) == (2, 0, False)
+        mock_vector_store.delete_vectors.assert_not_called()
+        saved = manifest.save.call_args.args[0]
+        assert saved.fingerprint == doc.fingerprint
+        assert saved.chunk_ids == {doc.chunk_id(b"a"), doc.chunk_id(b"b")}
+
+    def test_execute_incremental_skips_unchanged_document(
+        self, mock_embedder, mock_vector_store, mock_chunker
+    ):
+        doc = Document.from_text("a b")
+        manifest = Mock()
+        manifest.get.return_value = IndexedDocument(
+            id=doc.id, fingerprint=doc.fingerprint, chunk_ids=set()
+        )
+        use_case = IndexDocument(mock_embedder, mock_vector_store, mock_chunker, manifest)
+
+        report = use_case.execute_incremental(doc)
+
+        assert report.unchanged
+        mock_chunker.chunk.assert_not_called()
+        mock_vector_store.index_vectors.assert_not_called()
+        manifest.save.assert_not_called()
+
+    def test_execute_incremental_upserts_delta(
+        self, mock_embedder, mock_vector_store, mock_chunker
+    ):
+        doc = Document.from_text("a c")
+        manifest = Mock()
+        manifest.get.return_value = IndexedDocument(
+            id=doc.id,
+            fingerprint="previous",
+            chunk_ids={doc.chunk_id(b"a"), doc.chunk_id(b"b")},
+        )
+        use_case = IndexDocument(mock_embedder, mock_vector_store, mock_chunker, manifest)
+        mock_chunker.chunk.return_value = self._chunked(doc, b"a", b"c")
+        mock_embedder.embed_batch.side_effect = lambda texts: np.ones((len(texts), 3))
+
+        report = use_case.execute_incremental(doc)
+
+        assert (report.upserted, report.deleted) == (1, 1)
+        mock_embedder.embed_batch.assert_called_once_with(["c"])
+        vectors = mock_vector_store.index_vectors.call_args.kwargs["vectors"]
+        assert [v.id for v in vectors] == [doc.chunk_id(b"c")]
+        mock_vector_store.delete_vectors.assert_called_once_with(
+            ids=[doc.chunk_id(b"b")], collection_name="infos"
+        )
+        assert manifest.save.call_args.args[0].chunk_ids == {
+            doc.chunk_id(b"a"),
+            doc.chunk_id(b"c"),
+        }
+
+    def test_execute_incremental_embeds_again_under_other_settings(
+        self, mock_embedder, mock_vector_store, mock_chunker
+    ):
+        doc = Document.from_text("a c")
+        manifest = Mock()
+        manifest.get.return_value = IndexedDocument(
+            id=doc.id,
+            fingerprint=doc.fingerprint,
+            chunk_ids={doc.chunk_id(b"a"), doc.chunk_id(b"b")},
+            settings="chunk_size=100",
+        )
+        use_case = IndexDocument(
+            mock_embedder, mock_vector_store, mock_chunker, manifest, settings="chunk_size=50"
+        )
+        mock_chunker.chunk.return_value = self._chunked(doc, b"a", b"c")
+        mock_embedder.embed_batch.side_effect = lambda texts: np.ones((len(texts), 3))
+
+        report = use_case.execute_incremental(doc)
+
+        assert (report.upserted, report.deleted, report.unchanged) == (2, 1, False)
+        mock_embedder.embed_batch.assert_called_once_with(["a", "c"])
+        assert manifest.save.call_args.args[0].settings == "chunk_size=50"
+
+    def test_execute_many_batches_chunks_across_documents(
+        self, mock_embedder, mock_vector_store, mock_chunker
+    ):
+        first, second = Document.from_text("first"), Document.from_text("second")
+        chunked = {
+            first.id: self._chunked(first, b"a", b"b", b"c"),
+            second.id: self._chunked(second, b"d", b"e"),
+        }
+        mock_chunker.chunk.side_effect = lambda document: chunked[document.id]
+        mock_embedder.embed_batch.side_effect = lambda texts: np.ones((len(texts), 3))
+        use_case = IndexDocument(mock_embedder, mock_vector_store, mock_chunker)
+        progress = []
+
+        report = use_case.execute_many(
+            [first, second], batch_size=2, workers=0, on_document=progress.append
+        )
+
+        assert (report.documents, report.chunks, report.failures) == (2, 5, [])
+        assert [c.args[0] for c in mock_embedder.embed_batch.call_args_list] == [
+            ["a", "b"],
+            ["c", "d"],
+            ["e"],
+        ]
+        upserted = [
+            v for c in mock_vector_store.index_vectors.call_args_list for v in c.kwargs["vectors"]
+        ]
+        assert sorted(v.metadata["document_id"] for v in upserted) == sorted(
+            [str(first.id)] * 3 + [str(second.id)] * 2
+        )
+        assert progress == [first, second]
+
+    def test_execute_many_reports_undecodable_documents(
+        self, mock_embedder, mock_vector_store, mock_chunker
+    ):
+        good = Document.from_text("good")
+        bad = Document(id=uuid.uuid4(), name="bad.txt", content=b"\xff", type=DocumentType.TEXT)
+        mock_chunker.chunk.side_effect = lambda document: self._chunked(document, document.content)
+        mock_embedder.embed_batch.side_effect = lambda texts: np.ones((len(texts), 3))
+        use_case = IndexDocument(mock_embedder, mock_vector_store, mock_chunker)
+
+        report = use_case.execute_many([bad, good], workers=0)
+
+        assert (report.documents, report.chunks) == (1, 1)
+        assert len(report.failures) == 1
+        assert report.failures[0].startswith("bad.txt: ")
+        mock_embedder.embed_batch.assert_called_once_with(["good"])
+
+    def test_execute_many_chunks_in_worker_processes(
+        self, mock_embedder, mock_vector_store, tmp_path
+    ):
+        paths = []
+        for index in range(3):
+            path = tmp_path / f"doc{index}.txt"
+            path.write_text(f"document number {index}")
+            paths.append(str(path))
+        documents = [Document.from_filepath(p, DocumentType.TEXT, lazy=True) for p in paths]
+        mock_embedder.embed_batch.side_effect = lambda texts: np.ones((len(texts), 3))
+        use_case = IndexDocument(
+            mock_embedder, mock_vector_store, FixedSizeChunker(chunk_size=100, chunk_overlap=0)
+        )
+
+        report = use_case.execute_many(documents, batch_size=64, workers=2)
+
+        assert (report.documents, report.chunks) == (3, 3)
+        mock_embedder.embed_batch.assert_called_once_with(
+            ["document number 0", "document number 1", "document number 2"]
+        )
+        mock_vector_store.index_vectors.assert_called_once()
+
+    def test_execute_many_rejects_invalid_parameters(
+        self, mock_embedder, mock_vector_store, mock_chunker
+    ):
+        use_case = IndexDocument(mock_embedder, mock_vector_store, mock_chunker)
+
+        with pytest.raises(ValueError):
+            use_case.execute_many([], batch_size=0)
+        with pytest.raises(ValueError):
+            use_case.execute_many([], writers=0)
+
+    def test_execute_indexes_into_selected_collection(
+        self, mock_embedder, mock_vector_store, mock_chunker
+    ):
+        doc = Document.from_text("a")
+        mock_chunker.chunk.return_value = self._chunked(doc, b"a")
+        use_case = IndexDocument(
+            mock_embedder, mock_vector_store, mock_chunker, collection_name="team-a"
+        )
+
+        use_case.execute(doc)
+
+        assert mock_vector_store.index_vectors.call_args.kwargs["collection_name"] == "team-a"
@@ -5,8 +5,11 @@ from unittest.mock import Mock
 import numpy as np
 import pytest
 
+from memorag.application.context import ContextBuilder
+from memorag.application.instrumentation import StageProfile
 from memorag.application.use_cases.search_documents import SearchDocuments
-from memorag.domain.entities import Vector
+from memorag.domain.entities import CachedSearch, DocumentType, SearchFilter, Vector
+from memorag.infrastructure.adapters.sqlite_search_cache import SqliteSearchCache
 
 
 class TestSearchDocuments:
@@ -64,10 +67,17 @@ class TestSearchDocuments:
         mock_deps["embedder"].embed.assert_called_once_with(query)
 
         mock_deps["vector_store"].search_similar.assert_called_once_with(
-            query_vector=query_embedding, top_k=5, collection_name="infos"
+            query_vector=query_embedding,
+            top_k=5,
+            collection_name="infos",
+            score_threshold=None,
+            filters=None,
+            with_vectors=False,
         )
 
-        mock_deps["reranker"].rerank.assert_called_once_with(query=query, vectors=initial_vectors)
+        mock_deps["reranker"].rerank.assert_called_once_with(
+            query=query, vectors=initial_vectors, top_n=None, min_score=None
+        )
 
         # Verify context construction passed to generator
         mock_deps["generator"].generate.assert_called_once()
@@ -79,3 +89,317 @@ class TestSearchDocuments:
         generated_content = "".join(list(response.answer))
         assert generated_content == expected_answer
         assert response.sources == reranked_vectors
+
+    def test_execute_builds_context_without_duplicates(self, mock_deps):
+        tokenizer = Mock(max_input_tokens=None)
+        tokenizer.count.side_effect = lambda text: len(text.split())
+        profile = StageProfile()
+        use_case = SearchDocuments(
+            **mock_deps,
+            instrumentation=profile,
+            context_builder=ContextBuilder(tokenizer, max_tokens=100),
+        )
+        mock_deps["embedder"].embed.return_value = np.array([0.1, 0.2])
+        vectors = [
+            Vector(
+                id=uuid.uuid4(),
+                vector=np.array([1.0, 0.0]),
+                content=content,
+                inserted_at=datetime.now(),
+            )
+            for content in (b"first chunk", b"first chunk", b"second chunk")
+        ]
+        mock_deps["vector_store"].search_similar.return_value = vectors
+        mock_deps["reranker"].rerank.return_value = vectors
+        mock_deps["generator"].generate.return_value = iter(["answer"])
+        mock_deps["generator"].count_tokens.return_value = None
+
+        response = use_case.execute("query")
+
+        assert mock_deps["vector_store"].search_similar.call_args.kwargs["with_vectors"] is True
+        # The third chunk has the same embedding as the first one
+        assert mock_deps["generator"].generate.call_args.kwargs["context"] == "first chunk"
+        assert response.sources == [vectors[0]]
+        assert "build_context" in profile.format()
+        assert "tokens_saved=4 duplicates=2" in profile.format()
+
+    def test_raw_searches_do_not_retrieve_embeddings(self, mock_deps):
+        use_case = SearchDocuments(
+            **mock_deps, context_builder=ContextBuilder(Mock(), dedup_threshold=0.95)
+        )
+        mock_deps["embedder"].embed_batch.return_value = np.array([[0.1, 0.2]])
+        mock_deps["vector_store"].search_similar.return_value = []
+        mock_deps["vector_store"].search_similar_batch.return_value = [[]]
+
+        use_case.execute("query", raw=True)
+        use_case.execute_many(["query"], raw=True)
+
+        assert mock_deps["vector_store"].search_similar.call_args.kwargs["with_vectors"] is False
+        batch_kwargs = mock_deps["vector_store"].search_similar_batch.call_args.kwargs
+        assert batch_kwargs["with_vectors"] is False
+
+    def test_execute_pushes_down_score_filters(self, mock_deps):
+        use_case = SearchDocuments(**mock_deps)
+        mock_deps["embedder"].embed.return_value = np.array([0.1, 0.2])
+        candidate = Vector(
+            id=uuid.uuid4(),
+            content=b"doc",
+            inserted_at=datetime.now(),
+            score=0.8,
+        )
+        mock_deps["vector_store"].search_similar.return_value = [candidate]
+        mock_deps["reranker"].rerank.return_value = [
+            candidate.model_copy(update={"rerank_score": 4.2})
+        ]
+
+        response = use_case.execute(
+            "query", top_k=10, raw=True, top_n=3, min_score=0.5, score_threshold=0.3
+        )
+
+        assert mock_deps["vector_store"].search_similar.call_args.kwargs["score_threshold"] == 0.3
+        mock_deps["reranker"].rerank.assert_called_once_with(
+            query="query", vectors=[candidate], top_n=3, min_score=0.5
+        )
+        assert response.sources[0].score == 0.8
+        assert response.sources[0].rerank_score == 4.2
+
+    def test_execute_searches_filtered_slice_of_collection(self, mock_deps):
+        lexical_index = Mock()
+        lexical_index.search.return_value = []
+        search_cache = Mock()
+        search_cache.get.return_value = None
+        use_case = SearchDocuments(
+            **mock_deps,
+            lexical_index=lexical_index,
+            search_cache=search_cache,
+            collection_name="team-a",
+        )
+        mock_deps["embedder"].embed.return_value = np.array([0.1, 0.2])
+        mock_deps["vector_store"].search_similar.return_value = []
+        filters = SearchFilter(document_type=DocumentType.MARKDOWN)
+
+        use_case.execute("query", raw=True, filters=filters)
+        use_case.execute("query", raw=True, collection_name="team-b")
+
+        first, second = mock_deps["vector_store"].search_similar.call_args_list
+        assert (first.kwargs["collection_name"], first.kwargs["filters"]) == ("team-a", filters)
+        assert (second.kwargs["collection_name"], second.kwargs["filters"]) == ("team-b", None)
+        assert lexical_index.search.call_args_list[0].kwargs["filters"] == filters
+        (_, _, filtered_parameters, _), (_, _, parameters, _) = (
+            c.args for c in search_cache.get.call_args_list
+        )
+        assert filtered_parameters != parameters
+
+    def test_answers_are_cached_per_configuration(self, mock_deps, tmp_path):
+        search_cache = SqliteSearchCache(str(tmp_path / "cache.sqlite"))
+        mock_deps["embedder"].embed.return_value = np.array([0.1, 0.2])
+        mock_deps["vector_store"].search_similar.return_value = []
+
+        def search(settings):
+            use_case = SearchDocuments(**mock_deps, search_cache=search_cache, settings=settings)
+            list(use_case.execute("query", raw=True).answer)
+
+        search('{"llm_model": "gpt-4o"}')
+        search('{"llm_model": "gpt-4o-mini"}')
+        search('{"llm_model": "gpt-4o"}')
+
+        # The second configuration misses the cache, the first one then hits it
+        assert mock_deps["vector_store"].search_similar.call_count == 2
+
+    def test_answers_are_cached_per_context_budget(self, mock_deps, tmp_path):
+        search_cache = SqliteSearchCache(str(tmp_path / "cache.sqlite"))
+        mock_deps["embedder"].embed.return_value = np.array([0.1, 0.2])
+        mock_deps["vector_store"].search_similar.return_value = []
+        tokenizer = Mock(max_input_tokens=None)
+
+        for max_tokens in (1000, 4000, 1000):
+            use_case = SearchDocuments(
+                **mock_deps,
+                search_cache=search_cache,
+                context_builder=ContextBuilder(tokenizer, max_tokens=max_tokens),
+            )
+            list(use_case.execute("query", raw=True).answer)
+
+        assert mock_deps["vector_store"].search_similar.call_count == 2
+
+    def test_execute_skips_reranking_without_candidates(self, mock_deps):
+        use_case = SearchDocuments(**mock_deps)
+        mock_deps["embedder"].embed.return_value = np.array([0.1, 0.2])
+        mock_deps["vector_store"].search_similar.return_value = []
+
+        response = use_case.execute("query", raw=True, score_threshold=0.9)
+
+        mock_deps["reranker"].rerank.assert_not_called()
+        assert response.sources == []
+
+    def test_execute_records_each_stage(self, mock_deps):
+        profile = StageProfile()
+        use_case = SearchDocuments(**mock_deps, instrumentation=profile)
+        candidate = Vector(id=uuid.uuid4(), content=b"doc", inserted_at=datetime.now())
+        mock_deps["embedder"].embed.return_value = np.array([0.1, 0.2])
+        mock_deps["vector_store"].search_similar.return_value = [candidate]
+        mock_deps["reranker"].rerank.return_value = [candidate]
+        mock_deps["generator"].count_tokens.return_value = 42
+        mock_deps["generator"].generate.return_value = iter(["a", "b"])
+
+        response = use_case.execute("query")
+        list(response.answer)
+
+        stages = {line.split()[0]: line.split()[4:] for line in profile.format().splitlines()[1:]}
+        assert stages == {
+            "embed": ["texts=1"],
+            "retrieve": ["top_k=20", "candidates=1"],
+            "rerank": ["candidates=1", "kept=1"],
+            "count_tokens": ["prompt_tokens=42"],
+            "generate.first_token": [],
+            "generate": ["items=2"],
+        }
+
+    def test_execute_replays_cached_search(self, mock_deps):
+        source = Vector(id=uuid.uuid4(), content=b"doc", inserted_at=datetime.now())
+        search_cache = Mock()
+        search_cache.get.return_value = CachedSearch(answer=["a", "b"], sources=[source])
+        use_case = SearchDocuments(**mock_deps, search_cache=search_cache)
+
+        response = use_case.execute("query")
+
+        assert list(response.answer) == ["a", "b"]
+        assert response.sources == [source]
+        mock_deps["vector_store"].search_similar.assert_not_called()
+        mock_deps["generator"].generate.assert_not_called()
+
+    def test_execute_caches_answer_once_fully_generated(self, mock_deps):
+        source = Vector(id=uuid.uuid4(), content=b"doc", inserted_at=datetime.now())
+        search_cache = Mock()
+        search_cache.get.return_value = None
+        use_case = SearchDocuments(**mock_deps, search_cache=search_cache)
+        mock_deps["embedder"].embed.return_value = np.array([0.1, 0.2])
+        mock_deps["vector_store"].search_similar.return_value = [source]
+        mock_deps["reranker"].rerank.return_value = [source]
+        mock_deps["generator"].generate.return_value = iter(["a", "b"])
+
+        answer = use_case.execute("query").answer
+        next(answer)
+        search_cache.save.assert_not_called()
+        list(answer)
+
+        search_cache.save.assert_called_once()
+        query, _, _, collection_name, result = search_cache.save.call_args.args
+        assert (query, collection_name) == ("query", "infos")
+        assert result == CachedSearch(answer=["a", "b"], sources=[source])
+
+    def test_execute_fuses_dense_and_lexical_candidates(self, mock_deps):
+        shared = Vector(id=uuid.uuid4(), content=b"a", inserted_at=datetime.now(), score=0.5)
+        dense_only = Vector(id=uuid.uuid4(), content=b"b", inserted_at=datetime.now(), score=0.6)
+        lexical_only = Vector(id=uuid.uuid4(), content=b"c", inserted_at=datetime.now(), score=9)
+        lexical_index = Mock()
+        lexical_index.search.return_value = [lexical_only, shared]
+        use_case = SearchDocuments(**mock_deps, lexical_index=lexical_index)
+        mock_deps["vector_store"].search_similar.return_value = [dense_only, shared]
+        mock_deps["reranker"].rerank.side_effect = lambda query, vectors, **kwargs: vectors
+
+        response = use_case.execute("query", top_k=2, raw=True)
+
+        lexical_index.search.assert_called_once_with(
+            "query", top_k=2, collection_name="infos", filters=None
+        )
+        assert [v.id for v in response.sources] == [shared.id, dense_only.id]
+        assert response.sources[0].score == 0.5
+
+
+class TestSearchDocumentsMany:
+    @pytest.fixture
+    def mock_deps(self):
+        return {
+            "embedder": Mock(),
+            "vector_store": Mock(),
+            "reranker": Mock(),
+            "generator": Mock(),
+        }
+
+    @pytest.fixture
+    def candidates(self):
+        return [
+            [Vector(id=uuid.uuid4(), content=content, inserted_at=datetime.now())]
+            for content in (b"first doc", b"second doc")
+        ]
+
+    def test_execute_many_batches_every_stage(self, mock_deps, candidates):
+        use_case = SearchDocuments(**mock_deps)
+        embeddings = np.array([[0.1, 0.2], [0.3, 0.4]])
+        mock_deps["embedder"].embed_batch.return_value = embeddings
+        mock_deps["vector_store"].search_similar_batch.return_value = candidates
+        mock_deps["reranker"].rerank_many.return_value = candidates
+        mock_deps["generator"].generate.side_effect = lambda context, query: iter(
+            [f"{query}: ", context]
+        )
+
+        responses = use_case.execute_many(["q1", "q2"], top_k=5, top_n=3)
+
+        assert ["".join(response.answer) for response in responses] == [
+            "q1: first doc",
+            "q2: second doc",
+        ]
+        assert [response.sources for response in responses] == candidates
+        mock_deps["embedder"].embed_batch.assert_called_once_with(["q1", "q2"])
+        mock_deps["embedder"].embed.assert_not_called()
+        search_kwargs = mock_deps["vector_store"].search_similar_batch.call_args.kwargs
+        assert np.array_equal(search_kwargs["query_vectors"], embeddings)
+        assert search_kwargs["top_k"] == 5
+        mock_deps["reranker"].rerank_many.assert_called_once_with(
+            queries=["q1", "q2"], vectors=candidates, top_n=3, min_score=None
+        )
+
+    def test_execute_many_reports_generation_errors_per_answer(self, mock_deps, candidates):
+        use_case = SearchDocuments(**mock_deps)
+        mock_deps["embedder"].embed_batch.return_value = np.array([[0.1, 0.2], [0.3, 0.4]])
+        mock_deps["vector_store"].search_similar_batch.return_value = candidates
+        mock_deps["reranker"].rerank_many.return_value = candidates
+
+        def generate(context, query):
+            if query == "q1":
+                raise RuntimeError("rate limited")
+            yield "answer"
+
+        mock_deps["generator"].generate.side_effect = generate
+
+        first, second = use_case.execute_many(["q1", "q2"], concurrency=2)
+
+        with pytest.raises(RuntimeError, match="rate limited"):
+            list(first.answer)
+        assert list(second.answer) == ["answer"]
+
+    def test_execute_many_replays_cached_searches(self, mock_deps, candidates):
+        source = Vector(id=uuid.uuid4(), content=b"cached", inserted_at=datetime.now())
+        search_cache = Mock()
+        search_cache.get.side_effect = lambda query, *args: (
+            CachedSearch(answer=["cached answer"], sources=[source]) if query == "q1" else None
+        )
+        use_case = SearchDocuments(**mock_deps, search_cache=search_cache)
+        mock_deps["embedder"].embed_batch.return_value = np.array([[0.1, 0.2], [0.3, 0.4]])
+        mock_deps["vector_store"].search_similar_batch.return_value = candidates[1:]
+        mock_deps["reranker"].rerank_many.return_value = candidates[1:]
+
+        first, second = use_case.execute_many(["q1", "q2"], raw=True)
+
+        assert list(first.answer) == ["cached answer"]
+        assert list(second.answer) == ["second doc"]
+        query_vectors = mock_deps["vector_store"].search_similar_batch.call_args.kwargs[
+            "query_vectors"
+        ]
+        assert np.array_equal(query_vectors, [[0.3, 0.4]])
+        search_cache.save.assert_called_once()
+
+    def test_execute_many_skips_reranking_without_candidates(self, mock_deps):
+        use_case = SearchDocuments(**mock_deps)
+        mock_deps["embedder"].embed_batch.return_value = np.array([[0.1, 0.2]])
+        mock_deps["vector_store"].search_similar_batch.return_value = [[]]
+
+        [response] = use_case.execute_many(["q1"], raw=True)
+
+        mock_deps["reranker"].rerank_many.assert_not_called()
+        assert response.sources == []
+
+    def test_execute_many_without_queries(self, mock_deps):
+        assert SearchDocuments(**mock_deps).execute_many([]) == []
+        mock_deps["embedder"].embed_batch.assert_not_called()
@@ -1,7 +1,7 @@
 import uuid
 
 from memorag.domain.entities.document import Document, DocumentType
-from memorag.domain.entities.document_chunk import DocumentChunk
+from memorag.domain.entities.document_chunk import ChunkSpan, DocumentChunk
 
 
 class TestDocument:
@@ -38,3 +38,84 @@ class TestDocument:
 
         chunks = list(doc.chunks)
         assert len(chunks) == 0
+
+    def test_document_iter_content_in_memory(self):
+        doc = Document.from_text("abcdefg")
+
+        assert list(doc.iter_content(block_size=3)) == [b"abc", b"def", b"g"]
+        assert not doc.is_lazy
+
+    def test_document_from_filepath_lazy(self, tmp_path):
+        filepath = tmp_path / "big.log"
+        filepath.write_bytes(b"0123456789")
+
+        doc = Document.from_filepath(str(filepath), DocumentType.TEXT, lazy=True)
+
+        assert doc.is_lazy
+        assert doc.content == b""
+        assert doc.name == "big.log"
+        assert list(doc.iter_content(block_size=4)) == [b"0123", b"4567", b"89"]
+
+    def test_document_chunks_from_spans(self):
+        doc = Document(id=uuid.uuid4(), name="test", content=b"abcdef", type=DocumentType.TEXT)
+        first, second = uuid.uuid4(), uuid.uuid4()
+        doc.set_chunk_spans(
+            [
+                ChunkSpan(id=first, start=0, end=4, metadata={"chunk_index": "0"}),
+                ChunkSpan(id=second, start=2, end=6),
+            ]
+        )
+
+        chunks = list(doc.chunks)
+
+        assert [chunk.id for chunk in chunks] == [first, second]
+        assert [chunk.content for chunk in chunks] == [b"abcd", b"cdef"]
+        assert chunks[0].metadata == {"chunk_index": "0"}
+        assert (chunks[1].start, chunks[1].end) == (2, 6)
+
+    def test_document_chunks_long_chain_without_copy(self):
+        chunk = None
+        for _ in range(5000):
+            chunk = DocumentChunk(id=uuid.uuid4(), content=b"x", next_chunk=chunk)
+        doc = Document(id=uuid.uuid4(), name="test", content=b"x", type=DocumentType.TEXT)
+        doc._chunk = chunk
+
+        chunks = list(doc.chunks)
+
+        assert len(chunks) == 5000
+        assert chunks[0] is chunk
+
+    def test_document_ids_are_deterministic(self, tmp_path):
+        filepath = tmp_path / "adr.md"
+        filepath.write_bytes(b"v1")
+        first = Document.from_filepath(str(filepath), DocumentType.MARKDOWN)
+        filepath.write_bytes(b"v2")
+        second = Document.from_filepath(str(filepath), DocumentType.MARKDOWN, lazy=True)
+
+        assert first.id == second.id
+        assert first.fingerprint != second.fingerprint
+        assert Document.from_text("same").id == Document.from_text("same").id
+        assert Document.from_text("same").id != Document.from_text("other").id
+
+    def test_document_fingerprint_is_content_hash(self, tmp_path):
+        filepath = tmp_path / "doc.txt"
+        filepath.write_bytes(b"hello")
+
+        lazy = Document.from_filepath(str(filepath), DocumentType.TEXT, lazy=True)
+
+        assert lazy.fingerprint == Document.from_text("hello").fingerprint
+
+    def test_document_chunk_id_depends_on_document_and_content(self):
+        doc = Document.from_text("a")
+        other = Document.from_text("b")
+
+        assert doc.chunk_id(b"chunk") == doc.chunk_id(memoryview(b"chunk"))
+        assert doc.chunk_id(b"chunk") != doc.chunk_id(b"other chunk")
+        assert doc.chunk_id(b"chunk") != other.chunk_id(b"chunk")
+
+    def test_document_type_from_filepath_uses_extension(self):
+        assert DocumentType.from_filepath("docs/adr/0001.md") == DocumentType.MARKDOWN
+        assert DocumentType.from_filepath("NOTES.TXT") == DocumentType.TEXT
+        assert DocumentType.from_filepath("spec.pdf") == DocumentType.PDF
+        assert DocumentType.from_filepath("report.docx") == DocumentType.WORD
+        assert DocumentType.from_filepath("Makefile") == DocumentType.OTHER
@@ -0,0 +1,19 @@
+from datetime import datetime, timedelta, timezone
+
+from memorag.domain.entities import DocumentType, SearchFilter
+
+
+class TestSearchFilter:
+    def test_empty_filter(self):
+        assert SearchFilter().is_empty
+        assert not SearchFilter(document_type=DocumentType.TEXT).is_empty
+
+    def test_dates_without_timezone_are_utc(self):
+        filters = SearchFilter(
+            inserted_after=datetime(2026, 1, 1),
+            inserted_before=datetime(2026, 1, 2, tzinfo=timezone(timedelta(hours=2))),
+        )
+
+        assert filters.inserted_after == datetime(2026, 1, 1, tzinfo=timezone.utc)
+        assert filters.inserted_before is not None
+        assert filters.inserted_before.utcoffset() == timedelta(hours=2)
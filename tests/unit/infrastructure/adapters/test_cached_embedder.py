@@ -0,0 +1,78 @@
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from memorag.infrastructure.adapters.cached_embedder import CachedEmbedder
+
+
+class TestCachedEmbedder:
+    @pytest.fixture
+    def inner_embedder(self):
+        embedder = Mock()
+        embedder.get_embedding_dimension.return_value = 2
+        embedder.embed_batch.side_effect = lambda texts: np.array(
+            [[float(len(text)), 1.0] for text in texts]
+        )
+        return embedder
+
+    def test_embeds_missing_texts_only_once(self, inner_embedder, tmp_path):
+        embedder = CachedEmbedder(inner_embedder, "model", str(tmp_path))
+
+        first = embedder.embed_batch(["a", "bb"])
+        second = embedder.embed_batch(["bb", "ccc", "a"])
+
+        assert np.array_equal(first, [[1.0, 1.0], [2.0, 1.0]])
+        assert np.array_equal(second, [[2.0, 1.0], [3.0, 1.0], [1.0, 1.0]])
+        assert [call.args[0] for call in inner_embedder.embed_batch.call_args_list] == [
+            ["a", "bb"],
+            ["ccc"],
+        ]
+
+    def test_deduplicates_texts_within_a_batch(self, inner_embedder, tmp_path):
+        embedder = CachedEmbedder(inner_embedder, "model", str(tmp_path))
+
+        result = embedder.embed_batch(["same", "same"])
+
+        inner_embedder.embed_batch.assert_called_once_with(["same"])
+        assert np.array_equal(result[0], result[1])
+
+    def test_embed_uses_cache(self, inner_embedder, tmp_path):
+        embedder = CachedEmbedder(inner_embedder, "model", str(tmp_path))
+
+        embedder.embed("query")
+        result = embedder.embed("query")
+
+        assert np.array_equal(result, [5.0, 1.0])
+        inner_embedder.embed_batch.assert_called_once()
+
+    def test_cache_persists_across_instances(self, inner_embedder, tmp_path):
+        CachedEmbedder(inner_embedder, "model", str(tmp_path)).embed_batch(["a", "bb"])
+        inner_embedder.embed_batch.reset_mock()
+
+        result = CachedEmbedder(inner_embedder, "model", str(tmp_path)).embed_batch(["bb"])
+
+        assert np.array_equal(result, [[2.0, 1.0]])
+        inner_embedder.embed_batch.assert_not_called()
+
+    def test_cache_is_scoped_by_model_name(self, inner_embedder, tmp_path):
+        CachedEmbedder(inner_embedder, "model-a", str(tmp_path)).embed("text")
+
+        CachedEmbedder(inner_embedder, "model-b", str(tmp_path)).embed("text")
+
+        assert inner_embedder.embed_batch.call_count == 2
+
+    def test_evicts_least_recently_used_entries(self, inner_embedder, tmp_path):
+        # Two float32 values per row, so 16 bytes hold two entries
+        embedder = CachedEmbedder(inner_embedder, "model", str(tmp_path), max_size_bytes=16)
+
+        embedder.embed_batch(["a", "bb"])
+        embedder.embed("a")
+        embedder.embed("ccc")
+        inner_embedder.embed_batch.reset_mock()
+
+        assert np.array_equal(embedder.embed_batch(["a", "ccc"]), [[1.0, 1.0], [3.0, 1.0]])
+        inner_embedder.embed_batch.assert_not_called()
+        embedder.embed("bb")
+        inner_embedder.embed_batch.assert_called_once_with(["bb"])
+        assert (tmp_path / next(tmp_path.iterdir()).name / "vectors.f32").stat().st_size == 16
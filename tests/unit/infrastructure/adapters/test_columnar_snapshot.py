@@ -0,0 +1,87 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from memorag.domain.entities import SnapshotHeader
+from memorag.infrastructure.adapters.columnar_snapshot import ColumnarSnapshotFile
+
+
+class TestColumnarSnapshotFile:
+    @pytest.fixture
+    def header(self):
+        return SnapshotHeader(
+            embedding_model="all-MiniLM-L6-v2",
+            embedding_backend="torch",
+            embedding_dim=3,
+            collection="infos",
+            created_at=datetime.now(tz=timezone.utc),
+        )
+
+    @pytest.fixture
+    def batches(self, make_vector):
+        return [
+            [
+                make_vector(embedding=[0.1, 0.2, 0.3], content="décision"),
+                make_vector(embedding=[1.0, 0.0, 0.0]),
+            ],
+            [],
+            [make_vector(embedding=[0.0, 0.5, 0.5], content=b"last")],
+        ]
+
+    def test_round_trip_keeps_vectors_and_payloads(self, tmp_path, header, batches):
+        path = str(tmp_path / "infos.snapshot")
+        snapshot_file = ColumnarSnapshotFile()
+
+        assert snapshot_file.write(path, header, batches) == 3
+
+        assert snapshot_file.read_header(path) == header
+        read = list(snapshot_file.read(path))
+        assert [len(block) for block in read] == [2, 1]
+        for written, loaded in zip(batches[0] + batches[2], read[0] + read[1], strict=True):
+            assert loaded.id == written.id
+            assert loaded.content == written.content
+            assert loaded.inserted_at == written.inserted_at
+            assert loaded.metadata == written.metadata
+            np.testing.assert_array_equal(loaded.vector, written.vector)
+
+    def test_float16_halves_the_vectors(self, tmp_path, header, make_vector):
+        batches = [
+            [make_vector(embedding=np.random.default_rng(0).random(3)) for _ in range(1000)]
+        ]
+        single, half = str(tmp_path / "single"), str(tmp_path / "half")
+        ColumnarSnapshotFile("float32").write(single, header, batches)
+        ColumnarSnapshotFile("float16").write(half, header, batches)
+
+        [loaded] = list(ColumnarSnapshotFile().read(half))
+
+        assert (tmp_path / "half").stat().st_size < (tmp_path / "single").stat().st_size
+        assert loaded[0].vector.dtype == np.float32
+        np.testing.assert_allclose(loaded[0].vector, batches[0][0].vector, atol=1e-3)
+
+    def test_truncated_file_is_rejected(self, tmp_path, header, batches):
+        path = tmp_path / "infos.snapshot"
+        ColumnarSnapshotFile().write(str(path), header, batches)
+        path.write_bytes(path.read_bytes()[:-10])
+
+        with pytest.raises(ValueError, match="truncated"):
+            list(ColumnarSnapshotFile().read(str(path)))
+
+    def test_other_files_are_rejected(self, tmp_path):
+        path = tmp_path / "notes.txt"
+        path.write_bytes(b"not a snapshot")
+
+        with pytest.raises(ValueError, match="Not a snapshot"):
+            ColumnarSnapshotFile().read_header(str(path))
+
+    def test_failed_write_leaves_no_file(self, tmp_path, header, make_vector):
+        path = tmp_path / "infos.snapshot"
+
+        with pytest.raises(ValueError, match="dimensions"):
+            ColumnarSnapshotFile().write(str(path), header, [[make_vector(embedding=[1.0, 0.0])]])
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_unknown_precision_is_rejected(self):
+        with pytest.raises(ValueError, match="precision"):
+            ColumnarSnapshotFile("int4")
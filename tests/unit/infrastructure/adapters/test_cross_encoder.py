@@ -0,0 +1,88 @@
+import uuid
+from datetime import datetime
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from memorag.domain.entities import Vector
+from memorag.infrastructure.adapters.cross_encoder import CrossEncoderReranker
+
+
+class TestCrossEncoderReranker:
+    @pytest.fixture
+    def reranker(self):
+        with patch("memorag.infrastructure.adapters.cross_encoder.CrossEncoder"):
+            reranker = CrossEncoderReranker("model")
+        reranker.model.predict.side_effect = lambda pairs, batch_size: np.array(
+            [float(len(content)) for _, content in pairs]
+        )
+        return reranker
+
+    @pytest.fixture
+    def vectors(self):
+        return [
+            Vector(id=uuid.uuid4(), content=content, inserted_at=datetime.now())
+            for content in (b"a", b"ccc", b"bb")
+        ]
+
+    def test_rerank_orders_and_scores(self, reranker, vectors):
+        ranked = reranker.rerank("query", vectors)
+
+        assert [v.content for v in ranked] == [b"ccc", b"bb", b"a"]
+        assert [v.rerank_score for v in ranked] == [3.0, 2.0, 1.0]
+        assert vectors[0].rerank_score is None
+
+    def test_rerank_applies_top_n_and_min_score(self, reranker, vectors):
+        assert [v.content for v in reranker.rerank("query", vectors, top_n=2)] == [b"ccc", b"bb"]
+        assert [v.content for v in reranker.rerank("query", vectors, min_score=2.0)] == [
+            b"ccc",
+            b"bb",
+        ]
+
+    def test_rerank_empty(self, reranker):
+        assert reranker.rerank("query", []) == []
+        reranker.model.predict.assert_not_called()
+
+    def test_rerank_reuses_cached_scores(self, reranker, vectors):
+        reranker.rerank("query", vectors[:2])
+        reranker.rerank("query", vectors)
+
+        assert [len(call.args[0]) for call in reranker.model.predict.call_args_list] == [2, 1]
+        assert reranker.model.predict.call_args.kwargs == {"batch_size": 32}
+
+    def test_rerank_many_scores_all_queries_in_one_batch(self, reranker, vectors):
+        ranked = reranker.rerank_many(["q1", "q2", "q3"], [vectors, vectors[:1], []], top_n=2)
+
+        assert [[v.content for v in query_ranked] for query_ranked in ranked] == [
+            [b"ccc", b"bb"],
+            [b"a"],
+            [],
+        ]
+        reranker.model.predict.assert_called_once()
+        assert len(reranker.model.predict.call_args.args[0]) == 4
+
+    def test_rerank_cache_is_bounded(self, vectors):
+        with patch("memorag.infrastructure.adapters.cross_encoder.CrossEncoder"):
+            reranker = CrossEncoderReranker("model", cache_size=1)
+        reranker.model.predict.side_effect = lambda pairs, batch_size: np.ones(len(pairs))
+
+        reranker.rerank("query", vectors)
+        reranker.rerank("query", vectors)
+
+        assert [len(call.args[0]) for call in reranker.model.predict.call_args_list] == [3, 2]
+
+    def test_onnx_int8_backend_loads_quantized_export(self):
+        with patch("memorag.infrastructure.adapters.cross_encoder.CrossEncoder") as cross_encoder:
+            CrossEncoderReranker("model", max_length=256, backend="onnx-int8")
+
+        cross_encoder.assert_called_once_with(
+            "model",
+            backend="onnx",
+            max_length=256,
+            model_kwargs={"file_name": "onnx/model_qint8_avx512_vnni.onnx"},
+        )
+
+    def test_unknown_backend_is_rejected(self):
+        with pytest.raises(ValueError, match="backend"):
+            CrossEncoderReranker("model", backend="tensorrt")
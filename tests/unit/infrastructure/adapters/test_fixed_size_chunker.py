@@ -0,0 +1,78 @@
+import uuid
+
+import pytest
+
+from memorag.domain.entities import Document, DocumentType
+from memorag.infrastructure.adapters.fixed_size_chunker import FixedSizeChunker
+
+
+def _document(content: bytes) -> Document:
+    return Document(id=uuid.uuid4(), name="doc", content=content, type=DocumentType.TEXT)
+
+
+class TestFixedSizeChunker:
+    def test_rejects_overlap_larger_than_chunk_size(self):
+        with pytest.raises(ValueError):
+            FixedSizeChunker(chunk_size=10, chunk_overlap=10)
+
+    def test_short_document_is_a_single_chunk(self):
+        chunker = FixedSizeChunker(chunk_size=100, chunk_overlap=10)
+
+        chunks = list(chunker.chunk(_document(b"hello world")).chunks)
+
+        assert len(chunks) == 1
+        assert chunks[0].content == b"hello world"
+        assert chunks[0].metadata == {"chunk_index": "0"}
+
+    def test_chunks_respect_size_and_cover_content(self):
+        content = " ".join(f"word{i}" for i in range(500)).encode()
+        chunker = FixedSizeChunker(chunk_size=100, chunk_overlap=20)
+
+        chunks = list(chunker.chunk(_document(content)).chunks)
+
+        assert all(len(chunk.content) <= 100 for chunk in chunks)
+        assert chunks[0].start == 0
+        assert chunks[-1].end == len(content)
+        for previous, current in zip(chunks, chunks[1:], strict=False):
+            assert current.start <= previous.end
+            assert current.start > previous.start
+            assert content[current.start : current.end] == current.content
+
+    def test_chunks_end_on_word_boundaries(self):
+        content = " ".join(f"word{i}" for i in range(100)).encode()
+        chunker = FixedSizeChunker(chunk_size=50, chunk_overlap=0)
+
+        chunks = list(chunker.chunk(_document(content)).chunks)
+
+        assert all(chunk.content.endswith(b" ") for chunk in chunks[:-1])
+        assert b"".join(chunk.content for chunk in chunks) == content
+
+    def test_never_splits_utf8_characters(self):
+        content = "é" * 300
+        chunker = FixedSizeChunker(chunk_size=51, chunk_overlap=11)
+
+        chunks = list(chunker.chunk(_document(content.encode())).chunks)
+
+        assert all(set(chunk.content.decode()) == {"é"} for chunk in chunks)
+
+    def test_chunk_shares_document_content(self):
+        document = _document(b"some content")
+
+        chunked = FixedSizeChunker().chunk(document)
+
+        assert chunked.content is document.content
+
+    def test_iter_chunks_matches_chunk(self, tmp_path):
+        content = "\n".join(f"line {i} with some text" for i in range(2000)).encode()
+        filepath = tmp_path / "big.txt"
+        filepath.write_bytes(content)
+        chunker = FixedSizeChunker(chunk_size=300, chunk_overlap=50)
+        lazy_document = Document.from_filepath(str(filepath), DocumentType.TEXT, lazy=True)
+
+        streamed = list(chunker.iter_chunks(lazy_document))
+        in_memory = list(chunker.chunk(_document(content)).chunks)
+
+        assert [(c.start, c.end, c.content) for c in streamed] == [
+            (c.start, c.end, c.content) for c in in_memory
+        ]
+        assert [c.metadata for c in streamed] == [c.metadata for c in in_memory]
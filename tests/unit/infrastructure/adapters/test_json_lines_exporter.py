@@ -0,0 +1,19 @@
+import json
+
+from memorag.application.instrumentation import StageRecord
+from memorag.infrastructure.adapters.json_lines_exporter import JsonLinesExporter
+
+
+class TestJsonLinesExporter:
+    def test_record_appends_one_line_per_record(self, tmp_path):
+        path = tmp_path / "trace.jsonl"
+        exporter = JsonLinesExporter(str(path))
+
+        exporter.record(StageRecord("embed", 0.0125, {"texts": 2}))
+        exporter.record(StageRecord("retrieve", 0.002, {}))
+        exporter.close()
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [line["stage"] for line in lines] == ["embed", "retrieve"]
+        assert lines[0]["duration_ms"] == 12.5
+        assert lines[0]["texts"] == 2
@@ -0,0 +1,31 @@
+from unittest.mock import Mock, patch
+
+from memorag.infrastructure.adapters.litellm_tokenizer import LiteLLMTokenizer
+
+
+class TestLiteLLMTokenizer:
+    # litellm is imported on first use, so the module is replaced rather than an attribute
+    @patch.dict("sys.modules", {"litellm": Mock()})
+    def test_count_uses_the_tokenizer_of_the_model(self):
+        import litellm as mock_litellm
+
+        mock_litellm.token_counter.return_value = 7
+
+        assert LiteLLMTokenizer("test-model").count("some text") == 7
+        mock_litellm.token_counter.assert_called_once_with(model="test-model", text="some text")
+
+    @patch.dict("sys.modules", {"litellm": Mock()})
+    def test_max_input_tokens_of_known_model(self):
+        import litellm as mock_litellm
+
+        mock_litellm.get_model_info.return_value = {"max_input_tokens": 8192}
+
+        assert LiteLLMTokenizer("test-model").max_input_tokens == 8192
+
+    @patch.dict("sys.modules", {"litellm": Mock()})
+    def test_max_input_tokens_of_unknown_model(self):
+        import litellm as mock_litellm
+
+        mock_litellm.get_model_info.side_effect = Exception("model not mapped")
+
+        assert LiteLLMTokenizer("test-model").max_input_tokens is None
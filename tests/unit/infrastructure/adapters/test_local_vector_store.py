@@ -0,0 +1,176 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from memorag.domain.entities import DocumentType, SearchFilter
+from memorag.infrastructure.adapters.local_vector_store import LocalVectorStore
+
+
+class TestLocalVectorStore:
+    @pytest.fixture(params=["float16", "int8"])
+    def store(self, request, tmp_path):
+        return LocalVectorStore(str(tmp_path), embedding_dim=3, quantization=request.param)
+
+    def test_search_returns_most_similar_first(self, store, make_vector):
+        close, far = (
+            make_vector(embedding=[1.0, 0.1, 0.0], content=b"close"),
+            make_vector(embedding=[0.0, 1.0, 0.0], content=b"far"),
+        )
+        store.index_vectors([far, close], "infos")
+
+        results = store.search_similar(np.array([1.0, 0.0, 0.0]), top_k=2, collection_name="infos")
+
+        assert [r.id for r in results] == [close.id, far.id]
+        assert results[0].content == b"close"
+        assert results[0].metadata == {"document_name": "adr.md"}
+        assert results[0].score == pytest.approx(0.995, abs=0.01)
+        assert results[0].vector is None
+
+    def test_search_honours_top_k_and_score_threshold(self, store, make_vector):
+        store.index_vectors(
+            [
+                make_vector(embedding=[1.0, 0.0, 0.0]),
+                make_vector(embedding=[0.9, 0.1, 0.0]),
+                make_vector(embedding=[0.0, 0.0, 1.0]),
+            ],
+            "infos",
+        )
+        query = np.array([1.0, 0.0, 0.0])
+
+        assert len(store.search_similar(query, top_k=1, collection_name="infos")) == 1
+        results = store.search_similar(
+            query, top_k=10, collection_name="infos", score_threshold=0.5
+        )
+        assert len(results) == 2
+
+    def test_search_batch_searches_each_query(self, store, make_vector):
+        first, second = (
+            make_vector(embedding=[1.0, 0.0, 0.0]),
+            make_vector(embedding=[0.0, 1.0, 0.0]),
+        )
+        store.index_vectors([first, second], "infos")
+
+        results = store.search_similar_batch(
+            np.array([[0.0, 1.0, 0.0], [1.0, 0.0, 0.0]]), top_k=1, collection_name="infos"
+        )
+
+        assert [[r.id for r in query_results] for query_results in results] == [
+            [second.id],
+            [first.id],
+        ]
+
+    def test_search_returns_vectors_when_requested(self, store, make_vector):
+        store.index_vectors([make_vector(embedding=[3.0, 4.0, 0.0])], "infos")
+
+        [result] = store.search_similar(
+            np.array([1.0, 0.0, 0.0]), top_k=1, collection_name="infos", with_vectors=True
+        )
+
+        assert result.vector == pytest.approx([0.6, 0.8, 0.0], abs=0.01)
+
+    def test_upsert_replaces_and_delete_removes(self, store, make_vector):
+        vector = make_vector(embedding=[1.0, 0.0, 0.0], content=b"old")
+        store.index_vectors([vector], "infos")
+        store.index_vectors([vector.model_copy(update={"content": b"new"})], "infos")
+
+        results = store.search_similar(np.array([1.0, 0.0, 0.0]), top_k=5, collection_name="infos")
+        assert [r.content for r in results] == [b"new"]
+
+        store.delete_vectors([vector.id], "infos")
+        assert store.search_similar(np.array([1.0, 0.0, 0.0]), 5, "infos") == []
+
+    def test_scroll_yields_every_vector_in_batches(self, store, make_vector):
+        vectors = [
+            make_vector(embedding=[1.0, 0.0, 0.0]),
+            make_vector(embedding=[0.0, 1.0, 0.0]),
+            make_vector(embedding=[0.0, 0.0, 1.0]),
+        ]
+        store.index_vectors(vectors, "infos")
+
+        batches = list(store.scroll_vectors("infos", batch_size=2))
+
+        assert [len(batch) for batch in batches] == [2, 1]
+        scrolled = [vector for batch in batches for vector in batch]
+        assert [vector.id for vector in scrolled] == [vector.id for vector in vectors]
+        assert scrolled[1].vector == pytest.approx([0.0, 1.0, 0.0], abs=0.01)
+        assert scrolled[1].metadata == {"document_name": "adr.md"}
+
+    def test_scroll_of_missing_collection_is_rejected(self, store):
+        with pytest.raises(ValueError):
+            list(store.scroll_vectors("missing"))
+
+    def test_collections_persist_across_instances(self, tmp_path, make_vector):
+        vector = make_vector(embedding=[0.0, 1.0, 0.0])
+        LocalVectorStore(str(tmp_path), embedding_dim=3).index_vectors([vector], "infos")
+
+        results = LocalVectorStore(str(tmp_path), embedding_dim=3).search_similar(
+            np.array([0.0, 1.0, 0.0]), top_k=1, collection_name="infos"
+        )
+
+        assert [r.id for r in results] == [vector.id]
+
+    def test_dimension_mismatch_is_rejected(self, tmp_path, make_vector):
+        LocalVectorStore(str(tmp_path), embedding_dim=3).index_vectors(
+            [make_vector(embedding=[0.0, 1.0, 0.0])], "infos"
+        )
+
+        with pytest.raises(ValueError, match="dimension"):
+            LocalVectorStore(str(tmp_path), embedding_dim=4).search_similar(
+                np.zeros(4), top_k=1, collection_name="infos"
+            )
+
+    def test_ivf_index_finds_nearest_neighbours(self, tmp_path, make_vector):
+        rng = np.random.default_rng(0)
+        centers = rng.normal(size=(8, 16))
+        embeddings = centers[rng.integers(0, 8, 400)] + 0.1 * rng.normal(size=(400, 16))
+        store = LocalVectorStore(str(tmp_path), embedding_dim=16, ivf_threshold=100, n_probe=4)
+        vectors = [make_vector(embedding=embedding) for embedding in embeddings]
+        store.index_vectors(vectors, "infos")
+
+        results = store.search_similar(embeddings[7], top_k=1, collection_name="infos")
+        store.index_vectors([make_vector(embedding=embeddings[3] * 2, content=b"added")], "infos")
+        added = store.search_similar(embeddings[3], top_k=2, collection_name="infos")
+
+        assert results[0].id == vectors[7].id
+        assert (tmp_path / "infos" / "centroids.npy").exists()
+        assert b"added" in {r.content for r in added}
+
+    def test_search_applies_filters(self, store, make_vector):
+        old = make_vector(embedding=[1.0, 0.0, 0.0], content=b"old")
+        old.inserted_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        old.metadata = {"document_name": "adr.md", "document_type": "markdown"}
+        notes = make_vector(embedding=[0.9, 0.1, 0.0], content=b"notes")
+        notes.metadata = {"document_name": "notes.txt", "document_type": "text"}
+        recent = make_vector(embedding=[0.8, 0.2, 0.0], content=b"recent")
+        recent.metadata = {"document_name": "adr.md", "document_type": "markdown"}
+        store.index_vectors([old, notes, recent], "infos")
+        query = np.array([1.0, 0.0, 0.0])
+
+        def search(**filters):
+            results = store.search_similar(query, 3, "infos", filters=SearchFilter(**filters))
+            return [r.id for r in results]
+
+        assert search(document_type=DocumentType.MARKDOWN) == [old.id, recent.id]
+        assert search(document_name="notes.txt") == [notes.id]
+        assert search(inserted_after=datetime(2026, 1, 1)) == [notes.id, recent.id]
+        assert search(inserted_before=datetime(2026, 1, 1)) == [old.id]
+        assert search(document_type=DocumentType.PDF) == []
+
+    def test_selective_filter_is_scanned_exactly_with_ivf_index(self, tmp_path, make_vector):
+        rng = np.random.default_rng(0)
+        embeddings = rng.normal(size=(400, 16))
+        store = LocalVectorStore(str(tmp_path), embedding_dim=16, ivf_threshold=100, n_probe=1)
+        vectors = [make_vector(embedding=embedding) for embedding in embeddings]
+        vectors[0].metadata = {"document_name": "rare.md"}
+        store.index_vectors(vectors, "infos")
+
+        # Far from the rare chunk, so its cluster is not among the probed ones
+        results = store.search_similar(
+            -embeddings[0],
+            top_k=5,
+            collection_name="infos",
+            filters=SearchFilter(document_name="rare.md"),
+        )
+
+        assert [r.id for r in results] == [vectors[0].id]
@@ -0,0 +1,96 @@
+import uuid
+
+from memorag.domain.entities import Document, DocumentType
+from memorag.infrastructure.adapters.markdown_chunker import MarkdownChunker
+
+MARKDOWN = b"""Intro text.
+
+# Decisions
+
+## Database
+We picked Qdrant.
+
+```python
+# not a heading
+```
+
+## Queue
+We picked Redis.
+
+# Appendix
+Nothing here.
+"""
+
+
+def _document(content: bytes) -> Document:
+    return Document(id=uuid.uuid4(), name="adr.md", content=content, type=DocumentType.MARKDOWN)
+
+
+class TestMarkdownChunker:
+    def test_splits_on_headings(self):
+        chunker = MarkdownChunker(chunk_size=1000, chunk_overlap=100)
+
+        chunks = list(chunker.chunk(_document(MARKDOWN)).chunks)
+
+        assert [chunk.metadata.get("heading") for chunk in chunks] == [
+            None,
+            "Decisions",
+            "Decisions > Database",
+            "Decisions > Queue",
+            "Appendix",
+        ]
+        assert chunks[2].content.startswith(b"## Database")
+        assert b"# not a heading" in chunks[2].content
+        assert b"".join(chunk.content for chunk in chunks) == MARKDOWN
+
+    def test_splits_large_sections(self):
+        content = b"# Big\n" + b"lorem ipsum " * 200
+        chunker = MarkdownChunker(chunk_size=100, chunk_overlap=0)
+
+        chunks = list(chunker.chunk(_document(content)).chunks)
+
+        assert len(chunks) > 1
+        assert all(len(chunk.content) <= 100 for chunk in chunks)
+        assert all(chunk.metadata["heading"] == "Big" for chunk in chunks)
+
+    def test_iter_chunks_matches_chunk(self, tmp_path):
+        content = MARKDOWN * 50
+        filepath = tmp_path / "adr.md"
+        filepath.write_bytes(content)
+        chunker = MarkdownChunker(chunk_size=60, chunk_overlap=10)
+        lazy_document = Document.from_filepath(str(filepath), DocumentType.MARKDOWN, lazy=True)
+
+        streamed = list(chunker.iter_chunks(lazy_document))
+        in_memory = list(chunker.chunk(_document(content)).chunks)
+
+        assert [(c.content, c.metadata) for c in streamed] == [
+            (c.content, c.metadata) for c in in_memory
+        ]
+
+    def test_fences_are_closed_by_the_same_marker(self):
+        content = b"````\n~~~\n# not a heading\n```\n````\n# Heading\ntext\n"
+        chunker = MarkdownChunker(chunk_size=1000, chunk_overlap=0)
+
+        chunks = list(chunker.chunk(_document(content)).chunks)
+
+        assert [chunk.metadata.get("heading") for chunk in chunks] == [None, "Heading"]
+
+    def test_iter_chunks_splits_long_lines_as_they_stream(self, tmp_path):
+        content = b"# Minified\n" + b"x" * 50_000 + b"\n# Next\nend\n"
+        filepath = tmp_path / "min.md"
+        filepath.write_bytes(content)
+        chunker = MarkdownChunker(chunk_size=100, chunk_overlap=10)
+        scanner = chunker._new_scanner()
+
+        ranges = scanner.scan(content[:20_000], 0, final=False)
+        lazy_document = Document.from_filepath(str(filepath), DocumentType.MARKDOWN, lazy=True)
+        streamed = list(chunker.iter_chunks(lazy_document))
+        in_memory = list(chunker.chunk(_document(content)).chunks)
+
+        # The line is split before its end, leaving less than a chunk in the buffer
+        assert ranges
+        assert 20_000 - scanner.keep_from < 100
+        assert [(c.content, c.metadata) for c in streamed] == [
+            (c.content, c.metadata) for c in in_memory
+        ]
+        assert streamed[-1].metadata["heading"] == "Next"
@@ -0,0 +1,17 @@
+from memorag.application.instrumentation import StageRecord
+from memorag.infrastructure.adapters.prometheus_exporter import PrometheusExporter
+
+
+class TestPrometheusExporter:
+    def test_render_histogram_and_attributes(self):
+        exporter = PrometheusExporter(buckets=(0.1, 1.0))
+        exporter.record(StageRecord("embed", 0.05, {"texts": 2}))
+        exporter.record(StageRecord("embed", 0.5, {"texts": 1}))
+
+        lines = exporter.render().splitlines()
+
+        assert 'memorag_stage_duration_seconds_bucket{stage="embed",le="0.1"} 1' in lines
+        assert 'memorag_stage_duration_seconds_bucket{stage="embed",le="1.0"} 2' in lines
+        assert 'memorag_stage_duration_seconds_bucket{stage="embed",le="+Inf"} 2' in lines
+        assert 'memorag_stage_duration_seconds_count{stage="embed"} 2' in lines
+        assert 'memorag_stage_attribute_total{stage="embed",attribute="texts"} 3' in lines
@@ -0,0 +1,318 @@
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from qdrant_client.http.exceptions import UnexpectedResponse
+from qdrant_client.models import (
+    BinaryQuantization,
+    Disabled,
+    PayloadSchemaType,
+    ScalarQuantization,
+)
+
+from memorag.domain.entities import DocumentType, SearchFilter, Vector
+from memorag.infrastructure.adapters import qdrant
+from memorag.infrastructure.adapters.qdrant import QdrantCollectionConfig, QdrantVectorStore
+
+
+class TestQdrantVectorStore:
+    @pytest.fixture
+    def store(self):
+        return QdrantVectorStore(host="localhost", port=6333, embedding_dim=3, location=":memory:")
+
+    @pytest.fixture
+    def vectors(self):
+        return [
+            Vector(
+                id=uuid.uuid4(),
+                vector=np.array(embedding, dtype=np.float32),
+                inserted_at=datetime.now(tz=timezone.utc),
+                content=content,
+                metadata={"document_name": "doc"},
+            )
+            for embedding, content in (([1, 0, 0], b"first"), ([0, 1, 0], b"second"))
+        ]
+
+    def test_search_returns_payload_and_score_without_vectors(self, store, vectors):
+        store.index_vectors(vectors, collection_name="infos")
+
+        results = store.search_similar(np.array([1.0, 0.1, 0.0]), top_k=2, collection_name="infos")
+
+        assert [result.id for result in results] == [vectors[0].id, vectors[1].id]
+        assert results[0].content == b"first"
+        assert results[0].metadata == {"document_name": "doc"}
+        assert results[0].vector is None
+        assert results[0].score == pytest.approx(0.995, abs=1e-3)
+        assert results[0].score > results[1].score
+
+    def test_search_with_vectors(self, store, vectors):
+        store.index_vectors(vectors, collection_name="infos")
+
+        results = store.search_similar(
+            np.array([0.0, 1.0, 0.0]), top_k=1, collection_name="infos", with_vectors=True
+        )
+
+        assert results[0].id == vectors[1].id
+        assert np.allclose(results[0].vector, [0.0, 1.0, 0.0])
+
+    def test_search_batch_returns_results_per_query(self, store, vectors):
+        store.index_vectors(vectors, collection_name="infos")
+
+        results = store.search_similar_batch(
+            np.array([[0.0, 1.0, 0.0], [1.0, 0.1, 0.0]]), top_k=1, collection_name="infos"
+        )
+
+        assert [[result.id for result in query_results] for query_results in results] == [
+            [vectors[1].id],
+            [vectors[0].id],
+        ]
+        assert results[0][0].content == b"second"
+
+    def test_delete_vectors(self, store, vectors):
+        store.index_vectors(vectors, collection_name="infos")
+
+        store.delete_vectors([vectors[0].id], collection_name="infos")
+
+        results = store.search_similar(np.array([1.0, 0.0, 0.0]), top_k=2, collection_name="infos")
+        assert [result.id for result in results] == [vectors[1].id]
+
+    def test_index_rejects_vectors_without_embedding(self, store, vectors):
+        vectors[0].vector = None
+
+        with pytest.raises(ValueError):
+            store.index_vectors(vectors, collection_name="infos")
+
+    def test_search_applies_score_threshold(self, store, vectors):
+        store.index_vectors(vectors, collection_name="infos")
+
+        results = store.search_similar(
+            np.array([1.0, 0.0, 0.0]), top_k=2, collection_name="infos", score_threshold=0.5
+        )
+
+        assert [result.id for result in results] == [vectors[0].id]
+
+    def test_collection_config_is_applied_in_embedded_qdrant(self, vectors):
+        config = QdrantCollectionConfig(on_disk=True, quantization="binary", oversampling=2.0)
+        store = QdrantVectorStore(
+            host="localhost",
+            port=6333,
+            embedding_dim=3,
+            location=":memory:",
+            collection_config=config,
+        )
+        store.index_vectors(vectors, collection_name="infos")
+
+        collection = store._client.get_collection("infos")
+        with pytest.warns(UserWarning):
+            results = store.search_similar(np.array([1.0, 0.0, 0.0]), 1, "infos")
+
+        assert collection.config.params.vectors.on_disk is True
+        assert [result.id for result in results] == [vectors[0].id]
+
+    def test_deleted_collection_is_recreated_on_next_use(self, store, vectors):
+        store.index_vectors(vectors, collection_name="infos")
+        store._client.delete_collection("infos")
+
+        assert store.search_similar(np.array([1.0, 0.0, 0.0]), 2, "infos") == []
+        store._client.delete_collection("infos")
+        store.index_vectors(vectors, collection_name="infos")
+
+        results = store.search_similar(np.array([1.0, 0.0, 0.0]), 2, "infos")
+        assert [result.id for result in results] == [vectors[0].id, vectors[1].id]
+
+    def test_search_applies_filters(self, store, vectors):
+        vectors[0].metadata = {"document_name": "adr.md", "document_type": "markdown"}
+        vectors[0].inserted_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        vectors[1].metadata = {"document_name": "notes.txt", "document_type": "text"}
+        store.index_vectors(vectors, collection_name="infos")
+
+        def search(**filters):
+            results = store.search_similar(
+                np.array([1.0, 0.0, 0.0]), 2, "infos", filters=SearchFilter(**filters)
+            )
+            return [r.id for r in results]
+
+        assert search(document_type=DocumentType.MARKDOWN) == [vectors[0].id]
+        assert search(document_name="notes.txt") == [vectors[1].id]
+        assert search(inserted_after=datetime(2026, 1, 1)) == [vectors[1].id]
+        assert search(inserted_before=datetime(2026, 1, 1)) == [vectors[0].id]
+        assert search() == [vectors[0].id, vectors[1].id]
+
+    def test_scroll_yields_every_vector_in_batches(self, store, vectors):
+        store.index_vectors(vectors, collection_name="infos")
+
+        batches = list(store.scroll_vectors("infos", batch_size=1))
+
+        assert [len(batch) for batch in batches] == [1, 1]
+        scrolled = {vector.id: vector for batch in batches for vector in batch}
+        assert scrolled.keys() == {vector.id for vector in vectors}
+        assert scrolled[vectors[1].id].content == b"second"
+        assert scrolled[vectors[1].id].vector == pytest.approx([0.0, 1.0, 0.0])
+
+    def test_scroll_of_missing_collection_is_rejected(self, store):
+        with pytest.raises(ValueError):
+            list(store.scroll_vectors("missing"))
+
+
+class TestQdrantConnection:
+    @pytest.fixture
+    def client(self, monkeypatch):
+        client = Mock()
+        client.collection_exists.return_value = True
+        client.query_points.return_value.points = []
+        client_class = Mock(return_value=client)
+        monkeypatch.setattr(qdrant, "QdrantClient", client_class)
+        return client
+
+    @pytest.fixture
+    def store(self, client):
+        return QdrantVectorStore(host="qdrant", port=6333, embedding_dim=3)
+
+    def test_collection_is_checked_once(self, client, store):
+        for _ in range(3):
+            store.search_similar(np.array([1.0, 0.0, 0.0]), 1, "infos")
+
+        client.collection_exists.assert_called_once_with("infos")
+        assert client.query_points.call_count == 3
+
+    def test_invalidated_collection_is_checked_again(self, client, store):
+        store.search_similar(np.array([1.0, 0.0, 0.0]), 1, "infos")
+
+        store.invalidate_collection("infos")
+        store.search_similar(np.array([1.0, 0.0, 0.0]), 1, "infos")
+
+        assert client.collection_exists.call_count == 2
+
+    def test_collection_not_found_is_recreated_and_retried(self, client, store):
+        store.search_similar(np.array([1.0, 0.0, 0.0]), 1, "infos")
+        not_found = UnexpectedResponse(404, "Not Found", b"", Mock())
+        client.query_points.side_effect = [not_found, Mock(points=[])]
+        client.collection_exists.return_value = False
+
+        assert store.search_similar(np.array([1.0, 0.0, 0.0]), 1, "infos") == []
+
+        client.create_collection.assert_called_once()
+        assert client.query_points.call_count == 3
+
+    def test_other_errors_are_raised(self, client, store):
+        client.query_points.side_effect = UnexpectedResponse(500, "Error", b"", Mock())
+
+        with pytest.raises(UnexpectedResponse):
+            store.search_similar(np.array([1.0, 0.0, 0.0]), 1, "infos")
+
+        assert client.query_points.call_count == 1
+
+    def test_connections_are_kept_alive_and_pooled(self, monkeypatch):
+        client_class = Mock()
+        monkeypatch.setattr(qdrant, "QdrantClient", client_class)
+
+        QdrantVectorStore(host="localhost", port=6333, embedding_dim=3, pool_size=8)
+
+        limits = client_class.call_args.kwargs["limits"]
+        assert (limits.max_connections, limits.max_keepalive_connections) == (8, 8)
+
+    def test_grpc_channels_are_pooled(self, monkeypatch):
+        client_class = Mock()
+        monkeypatch.setattr(qdrant, "QdrantClient", client_class)
+
+        QdrantVectorStore(
+            host="localhost", port=6333, embedding_dim=3, prefer_grpc=True, pool_size=4
+        )
+
+        assert client_class.call_args.kwargs["pool_size"] == 4
+        assert "limits" not in client_class.call_args.kwargs
+
+
+class TestQdrantCollectionConfig:
+    @pytest.fixture
+    def client(self, monkeypatch):
+        client = Mock()
+        client.collection_exists.return_value = False
+        client.query_points.return_value.points = []
+        monkeypatch.setattr(qdrant, "QdrantClient", Mock(return_value=client))
+        return client
+
+    def _store(self, client, **config):
+        return QdrantVectorStore(
+            host="localhost",
+            port=6333,
+            embedding_dim=3,
+            collection_config=QdrantCollectionConfig(**config),
+        )
+
+    def test_default_config_keeps_qdrant_defaults(self, client):
+        store = self._store(client)
+
+        store.search_similar(np.array([1.0, 0.0, 0.0]), 1, "infos")
+
+        arguments = client.create_collection.call_args.kwargs
+        assert arguments["hnsw_config"] is None
+        assert arguments["quantization_config"] is None
+        assert arguments["vectors_config"].on_disk is None
+        assert client.query_points.call_args.kwargs["search_params"] is None
+
+    def test_collection_is_created_with_hnsw_storage_and_quantization(self, client):
+        store = self._store(
+            client, hnsw_m=32, hnsw_ef_construct=256, on_disk=True, quantization="scalar"
+        )
+
+        store.search_similar(np.array([1.0, 0.0, 0.0]), 1, "infos")
+
+        arguments = client.create_collection.call_args.kwargs
+        assert (arguments["hnsw_config"].m, arguments["hnsw_config"].ef_construct) == (32, 256)
+        assert arguments["vectors_config"].on_disk is True
+        assert isinstance(arguments["quantization_config"], ScalarQuantization)
+        assert arguments["quantization_config"].scalar.always_ram is True
+
+    def test_payload_indexes_are_created_with_collection(self, client):
+        store = self._store(client)
+
+        store.search_similar(np.array([1.0, 0.0, 0.0]), 1, "infos")
+
+        indexed = {
+            (c.kwargs["field_name"], c.kwargs["field_schema"])
+            for c in client.create_payload_index.call_args_list
+        }
+        assert indexed == {
+            ("metadata.document_id", PayloadSchemaType.KEYWORD),
+            ("metadata.document_name", PayloadSchemaType.KEYWORD),
+            ("metadata.document_type", PayloadSchemaType.KEYWORD),
+            ("inserted_at", PayloadSchemaType.DATETIME),
+        }
+
+    def test_search_uses_hnsw_ef_and_rescoring(self, client):
+        store = self._store(client, hnsw_ef=128, quantization="binary", oversampling=3.0)
+
+        store.search_similar(np.array([1.0, 0.0, 0.0]), 1, "infos")
+
+        params = client.query_points.call_args.kwargs["search_params"]
+        assert params.hnsw_ef == 128
+        assert (params.quantization.rescore, params.quantization.oversampling) == (True, 3.0)
+
+    def test_configure_collection_updates_existing_collection(self, client):
+        client.collection_exists.return_value = True
+        store = self._store(client, quantization="binary", on_disk_payload=True)
+
+        store.configure_collection("infos")
+
+        client.create_collection.assert_not_called()
+        arguments = client.update_collection.call_args.kwargs
+        assert isinstance(arguments["quantization_config"], BinaryQuantization)
+        assert arguments["collection_params"].on_disk_payload is True
+        assert client.create_payload_index.call_count == 4
+
+    def test_configure_collection_disables_quantization(self, client):
+        client.collection_exists.return_value = True
+        store = self._store(client)
+
+        store.configure_collection("infos")
+
+        assert client.update_collection.call_args.kwargs["quantization_config"] == (
+            Disabled.DISABLED
+        )
+
+    def test_unknown_quantization_is_rejected(self):
+        with pytest.raises(ValueError):
+            QdrantCollectionConfig(quantization="product")
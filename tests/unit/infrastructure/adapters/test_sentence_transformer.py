@@ -0,0 +1,23 @@
+from unittest.mock import patch
+
+import pytest
+
+from memorag.infrastructure.adapters.sentence_transformer import SentenceTransformerEmbedder
+
+
+class TestSentenceTransformerEmbedder:
+    def test_onnx_int8_backend_loads_quantized_export(self):
+        with patch(
+            "memorag.infrastructure.adapters.sentence_transformer.SentenceTransformer"
+        ) as sentence_transformer:
+            SentenceTransformerEmbedder("model", backend="onnx-int8")
+
+        sentence_transformer.assert_called_once_with(
+            "model",
+            backend="onnx",
+            model_kwargs={"file_name": "onnx/model_qint8_avx512_vnni.onnx"},
+        )
+
+    def test_unknown_backend_is_rejected(self):
+        with pytest.raises(ValueError, match="backend"):
+            SentenceTransformerEmbedder("model", backend="tensorrt")
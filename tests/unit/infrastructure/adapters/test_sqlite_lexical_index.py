@@ -0,0 +1,59 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from memorag.domain.entities import DocumentType, SearchFilter
+from memorag.infrastructure.adapters.sqlite_lexical_index import SqliteLexicalIndex
+
+
+class TestSqliteLexicalIndex:
+    @pytest.fixture
+    def index(self, tmp_path):
+        return SqliteLexicalIndex(str(tmp_path / "lexical.sqlite"))
+
+    def test_search_ranks_chunks_by_matching_terms(self, index, make_vector):
+        qdrant = make_vector(
+            content=b"We store vectors in Qdrant, set embedding_cache_dir to cache them."
+        )
+        other = make_vector(content=b"We picked Typer for the command line.")
+        index.index([qdrant, other], "infos")
+
+        results = index.search("Why Qdrant and embedding_cache_dir?", 5, "infos")
+
+        assert [r.id for r in results] == [qdrant.id]
+        assert results[0].content == qdrant.content
+        assert results[0].metadata == {"document_name": "adr.md"}
+        assert results[0].score > 0
+
+    def test_search_ignores_queries_without_terms_and_other_collections(self, index, make_vector):
+        index.index([make_vector(content=b"Qdrant")], "infos")
+
+        assert index.search("?!", 5, "infos") == []
+        assert index.search("qdrant", 5, "other") == []
+
+    def test_index_replaces_and_delete_removes(self, index, make_vector):
+        vector = make_vector(content=b"Qdrant")
+        index.index([vector], "infos")
+        index.index([vector.model_copy(update={"content": b"Milvus"})], "infos")
+
+        assert index.search("qdrant", 5, "infos") == []
+        assert [r.id for r in index.search("milvus", 5, "infos")] == [vector.id]
+
+        index.delete([vector.id], "infos")
+        assert index.search("milvus", 5, "infos") == []
+
+    def test_search_applies_filters(self, index, make_vector):
+        adr = make_vector(content=b"Qdrant was picked for filters")
+        adr.metadata = {"document_name": "adr.md", "document_type": "markdown"}
+        adr.inserted_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        notes = make_vector(content=b"Qdrant notes")
+        notes.metadata = {"document_name": "notes.txt", "document_type": "text"}
+        index.index([adr, notes], "infos")
+
+        def search(**filters):
+            return [r.id for r in index.search("qdrant", 5, "infos", SearchFilter(**filters))]
+
+        assert search(document_type=DocumentType.MARKDOWN) == [adr.id]
+        assert search(document_name="notes.txt") == [notes.id]
+        assert search(inserted_after=datetime(2026, 1, 1)) == [notes.id]
+        assert search(inserted_before=datetime(2026, 1, 1)) == [adr.id]
@@ -0,0 +1,61 @@
+import sqlite3
+import uuid
+
+from memorag.domain.entities import IndexedDocument
+from memorag.infrastructure.adapters.sqlite_manifest import SqliteIndexManifest
+
+
+class TestSqliteIndexManifest:
+    def test_save_and_get(self, tmp_path):
+        manifest = SqliteIndexManifest(str(tmp_path / "manifest.sqlite"))
+        document = IndexedDocument(
+            id=uuid.uuid4(),
+            fingerprint="abc",
+            chunk_ids={uuid.uuid4(), uuid.uuid4()},
+            settings='{"chunk_size": 1000}',
+        )
+
+        manifest.save(document, collection_name="infos")
+
+        assert manifest.get(document.id, collection_name="infos") == document
+        assert manifest.get(document.id, collection_name="other") is None
+
+    def test_save_replaces_previous_entry(self, tmp_path):
+        path = str(tmp_path / "manifest.sqlite")
+        document_id = uuid.uuid4()
+        SqliteIndexManifest(path).save(
+            IndexedDocument(id=document_id, fingerprint="v1", chunk_ids={uuid.uuid4()}),
+            collection_name="infos",
+        )
+        latest = IndexedDocument(id=document_id, fingerprint="v2", chunk_ids={uuid.uuid4()})
+
+        SqliteIndexManifest(path).save(latest, collection_name="infos")
+
+        assert SqliteIndexManifest(path).get(document_id, collection_name="infos") == latest
+
+    def test_delete(self, tmp_path):
+        manifest = SqliteIndexManifest(str(tmp_path / "manifest.sqlite"))
+        document = IndexedDocument(id=uuid.uuid4(), fingerprint="abc", chunk_ids=set())
+        manifest.save(document, collection_name="infos")
+
+        manifest.delete(document.id, collection_name="infos")
+
+        assert manifest.get(document.id, collection_name="infos") is None
+
+    def test_manifests_without_settings_are_migrated(self, tmp_path):
+        path = str(tmp_path / "manifest.sqlite")
+        document_id = uuid.uuid4()
+        with sqlite3.connect(path) as connection:
+            connection.execute(
+                "CREATE TABLE documents (collection TEXT NOT NULL, document_id TEXT NOT NULL,"
+                " fingerprint TEXT NOT NULL, PRIMARY KEY (collection, document_id))"
+            )
+            connection.execute(
+                "INSERT INTO documents VALUES (?, ?, ?)", ("infos", str(document_id), "abc")
+            )
+        connection.close()
+
+        document = SqliteIndexManifest(path).get(document_id, collection_name="infos")
+
+        assert document is not None
+        assert (document.fingerprint, document.settings) == ("abc", "")
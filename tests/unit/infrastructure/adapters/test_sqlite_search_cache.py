@@ -0,0 +1,79 @@
+import uuid
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from memorag.domain.entities import CachedSearch, Vector
+from memorag.infrastructure.adapters.sqlite_search_cache import SqliteSearchCache
+
+
+class TestSqliteSearchCache:
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return SqliteSearchCache(str(tmp_path / "cache.sqlite"), similarity_threshold=0.9)
+
+    @pytest.fixture
+    def result(self):
+        source = Vector(
+            id=uuid.uuid4(),
+            inserted_at=datetime.now(tz=timezone.utc),
+            content=b"We picked Qdrant.",
+            metadata={"document_name": "adr.md"},
+            score=0.8,
+            rerank_score=4.2,
+        )
+        return CachedSearch(answer=["Because", " it is fast."], sources=[source])
+
+    def test_get_returns_exact_match_ignoring_case_and_spaces(self, cache, result):
+        cache.save("Why Qdrant?", np.array([1.0, 0.0]), "{}", "infos", result)
+
+        cached = cache.get("  why   qdrant? ", np.array([0.0, 1.0]), "{}", "infos")
+
+        assert cached == result
+
+    def test_get_returns_similar_query(self, cache, result):
+        cache.save("Why Qdrant?", np.array([1.0, 0.0]), "{}", "infos", result)
+
+        assert cache.get("Qdrant, why?", np.array([0.95, 0.1]), "{}", "infos") == result
+        assert cache.get("Why not Milvus?", np.array([0.5, 0.5]), "{}", "infos") is None
+
+    def test_get_requires_same_parameters_and_collection(self, cache, result):
+        cache.save("Why Qdrant?", np.array([1.0, 0.0]), '{"top_k": 5}', "infos", result)
+
+        assert cache.get("Why Qdrant?", np.array([1.0, 0.0]), '{"top_k": 6}', "infos") is None
+        assert cache.get("Why Qdrant?", np.array([1.0, 0.0]), '{"top_k": 5}', "other") is None
+
+    def test_exact_only_cache_ignores_similar_queries(self, tmp_path, result):
+        cache = SqliteSearchCache(str(tmp_path / "cache.sqlite"), similarity_threshold=None)
+        cache.save("Why Qdrant?", np.array([1.0, 0.0]), "{}", "infos", result)
+
+        assert cache.get("Qdrant, why?", np.array([1.0, 0.0]), "{}", "infos") is None
+
+    def test_invalidate_forgets_collection(self, cache, result):
+        cache.save("Why Qdrant?", np.array([1.0, 0.0]), "{}", "infos", result)
+        cache.save("Why Qdrant?", np.array([1.0, 0.0]), "{}", "other", result)
+
+        cache.invalidate("infos")
+
+        assert cache.get("Why Qdrant?", np.array([1.0, 0.0]), "{}", "infos") is None
+        assert cache.get("Why Qdrant?", np.array([1.0, 0.0]), "{}", "other") == result
+
+    def test_entries_expire_after_ttl(self, tmp_path, result):
+        cache = SqliteSearchCache(str(tmp_path / "cache.sqlite"), ttl_seconds=-1)
+        cache.save("Why Qdrant?", np.array([1.0, 0.0]), "{}", "infos", result)
+
+        assert cache.get("Why Qdrant?", np.array([1.0, 0.0]), "{}", "infos") is None
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path, result):
+        cache = SqliteSearchCache(
+            str(tmp_path / "cache.sqlite"), similarity_threshold=None, max_entries=2
+        )
+        cache.save("first", np.array([1.0, 0.0]), "{}", "infos", result)
+        cache.save("second", np.array([1.0, 0.0]), "{}", "infos", result)
+        cache.get("first", np.array([1.0, 0.0]), "{}", "infos")
+        cache.save("third", np.array([1.0, 0.0]), "{}", "infos", result)
+
+        assert cache.get("first", np.array([1.0, 0.0]), "{}", "infos") is not None
+        assert cache.get("second", np.array([1.0, 0.0]), "{}", "infos") is None
+        assert cache.get("third", np.array([1.0, 0.0]), "{}", "infos") is not None
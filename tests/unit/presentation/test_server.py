@@ -0,0 +1,140 @@
+import threading
+import urllib.request
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from memorag.application.instrumentation import StageRecord
+from memorag.domain.entities import DocumentType, SearchFilter, SearchResponse, Vector
+from memorag.infrastructure.adapters import PrometheusExporter
+from memorag.presentation.server import MemoRAGClient, create_server
+
+
+class TestServer:
+    @pytest.fixture
+    def services(self):
+        return Mock()
+
+    @pytest.fixture
+    def client(self, services):
+        server = create_server(services, "127.0.0.1", 0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield MemoRAGClient(f"http://127.0.0.1:{server.server_address[1]}")
+        server.shutdown()
+        server.server_close()
+
+    def test_search_streams_answer_and_sources(self, services, client):
+        source = Vector(
+            id=uuid.uuid4(),
+            vector=np.array([0.1, 0.2]),
+            inserted_at=datetime.now(tz=timezone.utc),
+            content=b"doc",
+            metadata={"document_name": "adr.md", "document_id": "42"},
+            score=0.7,
+            rerank_score=3.5,
+        )
+        services.search.return_value = SearchResponse(
+            answer=iter(["Hello", " world"]), sources=[source]
+        )
+
+        response = client.search("why qdrant?", top_k=5, raw=False)
+
+        services.search.assert_called_once_with(
+            query="why qdrant?",
+            top_k=5,
+            raw=False,
+            top_n=None,
+            min_score=None,
+            score_threshold=None,
+            filters=None,
+            collection_name=None,
+        )
+        assert "".join(response.answer) == "Hello world"
+        assert [s.id for s in response.sources] == [source.id]
+        assert response.sources[0].document_name == "adr.md"
+        assert response.sources[0].content == b"doc"
+        assert (response.sources[0].score, response.sources[0].rerank_score) == (0.7, 3.5)
+
+    def test_search_forwards_filters_and_collection(self, services, client):
+        services.search.return_value = SearchResponse(answer=iter([]), sources=[])
+        filters = SearchFilter(
+            document_type=DocumentType.MARKDOWN,
+            inserted_after=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        )
+
+        client.search("q", top_k=5, raw=True, filters=filters, collection_name="team-a")
+
+        arguments = services.search.call_args.kwargs
+        assert arguments["filters"] == filters
+        assert arguments["collection_name"] == "team-a"
+
+    def test_search_reports_errors_while_streaming(self, services, client):
+        def failing_answer():
+            yield "partial"
+            raise RuntimeError("LLM down")
+
+        services.search.return_value = SearchResponse(answer=failing_answer(), sources=[])
+
+        response = client.search("q", top_k=5, raw=False)
+
+        with pytest.raises(RuntimeError, match="LLM down"):
+            list(response.answer)
+
+    def test_index_forwards_options(self, services, client, tmp_path):
+        services.index.return_value = "Indexed document: 1 - doc.md"
+        filepath = tmp_path / "doc.md"
+
+        message = client.index(
+            text=None,
+            filepath=str(filepath),
+            filetype=DocumentType.MARKDOWN,
+            stream=False,
+            batch_size=64,
+            chunk_size=500,
+            chunk_overlap=50,
+            incremental=True,
+            manifest_path=str(tmp_path / "manifest.sqlite"),
+        )
+
+        assert message == "Indexed document: 1 - doc.md"
+        kwargs = services.index.call_args.kwargs
+        assert kwargs["filepath"] == str(filepath)
+        assert kwargs["filetype"] == DocumentType.MARKDOWN
+        assert kwargs["chunk_size"] == 500
+        assert kwargs["incremental"] is True
+
+    def test_bad_requests_raise_runtime_error(self, services, client):
+        services.index.side_effect = ValueError("Either text or filepath must be provided.")
+
+        with pytest.raises(RuntimeError, match="Either text or filepath"):
+            client.index(
+                text=None,
+                filepath=None,
+                filetype=DocumentType.TEXT,
+                stream=False,
+                batch_size=64,
+                chunk_size=1000,
+                chunk_overlap=200,
+                incremental=False,
+                manifest_path="manifest.sqlite",
+            )
+
+    def test_metrics_are_exposed_in_prometheus_format(self, services):
+        metrics = PrometheusExporter()
+        metrics.record(StageRecord("embed", 0.01, {"texts": 1}))
+        server = create_server(services, "127.0.0.1", 0, metrics=metrics)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url) as response:
+                body = response.read().decode()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert 'memorag_stage_duration_seconds_count{stage="embed"} 1' in body
@@ -0,0 +1,108 @@
+from unittest.mock import Mock, PropertyMock, patch
+
+import numpy as np
+import pytest
+
+from memorag.presentation.services import Services, find_files, import_time
+
+
+class TestFindFiles:
+    def test_find_files_applies_include_and_exclude(self, tmp_path):
+        for name in ["a.md", "docs/b.md", "docs/c.txt", ".git/d.md", "node_modules/e.md"]:
+            (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / name).write_text("content")
+
+        files = find_files(str(tmp_path), ["**/*.md"], [".*", "node_modules*"])
+
+        assert files == [str(tmp_path / "a.md"), str(tmp_path / "docs" / "b.md")]
+
+    def test_find_files_deduplicates_overlapping_globs(self, tmp_path):
+        (tmp_path / "a.md").write_text("content")
+
+        files = find_files(str(tmp_path), ["*.md", "**/*.md"], [])
+
+        assert files == [str(tmp_path / "a.md")]
+
+
+class TestServices:
+    def test_index_manifest_is_opened_once_per_path(self, tmp_path):
+        services = Services({})
+        path = str(tmp_path / "manifest.sqlite")
+
+        assert services.index_manifest(path) is services.index_manifest(path)
+        assert services.index_manifest(str(tmp_path / "other.sqlite")) is not (
+            services.index_manifest(path)
+        )
+
+    @patch.object(Services, "_model_embedder")
+    def test_embedding_cache_is_kept_per_backend(self, model_embedder, tmp_path):
+        model = Mock()
+        model.get_embedding_dimension.return_value = 2
+        model.embed_batch.side_effect = lambda texts: np.ones((len(texts), 2))
+        model_embedder.return_value = model
+
+        def embed(backend):
+            config = {
+                "embedding_model": "all-MiniLM-L6-v2",
+                "embedding_backend": backend,
+                "embedding_cache_dir": str(tmp_path),
+                "embedding_cache_size": 1,
+            }
+            Services(config).embedder.embed_batch(["text"])
+
+        embed("torch")
+        embed("onnx-int8")
+        embed("torch")
+
+        assert model.embed_batch.call_count == 2
+
+    def test_zero_dedup_threshold_leaves_out_exact_duplicates_only(self):
+        config = {"llm_model": "mistral/mistral-tiny", "context_tokens": 4000}
+
+        builder = Services({**config, "context_dedup_threshold": 0.0}).context_builder
+
+        assert builder.dedup_threshold is None
+        assert not builder.needs_embeddings
+
+    @patch.dict("sys.modules", {"litellm": Mock()})
+    @patch.object(Services, "search_documents", new_callable=PropertyMock)
+    def test_warm_up_builds_the_adapters_used_by_indexing(self, search_documents, tmp_path):
+        services = Services(
+            {
+                "search_cache": False,
+                "search_cache_path": str(tmp_path / "cache.sqlite"),
+                "hybrid": False,
+                "lexical_index_path": str(tmp_path / "lexical.sqlite"),
+            }
+        )
+
+        services.warm_up()
+
+        search_documents.assert_called_once()
+        assert {"search_cache", "lexical_index"} <= vars(services).keys()
+
+
+class TestStartup:
+    @pytest.mark.parametrize(
+        "module",
+        [
+            "memorag.presentation.cli.main",
+            "memorag.presentation.services",
+            "memorag.application.use_cases",
+            "memorag.infrastructure.adapters",
+        ],
+    )
+    def test_startup_modules_do_not_import_heavy_dependencies(self, module):
+        _, heavy = import_time(module)
+
+        assert heavy == []
+
+    def test_cli_imports_within_budget(self):
+        # Generous budget so slow machines pass, a heavy dependency alone takes seconds
+        seconds, _ = import_time("memorag.presentation.cli.main")
+
+        assert seconds < 1.0
+
+    def test_import_time_raises_on_failed_import(self):
+        with pytest.raises(RuntimeError, match="ModuleNotFoundError"):
+            import_time("memorag.does_not_exist")